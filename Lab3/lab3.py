@@ -1,16 +1,15 @@
-# PythonSim imports
-import SimClasses as sc
-import SimFunctions as sf
-import SimRNG as rng
+# PythonSim imports, from the pythonsim package at the top of the repository
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from pythonsim import SimClasses as sc
+from pythonsim import SimFunctions as sf
+from pythonsim import SimRNG as rng
+from pythonsim import SimVector as sv
+from pythonsim import SimRecords
 
 # Python package imports
-import math
-import pandas
 import numpy as np
-import csv
-
-f = open('TISdata.csv','w', newline= '') 
-fwriter = csv.writer(f) 
 
 TheQueues = []
 TheResources = []
@@ -21,6 +20,8 @@ sc.Clock = 0
 ZSimRNG = rng.InitializeRNSeed()
 Calendar = sc.EventCalendar()
 RunLength = 500.0 # change from 2000 to 500
+NumReps = 200
+Engine = "event" # "event": event loop, as in the original lab; "vector": Kiefer-Wolfowitz engine
 
 TISRecords = [] 
 
@@ -40,6 +41,8 @@ TheQueues.append(FQueue)
 CQueue = sc.FIFOQueue()
 TheQueues.append(CQueue)
 
+Customers = sc.EntityTable({"CreateTime": "d", "Type": "q"})
+
 # Parameters
 STPhases = [2,3]
 STMean = 5.0
@@ -59,14 +62,16 @@ def SelectType():
     U = rng.Uniform(0,1,2) 
     
     if U<ProbType[0]: #This is the case when the customer is finance type
-        Customer = sc.Entity2(0)
+        Customer = Customers.New()
+        Customers.Type[Customer] = 0
         if(TheResources[0].CurrentNumBusy < NumAgents[0]): 
             TheResources[0].Seize(1)
             sf.SchedulePlus(Calendar,"EndOfService",rng.Erlang(STPhases[0],STMean,STStreams[0]),Customer)
         else:
             TheQueues[0].Add(Customer)
     else:
-        Customer = sc.Entity2(1)
+        Customer = Customers.New()
+        Customers.Type[Customer] = 1
         if(TheResources[1].CurrentNumBusy < NumAgents[1]): 
             TheResources[1].Seize(1)
             sf.SchedulePlus(Calendar,"EndOfService",rng.Erlang(STPhases[1],STMean,STStreams[1]),Customer)
@@ -75,16 +80,20 @@ def SelectType():
         
         
 def EndOfService(OldCustomer):  
-    WaitTime.Record(sc.Clock-OldCustomer.CreateTime)
-    TISRecords.append(sc.Clock - OldCustomer.CreateTime)
-    if TheQueues[OldCustomer.Type].NumQueue() > 0:
-        Customer = TheQueues[OldCustomer.Type].Remove()
-        sf.SchedulePlus(Calendar,"EndOfService",rng.Erlang(STPhases[OldCustomer.Type],STMean,STStreams[OldCustomer.Type]),Customer)
+    WaitTime.Record(sc.Clock-Customers.CreateTime[OldCustomer])
+    TISRecords.append(sc.Clock - Customers.CreateTime[OldCustomer])
+    Type = Customers.Type[OldCustomer]
+    Customers.Free(OldCustomer)
+    if TheQueues[Type].NumQueue() > 0:
+        Customer = TheQueues[Type].Remove()
+        sf.SchedulePlus(Calendar,"EndOfService",rng.Erlang(STPhases[Type],STMean,STStreams[Type]),Customer)
     else:
-        TheResources[OldCustomer.Type].Free(1)
+        TheResources[Type].Free(1)
 
 
-for reps in range(0,200,1):
+def Replication(Rep):
+    # One replication of the event loop; the times in system are left in TISRecords
+    global TISRecords
     TISRecords = [] 
     sf.SimFunctionsInit(Calendar)
     sf.Schedule(Calendar,"Arrival",rng.Expon(ATMean, 1))
@@ -101,11 +110,67 @@ for reps in range(0,200,1):
             EndOfService(NextEvent.WhichObject)
         elif NextEvent.EventType == "EndSimulation":
             break
-    fwriter.writerow(TISRecords)        
-    WaitTimeAvg.append(WaitTime.Mean())
+    return WaitTime.Mean()
+
+def RunEvent(Spacing=None):
+    # With Spacing, replication reps uses the streams set by
+    # rng.SeedReplication(reps, Spacing), as in RunVector; without, the
+    # streams continue from one replication to the next, as in the
+    # original lab, whose results this reproduces
+    for reps in range(0,NumReps,1):
+        if Spacing is not None:
+            rng.SeedReplication(reps, Spacing)
+        WaitTimeAvg.append(Replication(reps))
+        Writer.Write(reps, TISRecords)
+
+def RunVector():
+    # Both stations are FIFO multi-server queues, so all replications are
+    # computed at once by the Kiefer-Wolfowitz recursion; replication reps
+    # uses the same streams as in RunEvent(rng.REPLICATION_SPACING), but
+    # stream 2 is read in customer order here, while in RunEvent the next
+    # customer's delay is drawn before this customer's type whenever it
+    # arrives during the delay, so the two engines agree in distribution
+    # rather than replication by replication
+    Seeds = [rng.SeedBlock(Stream, 0, NumReps) for Stream in (1, 2, 3, 4)]
+    Arrivals = sv.GenerateArrivals(NumReps, RunLength, lambda Now: rng.ExponBlock(ATMean, Seeds[0], 1)[:, 0])
+    # Stream 2 gives each customer its delay and then its type
+    U = rng.lcgrandblock(Seeds[1], (Arrivals.shape[1], 2))
+    Start = Arrivals + 0.1 + 0.1 * U[:, :, 0]
+    Departures = []
+    TIS = []
+    for k in range(len(NumAgents)):
+        IsType = (U[:, :, 1] < ProbType[0]) if k == 0 else (U[:, :, 1] >= ProbType[0])
+        Times = np.sort(np.where(IsType & (Start < RunLength), Start, np.inf), axis=1)
+        with np.errstate(invalid="ignore"):
+            Interarrival = np.diff(Times, axis=1, prepend=0.0)
+        Interarrival[np.isnan(Interarrival)] = np.inf
+        Service = rng.ErlangBlock(STPhases[k], STMean, Seeds[STStreams[k]-1], Times.shape[1])
+        Spent = sv.KieferWolfowitz(Interarrival, Service, NumAgents[k]) + Service
+        Departures.append(Times + Spent)
+        TIS.append(Spent)
+    Departures = np.concatenate(Departures, axis=1)
+    TIS = np.concatenate(TIS, axis=1)
+    for r in range(NumReps):
+        Done = Departures[r] < RunLength
+        Order = np.argsort(Departures[r][Done], kind="stable")
+        TISRecords = TIS[r][Done][Order]
+        Writer.Write(r, TISRecords)
+        WaitTimeAvg.append(TISRecords.mean())
+
+if __name__ == "__main__":
+    # times in system of every customer, by replication, read with
+    #   SimRecords.ReadRecords('TISdata'), and exported to TISdata.csv
+    #   (one row per replication) for plot.ipynb
+    Writer = SimRecords.RecordWriter('TISdata', {"TIS": "f8"})
+
+    if Engine == "vector":
+        RunVector()
+    else:
+        RunEvent()
 
-f.close() 
-print("Mean time spent is", np.mean(WaitTimeAvg), "minutes.")
-print("Its standard error is", np.std(WaitTimeAvg)/np.sqrt(10), "minutes.")
+    Writer.Close()
+    SimRecords.ToCSV('TISdata', 'TISdata.csv', 'TIS', Reps=range(NumReps))
+    print("Mean time spent is", np.mean(WaitTimeAvg), "minutes.")
+    print("Its standard error is", np.std(WaitTimeAvg)/np.sqrt(10), "minutes.")
 
 
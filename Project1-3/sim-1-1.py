@@ -1,22 +1,31 @@
-import SimClasses as sc
-import SimFunctions as sf
-import SimRNG as rng
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from pythonsim import SimClasses as sc
+from pythonsim import SimFunctions as sf
+from pythonsim import SimRNG as rng
+from pythonsim import SimResults as sr
 import math
-import pandas as pd
-import numpy as np
-np.random.seed(123)
 
 # parameters
 
 RunLength = 330.0
 WarmUp = 30.0
 NumReps = 10
+ForksPerWarmUp = 1   # > 1 to fork that many replications from each warm-up snapshot
 
 MeanTOT = 1.41
 MeanTCM = 0.09
 MeanTBA = [5.12, 11.68, 4.27, 6.88, 5.15, 5.07, 3.81]
 number_server = 2
 
+# branch of every arrival, chosen with probability proportional to
+#   its arrival rate, from stream 2
+BranchTable = rng.ChoiceTable([1 / Mean for Mean in MeanTBA])
+BranchStream = 2
+# mean time between arrivals at all branches together
+MeanTBATotal = 1 / sum(1 / Mean for Mean in MeanTBA)
+
 class Simulation:
     def __init__(self) -> None:
 
@@ -25,8 +34,8 @@ class Simulation:
         self.BranchQueues = [sc.FIFOQueue() for _ in range(7)]
         self.RotQueues = sc.FIFOQueue()
 
-        self.WaitTime = sc.DTStat()
-        self.Prob7 = sc.DTStat()   # probability of waiting longer than 7 seconds
+        self.WaitTime = sc.DTStat("WaitTimeAvg")
+        self.Prob7 = sc.DTStat("SpendTimeMoreThanSeven")   # probability of waiting longer than 7 seconds
         self.Server = sc.Resource()
         self.Calendar = sc.EventCalendar()
         self.Occupation = [sc.Resource() for _ in range(7)]
@@ -34,14 +43,12 @@ class Simulation:
             self.Occupation[i].SetUnits(1) 
         self.Server.SetUnits(number_server)
 
-        self.WaitTimeAvg = []
-        self.Prob7Avg = [] 
+        self.Results = sr.ReplicationResults(NumReps)
 
     def Arrival(self):
         
         # choose branch
-        p = 1 / np.array(MeanTBA) / np.sum(1 / np.array(MeanTBA))
-        index = np.random.choice([0,1,2,3,4,5,6], 1, p=p)[0]
+        index = rng.Choice(BranchTable, BranchStream)
         
         Customer = sc.Entity2(index)
         if self.Occupation[index].CurrentNumBusy == 0:
@@ -50,7 +57,7 @@ class Simulation:
         else:
             self.BranchQueues[index].Add(Customer)
         
-        sf.Schedule(self.Calendar, "Arrival", rng.Expon(1 / np.sum(1 / np.array(MeanTBA)), 1))
+        sf.Schedule(self.Calendar, "Arrival", rng.Expon(MeanTBATotal, 1))
 
 
     def MoveToOrder(self, Customer):
@@ -79,48 +86,67 @@ class Simulation:
             self.Occupation[OldCustomer.Type].Free(1)
 
 
+    def Start(self):
+        sf.SimFunctionsInit(self.Calendar)
+        index = rng.Choice(BranchTable, BranchStream)
+        sf.Schedule(self.Calendar, "Arrival", rng.Expon(MeanTBA[index], 1))
+        sf.Schedule(self.Calendar, "EndSimulation", RunLength)
+        sf.Schedule(self.Calendar, "ClearIt", WarmUp)
+
+    def Loop(self, EndType="EndSimulation"):
+        # runs events until one of EndType, which is not executed
+        while self.Calendar.N() > 0:
+            NextEvent = self.Calendar.Remove()
+            sc.Clock = NextEvent.EventTime
+            if NextEvent.EventType == EndType:
+                break
+            if NextEvent.EventType == "Arrival":
+                self.Arrival()                       
+            elif NextEvent.EventType == "MoveToOrder":
+                self.MoveToOrder(NextEvent.WhichObject)
+            elif NextEvent.EventType == "Departure":
+                self.Departure(NextEvent.WhichObject)
+            elif NextEvent.EventType == "ClearIt":
+                sf.ClearStats() 
+
+    # warm-started replications for sr.RunForked: the state at the end
+    #   of the warm-up, and a replication continued from it
+    def WarmUpState(self, reps):
+        self.Start()
+        self.Loop("ClearIt")
+        sf.ClearStats()
+        return sf.Snapshot(self.Calendar)
+
+    def Fork(self, State, reps):
+        sf.Restore(State, self.Calendar, Rep=reps)
+        self.Loop()
+        return [self.WaitTime.Mean(), self.Prob7.Mean()]
+
     def run(self):
-        for reps in range(0,NumReps,1):
-            sf.SimFunctionsInit(self.Calendar)
-            p = 1 / np.array(MeanTBA) / np.sum(1 / np.array(MeanTBA))
-            index = np.random.choice([0,1,2,3,4,5,6], 1, p=p)[0]
-            sf.Schedule(self.Calendar, "Arrival", rng.Expon(MeanTBA[index], 1))
-            sf.Schedule(self.Calendar, "EndSimulation", RunLength)
-            sf.Schedule(self.Calendar, "ClearIt", WarmUp)
-
-            while self.Calendar.N() > 0:
-                NextEvent = self.Calendar.Remove()
-                sc.Clock = NextEvent.EventTime
-                if NextEvent.EventType == "Arrival":
-                    self.Arrival()                       
-                elif NextEvent.EventType == "MoveToOrder":
-                    self.MoveToOrder(NextEvent.WhichObject)
-                elif NextEvent.EventType == "Departure":
-                    self.Departure(NextEvent.WhichObject)
-                elif NextEvent.EventType == "ClearIt":
-                    sf.ClearStats() 
-                elif NextEvent.EventType == "EndSimulation":
-                    break
-            
-            
-            
-            self.WaitTimeAvg.append(self.WaitTime.Mean())
-            self.Prob7Avg.append(self.Prob7.Mean())
-        output = pd.DataFrame(
-            {
-                "WaitTimeAvg": self.WaitTimeAvg,
-                "SpendTimeMoreThanSeven": self.Prob7Avg
-            }
-        )
+        if ForksPerWarmUp > 1:
+            # confidence intervals from the averages of the forks of
+            #   each warm-up, since forks of one warm-up are correlated
+            self.Results, Forks = sr.RunForked(self.WarmUpState, self.Fork,
+                ["WaitTimeAvg", "SpendTimeMoreThanSeven"], NumReps // ForksPerWarmUp, ForksPerWarmUp)
+        else:
+            for reps in range(0,NumReps,1):
+                self.Start()
+                self.Loop()
+                sf.EndReplication()
+
+        summary = self.Results.Summary()
         print("Means")
-        print(output.mean())
+        for name in self.Results.Names:
+            print(name, summary[name]["Mean"])
         
         print("Standard Deviation")
-        print(np.sqrt(output.var()))
+        for name in self.Results.Names:
+            print(name, summary[name]["StdDev"])
 
         print("95% CI Half-Width")
-        print(1.96*np.sqrt(output.var()/len(output)))
-        output.to_csv('results.csv')
+        for name in self.Results.Names:
+            print(name, summary[name]["HalfWidth"])
+        self.Results.ToCSV('results.csv')
 
 def main():
     sim = Simulation()
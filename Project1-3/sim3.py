@@ -1,26 +1,26 @@
 # -*- coding: utf-8 -*-
-import SimFunctions
-import SimClasses
-import SimRNG
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from pythonsim import SimFunctions
+from pythonsim import SimClasses
+from pythonsim import SimRNG
+from pythonsim import SimResults
+from pythonsim import SimWarmup
+from pythonsim import SimRecords
+import asyncio
+import functools
 import numpy as np
-import csv
-import pandas as pd
 
-np.random.seed(123)
-f = open('TISdata.csv','w', newline= '') 
-fwriter = csv.writer(f) 
 # Initialization
 SimClasses.Clock = 0
 ZSimRNG = SimRNG.InitializeRNSeed()
 Calendar = SimClasses.EventCalendar()
 
 # statistics
-Wait = SimClasses.DTStat()
-ExcessProb = SimClasses.DTStat()   # probability of waiting longer than 5 minutes
+Wait = SimClasses.DTStat("WaitTimeAvg")
+ExcessProb = SimClasses.DTStat("SpendTimeMoreThanSeven")   # probability of waiting longer than 5 minutes
 
-# across-replication statistics
-TotalWait = []
-TotalExcessProb = []
 TISRecords = []
 
 # parameters
@@ -35,8 +35,25 @@ MeanOT = 1.41
 MeanMT = 0.09
 RunLength = 90 + 600
 WarmUp = 90
-NumReps = 10000
-print(NumReps)
+PilotReps = 0           # > 0 to choose WarmUp by MSER-5 and Welch from pilot replications
+NumReps = 10000         # maximum number of replications
+RelativeError = 0.05    # stop when both CIs are within 5% of their mean
+ProfileEvents = False   # True to print event counts and handler times
+
+# random number streams: every purpose has its own stream, and a 
+#   customer's order and move times are drawn when it arrives, so that
+#   the scenarios of SimResults.RunScenarios see the same arrivals and
+#   the same customer times (common random numbers) whatever their
+#   CallCenterUnits, MeanOT or MeanMT; a change of NumBranch changes
+#   the order of arrivals, and so which customer gets which times
+ArrivalStream = 1
+OrderStream = 2
+MoveStream = 3
+
+# draws between the streams of consecutive replications: each stream
+#   takes at most 20,000 draws per replication (about 1,700 with 13
+#   branches), so 35,000 replications fit in the period of the generator
+Spacing = SimRNG.ReplicationSpacing(3, 20000)
 
 # lists of queues and resources for all seven branches
 BranchQs = []
@@ -55,10 +72,44 @@ VQ = SimClasses.FIFOQueue()
 CallCenter = SimClasses.Resource()
 CallCenter.SetUnits(CallCenterUnits)
 
+# scenario parameters for SimResults.RunScenarios, with the values above
+#   as defaults; branches beyond the seven observed ones arrive at their
+#   average rate
+ObservedTBA = MeanTBA[:7]
+Defaults = {"CallCenterUnits": CallCenterUnits, "NumBranch": NumBranch, "MeanOT": MeanOT, "MeanMT": MeanMT}
+
+def Setup(**Parameters):
+    # sets the parameters of a scenario, e.g. Setup(CallCenterUnits=6),
+    #   all others taking their default values; queues and windows of
+    #   branches beyond NumBranch are kept but not used
+    global CallCenterUnits, NumBranch, MeanOT, MeanMT, MeanTBA
+    Unknown = set(Parameters) - set(Defaults)
+    if Unknown:
+        raise ValueError("unknown parameters: {}".format(", ".join(sorted(Unknown))))
+    Values = dict(Defaults, **Parameters)
+    CallCenterUnits = Values["CallCenterUnits"]
+    NumBranch = Values["NumBranch"]
+    MeanOT = Values["MeanOT"]
+    MeanMT = Values["MeanMT"]
+    MeanTBA = ObservedTBA[:NumBranch] + [MeanNew] * (NumBranch - len(ObservedTBA))
+    while len(BranchQs) < NumBranch:
+        BranchQs.append(SimClasses.FIFOQueue())
+        OrderWindow = SimClasses.Resource()
+        OrderWindow.SetUnits(1)
+        BranchWindows.append(OrderWindow)
+    CallCenter.SetUnits(CallCenterUnits)
+
+# customers are ids in an entity table with their branch, the
+#   time they reached the order board, and their order and move times
+Customers = SimClasses.EntityTable({"CreateTime": "d", "Type": "q", "OrderTime": "d", "MoveTime": "d"})
+
 def Arrival(Branch_index): 
-    SimFunctions.SchedulePlus(Calendar,"Arrival",SimRNG.Expon(MeanTBA[Branch_index],1),Branch_index)
+    SimFunctions.SchedulePlus(Calendar,"Arrival",SimRNG.Expon(MeanTBA[Branch_index],ArrivalStream),Branch_index)
     
-    Customer = SimClasses.Entity2(Branch_index)
+    Customer = Customers.New()
+    Customers.Type[Customer] = Branch_index
+    Customers.OrderTime[Customer] = SimRNG.Expon(MeanOT,OrderStream)
+    Customers.MoveTime[Customer] = SimRNG.Expon(MeanMT,MoveStream)
     
     if BranchWindows[Branch_index].CurrentNumBusy == 0:
         BranchWindows[Branch_index].Seize(1)
@@ -69,13 +120,13 @@ def Arrival(Branch_index):
 def MoveToOrder(Customer):
     # This is the event where the customer arrives to the order board.
     # start recording the wait time here
-    Customer.CreateTime = SimClasses.Clock
+    Customers.CreateTime[Customer] = SimClasses.Clock
     
     if CallCenter.CurrentNumBusy < CallCenterUnits:
         CallCenter.Seize(1)
         Wait.Record(0.0)
         ExcessProb.Record(0.0)
-        SimFunctions.SchedulePlus(Calendar,"Departure",SimRNG.Expon(MeanOT,1),Customer)
+        SimFunctions.SchedulePlus(Calendar,"Departure",Customers.OrderTime[Customer],Customer)
     else:
         VQ.Add(Customer)
    
@@ -84,81 +135,117 @@ def Departure(Customer):
     if VQ.NumQueue()>0:
         NewCustomer = VQ.Remove()
         # collect the wait time
-        Wait.Record(SimClasses.Clock - NewCustomer.CreateTime)
-        ExcessProb.Record((SimClasses.Clock - NewCustomer.CreateTime > 7 / 60))
-        TISRecords.append(SimClasses.Clock - NewCustomer.CreateTime) 
-        SimFunctions.SchedulePlus(Calendar,"Departure",SimRNG.Expon(MeanOT,1),NewCustomer)
+        Wait.Record(SimClasses.Clock - Customers.CreateTime[NewCustomer])
+        ExcessProb.Record((SimClasses.Clock - Customers.CreateTime[NewCustomer] > 7 / 60))
+        TISRecords.append(SimClasses.Clock - Customers.CreateTime[NewCustomer]) 
+        SimFunctions.SchedulePlus(Calendar,"Departure",Customers.OrderTime[NewCustomer],NewCustomer)
     else:
         CallCenter.Free(1)
     
     # Check the branch queue of the leaving customer
-    if BranchQs[Customer.Type].NumQueue()>0:
-        BranchCustomer = BranchQs[Customer.Type].Remove()
-        SimFunctions.SchedulePlus(Calendar,"MoveToOrder",SimRNG.Expon(MeanMT,1),BranchCustomer)
+    Branch = Customers.Type[Customer]
+    Customers.Free(Customer)
+    if BranchQs[Branch].NumQueue()>0:
+        BranchCustomer = BranchQs[Branch].Remove()
+        SimFunctions.SchedulePlus(Calendar,"MoveToOrder",Customers.MoveTime[BranchCustomer],BranchCustomer)
     else:
-        BranchWindows[Customer.Type].Free(1)
+        BranchWindows[Branch].Free(1)
 
-warmup_list = []  
-for reps in range(0,NumReps,1):
-    
-    TISRecords = [] 
+# event loop, instrumented with an EventProfile if ProfileEvents is True,
+#   and a loop that stops at the end of the warm-up period
+Handlers = {"Arrival": Arrival, "MoveToOrder": MoveToOrder,
+    "Departure": Departure, "ClearIt": lambda X: SimFunctions.ClearStats()}
+Profile = SimClasses.EventProfile() if ProfileEvents else None
+Loop = SimFunctions.RunLoop(Calendar, Handlers, Profile=Profile)
+WarmUpLoop = SimFunctions.RunLoop(Calendar, Handlers, EndType="ClearIt")
+
+def Start():
     SimFunctions.SimFunctionsInit(Calendar)
     
     # generate the first arrival for each branch
     for ID in range(0,NumBranch,1):
-        SimFunctions.SchedulePlus(Calendar,"Arrival",SimRNG.Expon(MeanTBA[ID], 1),ID)
+        SimFunctions.SchedulePlus(Calendar,"Arrival",SimRNG.Expon(MeanTBA[ID], ArrivalStream),ID)
     
     SimFunctions.Schedule(Calendar,"EndSimulation",RunLength)
     SimFunctions.Schedule(Calendar,"ClearIt",WarmUp)
-    arrival_count = 0
-    while Calendar.N() > 0:
-        NextEvent = Calendar.Remove()
-        SimClasses.Clock = NextEvent.EventTime
-        if NextEvent.EventType == "Arrival":
-            Arrival(NextEvent.WhichObject)
-            arrival_count += 1
-            if arrival_count == 100:
-                warmup_list.append(SimClasses.Clock)  
-        elif NextEvent.EventType == "MoveToOrder":
-            MoveToOrder(NextEvent.WhichObject)
-        elif NextEvent.EventType == "Departure":
-            Departure(NextEvent.WhichObject) 
-        elif NextEvent.EventType == "ClearIt":
-            SimFunctions.ClearStats()
-        elif NextEvent.EventType == "EndSimulation":
-            break
+
+# Writer: SimRecords.RecordWriter, optional, receives the waits in the
+#   virtual queue of replication Rep
+def Replication(Rep, Writer=None):
+    global TISRecords
+    TISRecords = [] 
+    Start()
+    Loop()
     
-    TotalWait.append(Wait.Mean())
-    TotalExcessProb.append(ExcessProb.Mean())
-    fwriter.writerow(TISRecords)
-
-f.close()
-
-# print('Warmup time: {}'.format(np.mean(warmup_list)))
-output = pd.DataFrame(
-            {
-                "WaitTimeAvg": TotalWait,
-                "SpendTimeMoreThanSeven": TotalExcessProb
-            }
-        )
-mean_wt = output['WaitTimeAvg'].mean()
-mean_p = output['SpendTimeMoreThanSeven'].mean()
-
-s2_wt = 1 / (NumReps-1) * ((output['WaitTimeAvg'] - mean_wt) ** 2).sum()
-s2_p = NumReps / (NumReps -1) * mean_p * (1 - mean_p)
-# s2_p = output['SpendTimeMoreThanSeven'].var()
-# s_wt = np.sqrt(s2_wt)
-# s_p = np.sqrt(s2_p)
-s_wt = output['WaitTimeAvg'].std()
-s_p = output['SpendTimeMoreThanSeven'].std()
-ci_wt = s_wt * 1.96 / np.sqrt(NumReps)
-ci_p = s_p * 1.96 / np.sqrt(NumReps)
-
-print("The CI for average waiting time at numberserver = {} is {} pm {}".format(CallCenterUnits, mean_wt, ci_wt))
-print("The CI for probability at numberserver = {} is {} pm {}".format(CallCenterUnits, mean_p, ci_p))
-
-print("The relative error for average waiting time at numberserver = {} is {}".format(CallCenterUnits, s_wt / np.sqrt(NumReps) / mean_wt))
-print("The relative error for probability at numberserver = {} is {}".format(CallCenterUnits,  s_p / np.sqrt(NumReps) / mean_p))
-print('----------------------------')
-print(output.mean())
-output.to_csv('results_{}.csv'.format(CallCenterUnits))
\ No newline at end of file
+    if Writer is not None:
+        Writer.Write(Rep, TISRecords)
+    return [Wait.Mean(), ExcessProb.Mean()]
+
+# warm-started replications for SimResults.RunForked: the state at the
+#   end of the warm-up of replication Rep, and a replication continued
+#   from it with the random numbers of replication Rep
+def WarmUpState(Rep):
+    global TISRecords
+    TISRecords = []
+    Start()
+    WarmUpLoop()
+    SimFunctions.ClearStats()
+    return SimFunctions.Snapshot(Calendar, [TISRecords])
+
+def Fork(State, Rep):
+    SimFunctions.Restore(State, Calendar, [TISRecords], Rep=Rep, Spacing=Spacing)
+    Loop()
+    return [Wait.Mean(), ExcessProb.Mean()]
+
+if __name__ == "__main__":
+    # waits in the virtual queue, by replication, read with
+    #   SimRecords.ReadRecords('TISdata')
+    Writer = SimRecords.RecordWriter('TISdata', {"TIS": "f8"})
+    print(NumReps)
+
+    # choose the warm-up period from the wait-time trajectory of pilot
+    #   replications, in which statistics are never cleared
+    if PilotReps > 0:
+        Pilot = SimClasses.Trajectory(Wait, 5.0, int(RunLength // 5.0))
+        WarmUp = RunLength
+        for Rep in range(PilotReps):
+            Replication(Rep)
+        SimClasses.Trajectory.InstanceList.remove(Pilot)
+        Recommended = SimWarmup.Recommend(Pilot)
+        WarmUp = Recommended["WarmUp"]
+        print("Warm-up: MSER-5 {}, Welch {}, using {}".format(Recommended["MSER"], Recommended["Welch"], WarmUp))
+
+    # run replications until both relative errors are met (checked every
+    #   100 replications, as in SimResults.RunSequential), printing the
+    #   confidence intervals and writing every replication as it finishes;
+    #   a checkpoint is saved every 100 replications, and after an
+    #   interruption "python sim3.py --resume" continues from it with the
+    #   same results (TISdata then holds the resumed replications only)
+    Checkpoint = 'checkpoint_{}.npz'.format(CallCenterUnits)
+    Results = asyncio.run(SimResults.RunStreaming(functools.partial(Replication, Writer=Writer),
+        ["WaitTimeAvg", "SpendTimeMoreThanSeven"],
+        NumReps, Consumers=[SimResults.PrintProgress(Every=100),
+        SimResults.StopWhenConverged(RelativeError=RelativeError, Every=100),
+        SimResults.AppendCSV('results_{}.csv'.format(CallCenterUnits))],
+        Spacing=Spacing, Checkpoint=Checkpoint, CheckpointEvery=100, Resume="--resume" in sys.argv[1:]))
+    os.remove(Checkpoint)
+    print("Replications: {}".format(Results.N()))
+    if Profile is not None:
+        print(Profile.Table())
+
+    Writer.Close()
+
+    summary = Results.Summary()
+    mean_wt = summary["WaitTimeAvg"]["Mean"]
+    mean_p = summary["SpendTimeMoreThanSeven"]["Mean"]
+    ci_wt = summary["WaitTimeAvg"]["HalfWidth"]
+    ci_p = summary["SpendTimeMoreThanSeven"]["HalfWidth"]
+
+    print("The CI for average waiting time at numberserver = {} is {} pm {}".format(CallCenterUnits, mean_wt, ci_wt))
+    print("The CI for probability at numberserver = {} is {} pm {}".format(CallCenterUnits, mean_p, ci_p))
+
+    print("The relative error for average waiting time at numberserver = {} is {}".format(CallCenterUnits, summary["WaitTimeAvg"]["RelativeError"]))
+    print("The relative error for probability at numberserver = {} is {}".format(CallCenterUnits, summary["SpendTimeMoreThanSeven"]["RelativeError"]))
+    print('----------------------------')
+    for name in Results.Names:
+        print(name, summary[name]["Mean"])
\ No newline at end of file
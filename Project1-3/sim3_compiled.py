@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+# The sim3.py model written on SimCompiled, so that a whole replication
+#   runs as compiled code when numba is installed, and a benchmark of
+#   it against the SimClasses version: python sim3_compiled.py
+import sim3
+from pythonsim import SimCompiled
+from pythonsim import SimRNG
+import numpy as np
+import time
+
+# event types
+ARRIVAL, MOVETOORDER, DEPARTURE, CLEARIT, ENDSIMULATION = 0, 1, 2, 3, 4
+
+# statistics
+WAIT, EXCESSPROB = 0, 1
+
+BenchReps = 200
+
+@SimCompiled.Compile
+def NewCustomer(Type, CreateTime, OrderTime, MoveTime, NumCustomers, Branch, Order, Move):
+    # Customers get consecutive ids; the columns double when full
+    if NumCustomers == len(Type):
+        Type = np.concatenate((Type, np.empty_like(Type)))
+        CreateTime = np.concatenate((CreateTime, np.empty_like(CreateTime)))
+        OrderTime = np.concatenate((OrderTime, np.empty_like(OrderTime)))
+        MoveTime = np.concatenate((MoveTime, np.empty_like(MoveTime)))
+    Type[NumCustomers] = Branch
+    OrderTime[NumCustomers] = Order
+    MoveTime[NumCustomers] = Move
+    return Type, CreateTime, OrderTime, MoveTime
+
+@SimCompiled.Compile
+def RunReplication(Seeds, MeanTBA, MeanOT, MeanMT, CallCenterUnits, RunLength, WarmUp,
+        ArrivalStream, OrderStream, MoveStream):
+    NumBranch = len(MeanTBA)
+    Calendar = SimCompiled.EventCalendar(4 * NumBranch + CallCenterUnits + 2)
+    BranchQs = SimCompiled.FIFOQueues(NumBranch, 4096)
+    VQ = SimCompiled.FIFOQueues(1, NumBranch)
+    Stats = SimCompiled.DTStat(2)
+    BranchBusy = np.zeros(NumBranch, dtype=np.int64)
+    CallCenterBusy = 0
+    Type = np.empty(1024, dtype=np.int64)
+    CreateTime = np.empty(1024)
+    OrderTime = np.empty(1024)
+    MoveTime = np.empty(1024)
+    NumCustomers = 0
+
+    for ID in range(NumBranch):
+        SimCompiled.CalendarSchedule(Calendar, SimCompiled.Expon(MeanTBA[ID], Seeds, ArrivalStream), ARRIVAL, ID)
+    SimCompiled.CalendarSchedule(Calendar, RunLength, ENDSIMULATION, 0)
+    SimCompiled.CalendarSchedule(Calendar, WarmUp, CLEARIT, 0)
+
+    while SimCompiled.CalendarN(Calendar) > 0:
+        Clock, EventType, Object = SimCompiled.CalendarRemove(Calendar)
+        if EventType == ARRIVAL:
+            Branch = Object
+            SimCompiled.CalendarSchedule(Calendar, Clock + SimCompiled.Expon(MeanTBA[Branch], Seeds, ArrivalStream), ARRIVAL, Branch)
+            Order = SimCompiled.Expon(MeanOT, Seeds, OrderStream)
+            Move = SimCompiled.Expon(MeanMT, Seeds, MoveStream)
+            Type, CreateTime, OrderTime, MoveTime = NewCustomer(Type, CreateTime, OrderTime, MoveTime,
+                NumCustomers, Branch, Order, Move)
+            Customer = NumCustomers
+            NumCustomers += 1
+            if BranchBusy[Branch] == 0:
+                BranchBusy[Branch] = 1
+                SimCompiled.CalendarSchedule(Calendar, Clock, MOVETOORDER, Customer)
+            else:
+                SimCompiled.QueueAdd(BranchQs, Branch, Customer)
+        elif EventType == MOVETOORDER:
+            Customer = Object
+            CreateTime[Customer] = Clock
+            if CallCenterBusy < CallCenterUnits:
+                CallCenterBusy += 1
+                SimCompiled.DTRecord(Stats, WAIT, 0.0)
+                SimCompiled.DTRecord(Stats, EXCESSPROB, 0.0)
+                SimCompiled.CalendarSchedule(Calendar, Clock + OrderTime[Customer], DEPARTURE, Customer)
+            else:
+                SimCompiled.QueueAdd(VQ, 0, Customer)
+        elif EventType == DEPARTURE:
+            Customer = Object
+            if SimCompiled.QueueN(VQ, 0) > 0:
+                Next = SimCompiled.QueueRemove(VQ, 0)
+                SimCompiled.DTRecord(Stats, WAIT, Clock - CreateTime[Next])
+                SimCompiled.DTRecord(Stats, EXCESSPROB, 1.0 if Clock - CreateTime[Next] > 7 / 60 else 0.0)
+                SimCompiled.CalendarSchedule(Calendar, Clock + OrderTime[Next], DEPARTURE, Next)
+            else:
+                CallCenterBusy -= 1
+            Branch = Type[Customer]
+            if SimCompiled.QueueN(BranchQs, Branch) > 0:
+                Next = SimCompiled.QueueRemove(BranchQs, Branch)
+                SimCompiled.CalendarSchedule(Calendar, Clock + MoveTime[Next], MOVETOORDER, Next)
+            else:
+                BranchBusy[Branch] = 0
+        elif EventType == CLEARIT:
+            SimCompiled.DTClear(Stats)
+        elif EventType == ENDSIMULATION:
+            break
+
+    return SimCompiled.DTMean(Stats, WAIT), SimCompiled.DTMean(Stats, EXCESSPROB)
+
+def Replication(Rep):
+    # Same interface as sim3.Replication, for SimResults runners; without
+    # numba the SimClasses version is faster than uncompiled array code
+    if not SimCompiled.NUMBA:
+        return sim3.Replication(Rep)
+    Seeds = SimCompiled.Seeds()
+    output = RunReplication(Seeds, np.array(sim3.MeanTBA), sim3.MeanOT, sim3.MeanMT,
+        sim3.CallCenterUnits, float(sim3.RunLength), float(sim3.WarmUp),
+        sim3.ArrivalStream, sim3.OrderStream, sim3.MoveStream)
+    SimCompiled.SaveSeeds(Seeds)
+    return list(output)
+
+def Bench(Function, NumReps):
+    outputs = []
+    start = time.perf_counter()
+    for Rep in range(NumReps):
+        SimRNG.SeedReplication(Rep, sim3.Spacing)
+        outputs.append(Function(Rep))
+    return time.perf_counter() - start, np.array(outputs)
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    SimRNG.SeedReplication(0, sim3.Spacing)
+    Replication(0)
+    compile_time = time.perf_counter() - start
+
+    class_time, class_out = Bench(sim3.Replication, BenchReps)
+    compiled_time, compiled_out = Bench(Replication, BenchReps)
+
+    print("numba: {}".format(SimCompiled.NUMBA))
+    print("{} replications of sim3".format(BenchReps))
+    print("{:<12}{:>12}{:>16}".format("core", "seconds", "reps/second"))
+    print("{:<12}{:>12.3f}{:>16.1f}".format("SimClasses", class_time, BenchReps / class_time))
+    print("{:<12}{:>12.3f}{:>16.1f}".format("SimCompiled", compiled_time, BenchReps / compiled_time))
+    print("first call (compile or load): {:.3f} seconds".format(compile_time))
+    print("speed-up: {:.1f}x".format(class_time / compiled_time))
+    print("largest difference in outputs: {}".format(np.abs(class_out - compiled_out).max()))
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+# Replications of the sim3.py model forked from snapshots taken at the
+#   end of the warm-up period, so that the warm-up is simulated once per
+#   NumWarmUps instead of once per replication, compared with ordinary
+#   replications of the same total number: python sim3_fork.py
+# Forks of one warm-up are correlated, so confidence intervals come from
+#   the averages of the forks of each warm-up (see SimResults.RunForked);
+#   the variance of an average is the variance between warm-ups plus
+#   the variance within one divided by ForksPerWarmUp
+import sim3
+from pythonsim import SimResults
+import numpy as np
+import time
+
+NumWarmUps = 20
+ForksPerWarmUp = 10
+Names = ["WaitTimeAvg", "SpendTimeMoreThanSeven"]
+
+if __name__ == "__main__":
+    NumReps = NumWarmUps * ForksPerWarmUp
+    start = time.perf_counter()
+    Full = SimResults.RunReplications(sim3.Replication, Names, NumReps,
+        Spacing=sim3.Spacing)
+    full_time = time.perf_counter() - start
+    start = time.perf_counter()
+    Results, Forks = SimResults.RunForked(sim3.WarmUpState, sim3.Fork, Names, NumWarmUps, ForksPerWarmUp,
+        Spacing=sim3.Spacing)
+    fork_time = time.perf_counter() - start
+
+    # variance of the fork outputs between and within warm-ups
+    Data = Forks.Data[:NumReps].reshape(NumWarmUps, ForksPerWarmUp, len(Names))
+    within = Data.var(axis=1, ddof=1).mean(axis=0)
+    between = np.maximum(Data.mean(axis=1).var(axis=0, ddof=1) - within / ForksPerWarmUp, 0.0)
+
+    print("{} replications of sim3, warm-up {} of run length {}".format(NumReps, sim3.WarmUp, sim3.RunLength))
+    print("{:<24}{:>12}{:>16}".format("", "seconds", "reps/second"))
+    print("{:<24}{:>12.3f}{:>16.1f}".format("full replications", full_time, NumReps / full_time))
+    print("{:<24}{:>12.3f}{:>16.1f}".format("{} x {} forks".format(NumWarmUps, ForksPerWarmUp), fork_time, NumReps / fork_time))
+    for k in range(len(Names)):
+        print(Names[k])
+        print("    full:   {:.6g} pm {:.3g}".format(Full.Mean()[k], Full.HalfWidth()[k]))
+        print("    forked: {:.6g} pm {:.3g}".format(Results.Mean()[k], Results.HalfWidth()[k]))
+        print("    variance between warm-ups {:.3g}, within a warm-up {:.3g}".format(between[k], within[k]))
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# The sim3.py model written with SimProcess, where a customer is one
+#   generator instead of the Arrival, MoveToOrder and Departure events,
+#   and a benchmark of it against the event-scheduling version:
+#   python sim3_process.py
+import sim3
+from pythonsim import SimClasses
+from pythonsim import SimFunctions
+from pythonsim import SimProcess
+from pythonsim import SimRNG
+import numpy as np
+import time
+
+BenchReps = 200
+Calendar = sim3.Calendar
+
+def Customer(Branch, OrderTime, MoveTime):
+    Window = sim3.BranchWindows[Branch]
+    Queued = Window.CurrentNumBusy > 0
+    yield SimProcess.Seize(Window)
+    if Queued:
+        # move up to the order board after the customer ahead leaves
+        yield SimProcess.Timeout(MoveTime)
+    Arrive = SimClasses.Clock
+    yield SimProcess.Seize(sim3.CallCenter)
+    Wait = SimClasses.Clock - Arrive
+    sim3.Wait.Record(Wait)
+    sim3.ExcessProb.Record(Wait > 7 / 60)
+    yield SimProcess.Timeout(OrderTime)
+    yield SimProcess.Release(sim3.CallCenter)
+    yield SimProcess.Release(Window)
+
+def Arrivals(Branch):
+    # order and move times are drawn at arrival, on the streams of sim3
+    while True:
+        yield SimProcess.Timeout(SimRNG.Expon(sim3.MeanTBA[Branch], sim3.ArrivalStream))
+        OrderTime = SimRNG.Expon(sim3.MeanOT, sim3.OrderStream)
+        MoveTime = SimRNG.Expon(sim3.MeanMT, sim3.MoveStream)
+        SimProcess.Start(Calendar, Customer(Branch, OrderTime, MoveTime))
+
+Loop = SimFunctions.RunLoop(Calendar, {"ClearIt": lambda X: SimFunctions.ClearStats()})
+
+def Replication(Rep):
+    # Same interface and outputs as sim3.Replication; customers wait
+    #   for the order window of their branch in the branch queue, and
+    #   for the call center in the virtual queue, as in sim3, and the
+    #   resources of sim3 are left as they were for its own events
+    for Branch in range(sim3.NumBranch):
+        sim3.BranchWindows[Branch].SetProcessQueue(sim3.BranchQs[Branch])
+    sim3.CallCenter.SetProcessQueue(sim3.VQ)
+    try:
+        SimFunctions.SimFunctionsInit(Calendar)
+        for Branch in range(sim3.NumBranch):
+            SimProcess.Start(Calendar, Arrivals(Branch))
+        SimFunctions.Schedule(Calendar, "EndSimulation", sim3.RunLength)
+        SimFunctions.Schedule(Calendar, "ClearIt", sim3.WarmUp)
+        Loop()
+    finally:
+        for Window in sim3.BranchWindows + [sim3.CallCenter]:
+            Window.ProcessQueue = None
+    return [sim3.Wait.Mean(), sim3.ExcessProb.Mean()]
+
+def Bench(Function, NumReps):
+    outputs = []
+    start = time.perf_counter()
+    for Rep in range(NumReps):
+        SimRNG.SeedReplication(Rep, sim3.Spacing)
+        outputs.append(Function(Rep))
+    return time.perf_counter() - start, np.array(outputs)
+
+if __name__ == "__main__":
+    event_time, event_out = Bench(sim3.Replication, BenchReps)
+    process_time, process_out = Bench(Replication, BenchReps)
+
+    print("{} replications of sim3".format(BenchReps))
+    print("{:<12}{:>12}{:>16}".format("style", "seconds", "reps/second"))
+    print("{:<12}{:>12.3f}{:>16.1f}".format("events", event_time, BenchReps / event_time))
+    print("{:<12}{:>12.3f}{:>16.1f}".format("processes", process_time, BenchReps / process_time))
+    print("process / event time: {:.2f}".format(process_time / event_time))
+    print("largest difference in outputs: {}".format(np.abs(event_out - process_out).max()))
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+# Staffing study of the sim3.py model: runs every combination of the
+#   parameter values given (call center units, branches, mean order
+#   time, ...) with one shared pool of worker processes and common
+#   random numbers (sim3 draws arrivals, order times and move times
+#   from streams of their own), and writes all replications of all
+#   scenarios to one tidy table:
+#   python sweep.py --servers 2 3 4 5 6 7 --workers 4
+import sim3
+from pythonsim import SimResults
+import argparse
+
+parser = argparse.ArgumentParser(description='Scenario sweep of sim3.py')
+parser.add_argument('--servers', default = [2, 3, 4, 5, 6, 7], type=int, nargs='+', help='call center units')
+parser.add_argument('--branches', default = [sim3.NumBranch], type=int, nargs='+', help='number of branches')
+parser.add_argument('--meanot', default = [sim3.MeanOT], type=float, nargs='+', help='mean order time (minutes)')
+parser.add_argument('--meanmt', default = [sim3.MeanMT], type=float, nargs='+', help='mean move time (minutes)')
+parser.add_argument('--numreps', default = 1000, type=int, help='replications per scenario')
+parser.add_argument('--workers', default = 1, type=int, help='worker processes')
+parser.add_argument('--output', default = 'results_sweep.csv', help='tidy table of all replications')
+
+Names = ["WaitTimeAvg", "SpendTimeMoreThanSeven"]
+
+def main():
+    args = parser.parse_args()
+    Scenarios = SimResults.ParameterGrid({"CallCenterUnits": args.servers, "NumBranch": args.branches,
+        "MeanOT": args.meanot, "MeanMT": args.meanmt})
+    Results = SimResults.RunScenarios(sim3.Setup, sim3.Replication,
+        Names, Scenarios, args.numreps, Workers=args.workers, Spacing=sim3.Spacing)
+    SimResults.ScenariosToCSV(args.output, Scenarios, Results)
+
+    # each scenario, and its difference from the previous one, paired
+    #   by replication (common random numbers)
+    print('{} scenarios x {} replications, written to {}'.format(len(Scenarios), args.numreps, args.output))
+    for k in range(len(Scenarios)):
+        print(', '.join('{}={}'.format(Name, Value) for Name, Value in Scenarios[k].items()))
+        mean = Results[k].Mean()
+        halfwidth = Results[k].HalfWidth()
+        if k > 0:
+            Difference = SimResults.PairedDifference(Results[k], Results[k-1])
+        for i in range(len(Names)):
+            line = '    {:<24}{:.6g} pm {:.3g}'.format(Names[i], mean[i], halfwidth[i])
+            if k > 0:
+                line += '    change {:.6g} pm {:.3g}'.format(Difference.Mean()[i], Difference.HalfWidth()[i])
+            print(line)
+
+if __name__ == "__main__":
+    main()
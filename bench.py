@@ -0,0 +1,435 @@
+###############################################################
+
+# Benchmarks for the simulation library and the reference models.
+
+#   python bench.py                         run everything, print a table
+#   python bench.py --output base.json      also save the results as JSON
+#   python bench.py --compare base.json     compare with saved results and
+#                                           exit with status 1 on a regression
+
+# Primitives (EventCalendar hold model, FIFOQueue add/remove,
+#   CTStat/DTStat.Record, every SimRNG generator) use the pythonsim
+#   package; each is timed several times and the fastest run is
+#   kept. Imports time "import pythonsim.<module>" in a fresh
+#   interpreter, less the start-up time of the interpreter itself.
+#   The models (hw3/sim.py, Lab3/lab3.py and Project1-3/sim3.py,
+#   event-driven engines) run in their own directory in a
+#   separate process, so that their module-level state stays
+#   apart; their rate is events scheduled on the calendar per second.
+
+# Results are rates (operations per second), so larger is better;
+#   a result is a regression when its rate drops by more than
+#   --threshold (default 20%) from the baseline. Compare runs made
+#   on the same, otherwise idle machine: on a shared one, timings
+#   of identical code can differ by more than that.
+
+###############################################################
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+# directory and module of each reference model
+MODELS = {
+    "hw3": ("hw3", "sim"),
+    "lab3": ("Lab3", "lab3"),
+    "sim3": ("Project1-3", "sim3"),
+    "sim3-process": ("Project1-3", "sim3_process"),
+}
+
+def Measure(Function, Ops, Repeat):
+    '''
+    Times Function() Repeat times and keeps the fastest run
+
+    Input:
+        Function: function of no arguments, performs Ops operations
+        Ops: integer, positive
+        Repeat: integer, positive
+
+    Output:
+        dict with keys "ops", "seconds", "rate" (operations per second)
+    '''
+
+    best = float("inf")
+    for i in range(Repeat):
+        start = time.perf_counter()
+        Function()
+        best = min(best, time.perf_counter() - start)
+    return {"ops": Ops, "seconds": best, "rate": Ops / best}
+
+def CalendarHold(SimClasses, SimRNG, Size, Ops):
+    '''
+    Returns a function that runs the hold model on an
+    EventCalendar with Size events: Ops times, remove the next
+    event and schedule it again an Expon(1) time later
+    The increments are generated beforehand, so only the
+    calendar is timed
+
+    Input:
+        SimClasses, SimRNG: modules
+        Size: integer, positive, number of events on the calendar
+        Ops: integer, positive
+
+    Output:
+        function of no arguments
+    '''
+
+    increments = [float(x) for x in SimRNG.ExponBlock(1.0, 1, Ops)]
+
+    def Run():
+        calendar = SimClasses.EventCalendar()
+        for i in range(Size):
+            Event = SimClasses.EventNotice()
+            Event.EventTime = SimRNG.Expon(1.0, 2)
+            calendar.Schedule(Event)
+        for i in range(Ops):
+            Event = calendar.Remove()
+            Event.EventTime += increments[i]
+            calendar.Schedule(Event)
+    return Run
+
+def QueueAddRemove(SimClasses, Length, Ops):
+    '''
+    Returns a function that keeps Length entities in a FIFOQueue
+    and Ops times adds one and removes one
+
+    Input:
+        SimClasses: module
+        Length: integer, nonnegative
+        Ops: integer, positive
+
+    Output:
+        function of no arguments
+    '''
+
+    def Run():
+        Queue = SimClasses.FIFOQueue()
+        for i in range(Length):
+            Queue.Add(i)
+        for i in range(Ops):
+            Queue.Add(i)
+            Queue.Remove()
+        SimClasses.FIFOQueue.InstanceList.remove(Queue)
+        SimClasses.CTStat.InstanceList.remove(Queue.WIP)
+    return Run
+
+def StatRecord(SimClasses, Kind, Ops):
+    '''
+    Returns a function that calls Record of a new CTStat or
+    DTStat Ops times
+
+    Input:
+        SimClasses: module
+        Kind: "CTStat" or "DTStat"
+        Ops: integer, positive
+
+    Output:
+        function of no arguments
+    '''
+
+    def Run():
+        Stat = getattr(SimClasses, Kind)()
+        for i in range(Ops):
+            SimClasses.Clock = float(i)
+            Stat.Record(1.0)
+        getattr(SimClasses, Kind).InstanceList.remove(Stat)
+    return Run
+
+def Generators(SimRNG):
+    '''
+    Returns the SimRNG generators to benchmark: a dict from name
+    to (function of Ops that draws Ops variates, block or not)
+
+    Input:
+        SimRNG: module
+
+    Output:
+        dict
+    '''
+
+    CDF = [0.25, 0.5, 0.75, 1.0]
+    Routes = SimRNG.ChoiceTable([0.1, 0.05, 0.2, 0.15, 0.1, 0.3, 0.1])
+    Data = [float(x) for x in range(1000)]
+    Table = SimRNG.EmpiricalTable(Data)
+    LinearTable = SimRNG.EmpiricalTable(Data, Continuous=True)
+    def Scalar(Draw):
+        def Run(Ops):
+            for i in range(Ops):
+                Draw()
+        return Run
+    return {
+        "lcgrand": Scalar(lambda: SimRNG.lcgrand(1)),
+        "Expon": Scalar(lambda: SimRNG.Expon(1.0, 1)),
+        "Uniform": Scalar(lambda: SimRNG.Uniform(0.0, 1.0, 1)),
+        "RandomInteger": Scalar(lambda: SimRNG.RandomInteger(CDF, 1)),
+        "Choice(7)": Scalar(lambda: SimRNG.Choice(Routes, 1)),
+        "Erlang(3)": Scalar(lambda: SimRNG.Erlang(3, 1.0, 1)),
+        "Triangular": Scalar(lambda: SimRNG.Triangular(0.0, 1.0, 3.0, 1)),
+        "Normal": Scalar(lambda: SimRNG.Normal(0.0, 1.0, 1)),
+        "Lognormal": Scalar(lambda: SimRNG.Lognormal(1.0, 1.0, 1)),
+        "Gamma(2.5)": Scalar(lambda: SimRNG.Gamma(2.5, 1.0, 1)),
+        "Weibull": Scalar(lambda: SimRNG.Weibull(1.5, 1.0, 1)),
+        "Beta": Scalar(lambda: SimRNG.Beta(2.0, 3.0, 1)),
+        "Poisson(4)": Scalar(lambda: SimRNG.Poisson(4.0, 1)),
+        "Poisson(100)": Scalar(lambda: SimRNG.Poisson(100.0, 1)),
+        "Binomial(20,0.3)": Scalar(lambda: SimRNG.Binomial(20, 0.3, 1)),
+        "Binomial(1000,0.3)": Scalar(lambda: SimRNG.Binomial(1000, 0.3, 1)),
+        "Empirical": Scalar(lambda: SimRNG.Empirical(Table, 1)),
+        "PiecewiseLinear": Scalar(lambda: SimRNG.PiecewiseLinear(LinearTable, 1)),
+        "lcgrandblock": lambda Ops: SimRNG.lcgrandblock(1, Ops),
+        "ExponBlock": lambda Ops: SimRNG.ExponBlock(1.0, 1, Ops),
+        "UniformBlock": lambda Ops: SimRNG.UniformBlock(0.0, 1.0, 1, Ops),
+        "ErlangBlock(3)": lambda Ops: SimRNG.ErlangBlock(3, 1.0, 1, Ops),
+        "TriangularBlock": lambda Ops: SimRNG.TriangularBlock(0.0, 1.0, 3.0, 1, Ops),
+        "GammaBlock(2.5)": lambda Ops: SimRNG.GammaBlock(2.5, 1.0, 1, Ops),
+        "WeibullBlock": lambda Ops: SimRNG.WeibullBlock(1.5, 1.0, 1, Ops),
+        "BetaBlock": lambda Ops: SimRNG.BetaBlock(2.0, 3.0, 1, Ops),
+        "PoissonBlock(4)": lambda Ops: SimRNG.PoissonBlock(4.0, 1, Ops),
+        "PoissonBlock(100)": lambda Ops: SimRNG.PoissonBlock(100.0, 1, Ops),
+        "BinomialBlock(20,0.3)": lambda Ops: SimRNG.BinomialBlock(20, 0.3, 1, Ops),
+        "BinomialBlock(1000,0.3)": lambda Ops: SimRNG.BinomialBlock(1000, 0.3, 1, Ops),
+        "ChoiceBlock(7)": lambda Ops: SimRNG.ChoiceBlock(Routes, 1, Ops),
+        "EmpiricalBlock": lambda Ops: SimRNG.EmpiricalBlock(Table, 1, Ops),
+        "PiecewiseLinearBlock": lambda Ops: SimRNG.PiecewiseLinearBlock(LinearTable, 1, Ops),
+    }
+
+def RunPrimitives(Scale, Repeat):
+    '''
+    Benchmarks the primitives of the pythonsim package
+
+    Input:
+        Scale: float, positive, multiplies the number of operations
+        Repeat: integer, positive
+
+    Output:
+        dict, benchmark name -> result of Measure
+    '''
+
+    from pythonsim import SimClasses
+    from pythonsim import SimRNG
+    SimRNG.SeedReplication(0)
+    n = max(1, int(100000 * Scale))
+    results = {}
+    for Size in (10, 100, 1000):
+        results["calendar.hold[{}]".format(Size)] = Measure(CalendarHold(SimClasses, SimRNG, Size, n), n, Repeat)
+    for Length in (10, 1000):
+        results["queue.add_remove[{}]".format(Length)] = Measure(QueueAddRemove(SimClasses, Length, n), n, Repeat)
+    for Kind in ("CTStat", "DTStat"):
+        results["{}.Record".format(Kind)] = Measure(StatRecord(SimClasses, Kind, n), n, Repeat)
+    for name, Draw in Generators(SimRNG).items():
+        Ops = n * 10 if "Block" in name else n
+        results["rng.{}".format(name)] = Measure(lambda: Draw(Ops), Ops, Repeat)
+    return results
+
+def ImportTime(Statement, Repeat):
+    '''
+    Returns the fastest of Repeat runs of a fresh interpreter that
+    executes Statement, in seconds
+
+    Input:
+        Statement: string, Python code
+        Repeat: integer, positive
+
+    Output:
+        float
+    '''
+
+    best = float("inf")
+    for i in range(Repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", Statement], cwd=ROOT, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def RunImports(Repeat):
+    '''
+    Benchmarks the import time of every module of pythonsim, less
+    the start-up time of the interpreter; its rate is imports
+    per second
+
+    Input:
+        Repeat: integer, positive
+
+    Output:
+        dict, "import.<module>" -> result
+    '''
+
+    import pythonsim
+    startup = ImportTime("pass", Repeat)
+    results = {}
+    for Module in pythonsim.__all__:
+        seconds = max(ImportTime("import pythonsim.{}".format(Module), Repeat) - startup, 1e-6)
+        results["import." + Module] = {"ops": 1, "seconds": seconds, "rate": 1.0 / seconds}
+    return results
+
+def RunModel(Name, NumReps):
+    '''
+    Runs NumReps replications of the event-driven engine of model
+    Name in the current process (called in a separate process by
+    RunModels) and returns its rate in events per second
+
+    Input:
+        Name: string, key of MODELS
+        NumReps: integer, positive
+
+    Output:
+        dict with keys "ops" (events), "reps", "seconds", "rate"
+    '''
+
+    Directory, Module = MODELS[Name]
+    os.chdir(os.path.join(ROOT, Directory))
+    sys.path.insert(0, os.getcwd())
+    sys.argv = [Module]
+    model = __import__(Module)
+    from pythonsim import SimRNG
+
+    if Name == "hw3":
+        args = model.parser.parse_args(["--engine", "event", "--numreps", str(NumReps)])
+        sim = model.Simulation(args)
+        calendar = sim.Calendar
+        def Run():
+            sim.run_event()
+    else:
+        calendar = model.Calendar
+        def Run():
+            for Rep in range(NumReps):
+                SimRNG.SeedReplication(Rep)
+                model.Replication(Rep)
+
+    first = calendar.Sequence
+    start = time.perf_counter()
+    Run()
+    seconds = time.perf_counter() - start
+    events = calendar.Sequence - first
+    return {"ops": events, "reps": NumReps, "seconds": seconds, "rate": events / seconds}
+
+def RunModels(NumReps):
+    '''
+    Runs every model in its own process, see RunModel
+
+    Input:
+        NumReps: integer, positive, replications per model
+
+    Output:
+        dict, "model.<name>" -> result, or {"error": message}
+            if the model could not run
+    '''
+
+    results = {}
+    for Name in MODELS:
+        process = subprocess.run([sys.executable, os.path.abspath(__file__), "--model", Name,
+            "--model-reps", str(NumReps)], capture_output=True, text=True)
+        if process.returncode == 0:
+            results["model." + Name] = json.loads(process.stdout.strip().splitlines()[-1])
+        else:
+            lines = process.stderr.strip().splitlines()
+            results["model." + Name] = {"error": lines[-1] if lines else "exit status {}".format(process.returncode)}
+    return results
+
+def Metadata():
+    '''
+    Returns the environment of the run, saved with the results
+
+    Output:
+        dict
+    '''
+
+    import numpy
+    return {"time": time.strftime("%Y-%m-%d %H:%M:%S"), "python": platform.python_version(),
+        "numpy": numpy.__version__, "platform": platform.platform(), "machine": platform.machine()}
+
+def Table(Results):
+    '''
+    Returns the results as a table
+
+    Input:
+        Results: dict, name -> result
+
+    Output:
+        string
+    '''
+
+    lines = ["{:<28}{:>14}{:>12}{:>16}".format("benchmark", "ops", "seconds", "ops/second")]
+    for name, result in Results.items():
+        if "error" in result:
+            lines.append("{:<28}  failed: {}".format(name, result["error"]))
+        else:
+            lines.append("{:<28}{:>14}{:>12.4f}{:>16.0f}".format(name, result["ops"], result["seconds"], result["rate"]))
+    return "\n".join(lines)
+
+def Compare(Results, Baseline, Threshold):
+    '''
+    Compares the rates of Results with those of Baseline
+
+    Input:
+        Results: dict, name -> result
+        Baseline: dict, name -> result, e.g. loaded from --output
+        Threshold: float, between 0 and 1, largest acceptable
+            relative drop in rate
+
+    Output:
+        (table, regressions): string and list of names
+    '''
+
+    lines = ["{:<28}{:>16}{:>16}{:>10}".format("benchmark", "baseline", "current", "change")]
+    regressions = []
+    for name, result in Results.items():
+        if name not in Baseline or "rate" not in Baseline[name] or "rate" not in result:
+            continue
+        change = result["rate"] / Baseline[name]["rate"] - 1.0
+        flag = ""
+        if change < -Threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        lines.append("{:<28}{:>16.0f}{:>16.0f}{:>9.1f}%{}".format(
+            name, Baseline[name]["rate"], result["rate"], 100.0 * change, flag))
+    return "\n".join(lines), regressions
+
+parser = argparse.ArgumentParser(description="Benchmarks for the simulation library and reference models")
+parser.add_argument("--output", help="save the results to this JSON file")
+parser.add_argument("--compare", help="compare with the results in this JSON file")
+parser.add_argument("--threshold", default=0.20, type=float, help="relative drop in rate that counts as a regression")
+parser.add_argument("--only", choices=["primitives", "imports", "models"], help="run only one group")
+parser.add_argument("--scale", default=1.0, type=float, help="multiplies the number of operations of the primitives")
+parser.add_argument("--repeat", default=5, type=int, help="timings per primitive, the fastest is kept")
+parser.add_argument("--model-reps", default=20, type=int, help="replications per model")
+parser.add_argument("--model", choices=list(MODELS), help=argparse.SUPPRESS)
+
+def main():
+    args = parser.parse_args()
+    if args.model is not None:
+        print(json.dumps(RunModel(args.model, args.model_reps)))
+        return
+
+    results = {}
+    if args.only in (None, "primitives"):
+        results.update(RunPrimitives(args.scale, args.repeat))
+    if args.only in (None, "imports"):
+        results.update(RunImports(args.repeat))
+    if args.only in (None, "models"):
+        results.update(RunModels(args.model_reps))
+    print(Table(results))
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump({"meta": Metadata(), "results": results}, f, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        table, regressions = Compare(results, baseline["results"], args.threshold)
+        print()
+        print(table)
+        if regressions:
+            print("{} regression(s) beyond {:.0%}".format(len(regressions), args.threshold))
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+# Input modeling of the arrivals in ArrivalTimes.xls: fits candidate
+#   distributions to the interarrival times, ranked by goodness of fit,
+#   and estimates the NHPP rate function: python fit.py --width 4
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from pythonsim import SimInput
+import numpy as np
+import argparse
+
+parser = argparse.ArgumentParser(description='Input modeling of ArrivalTimes.xls')
+parser.add_argument('--period', default = 40.0, type=float, help='length of every observation (hours)')
+parser.add_argument('--width', default = 4.0, type=float, help='width of the intervals of the rate function (hours)')
+parser.add_argument('--criterion', default = 'AD', choices=['AD', 'KS', 'AIC'], help='goodness-of-fit ranking')
+
+
+def main():
+    args = parser.parse_args()
+    # one column per observation; every column starts at time 0
+    observations = [column[~np.isnan(column)] for column in
+        SimInput.LoadTable('ArrivalTimes.xls', Header=False).values()]
+    interarrivals = np.concatenate([np.diff(times) for times in observations])
+    arrivals = np.concatenate([times[1:] for times in observations])
+
+    fits = SimInput.FitAll(interarrivals, Criterion=args.criterion)
+    print('{} interarrival times, mean {:.4f}, coefficient of variation {:.4f}'.format(
+        len(interarrivals), interarrivals.mean(), interarrivals.std() / interarrivals.mean()))
+    print(SimInput.FitTable(fits))
+
+    edges, rates = SimInput.ArrivalRates(arrivals, args.period, args.width, len(observations))
+    print('NHPP rate function (arrivals per hour)')
+    for k in range(len(rates)):
+        print('[{:5.1f}, {:5.1f})  {:.3f}'.format(edges[k], edges[k+1], rates[k]))
+
+if __name__ == "__main__":
+    main()
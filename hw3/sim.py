@@ -1,106 +1,150 @@
-from ast import arg
-from cv2 import mean
-import SimClasses as sc
-import SimFunctions as sf
-import SimRNG
-import numpy as np
-import pandas as pd
-import argparse
-
-parser = argparse.ArgumentParser(description='Simulation for M/G/c and M/G/c/k')
-parser.add_argument('--stationary', default = False, type=bool, help='determine if the arrival is stationary')
-parser.add_argument('--runlength', default = 24, type=int, help='running length of the simulation')
-parser.add_argument('--numreps', default = 2000, type=int, help='replication of the simulation')
-# MeanTBA = 0.1
-MeanPT = 1.0 
-
-
-class Simulation:
-    def __init__(self, args) -> None:
-        self.ParkingLot = sc.FIFOQueue()
-        self.Calendar = sc.EventCalendar()
-        self.TimeSpent = sc.DTStat()
-        self.MaxCars = 0 # maximum number of cars in the garage
-        self.MaxCarsAvg =[]
-        self.TimeSpentAvg = [] 
-        self.NumCarsAvg = []
-        self.NUmCarsT = []
-        self.args = args
-        self.car_counts_df = pd.read_excel('CarCounts.xls')
-        if self.args.stationary: 
-            self.MeanTBA = 1 / self.car_counts_df.mean().mean()
-        else:
-            self.MeanTBA = 1 / self.car_counts_df.mean().values
-        
-        
-    def Arrival(self):
-        newCar = sc.Entity()
-        self.ParkingLot.Add(newCar)
-        if self.MaxCars < self.ParkingLot.NumQueue():
-            self.MaxCars = self.ParkingLot.NumQueue()
-        if self.args.stationary:
-            sf.Schedule(self.Calendar, "Arrival", SimRNG.Expon(self.MeanTBA,1))
-        else:
-            i = int(sc.Clock % 8)
-            sf.Schedule(self.Calendar, "Arrival", SimRNG.Expon(self.MeanTBA[i],1))
-        sf.Schedule(self.Calendar, "Departure", SimRNG.Expon(MeanPT,2)) 
-
-    def Departure(self): 
-        DepartingCar = self.ParkingLot.Remove() 
-        self.TimeSpent.Record(sc.Clock - DepartingCar.CreateTime) 
-
-    def run(self):
-        for reps in range(self.args.numreps):
-            sf.SimFunctionsInit(self.Calendar)
-            self.MaxCars = 0
-            
-            if self.args.stationary:
-                sf.Schedule(self.Calendar, "Arrival", SimRNG.Expon(self.MeanTBA,1))
-            else:
-                i = int(sc.Clock % 8)
-                sf.Schedule(self.Calendar, "Arrival", SimRNG.Expon(self.MeanTBA[i],1))
-            sf.Schedule(self.Calendar,"EndSimulation", self.args.runlength) 
-
-            while (self.Calendar.N() > 0):
-                NextEvent = self.Calendar.Remove() 
-                sc.Clock = NextEvent.EventTime 
-                if NextEvent.EventType =="Arrival": 
-                    self.Arrival() 
-                elif NextEvent.EventType =="Departure": 
-                    self.Departure()
-                else: # NextEvent.EventType =="EndSimulation" 
-                    break    
-            
-            self.MaxCarsAvg.append(self.MaxCars)
-            self.TimeSpentAvg.append(self.TimeSpent.Mean())
-            self.NumCarsAvg.append(self.ParkingLot.Mean())
-            if sc.Clock // 8 == 0:
-                self.NUmCarsT.append(self.ParkingLot)
-    
-        print(np.mean(self.MaxCarsAvg)) 
-        print(np.std(self.MaxCarsAvg)) 
-        print(np.mean(self.TimeSpentAvg)) 
-        print(np.std(self.TimeSpentAvg)) 
-        print(np.mean(self.NumCarsAvg)) 
-        print(np.std(self.NumCarsAvg))
-
-        # output = pd.DataFrame( 
-        #     {"MaxCarAvg": self.MaxCarsAvg, 
-        #     "TimeSpentAvg": self.TimeSpentAvg,  
-        #     "NumCarsAvg" : self.NumCarsAvg}) 
-        # output.to_csv("MMInf_output.csv", sep=",")  
-
-        print('The estimate of 0.9-quantile of the maximum number of cars is {}'.format(np.quantile(self.MaxCarsAvg, 0.9)))
-            
-                
-
-def main():
-    args = parser.parse_args()  
-    
-    sc.Clock = 0.0 # initialize the simulation Clock to be 0 
-    RunLength = 8.0 # determine the end of the simulation
-    sim = Simulation(args)
-    sim.run()
-
-if __name__ == "__main__":
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from pythonsim import SimClasses as sc
+from pythonsim import SimFunctions as sf
+from pythonsim import SimInput
+from pythonsim import SimRNG
+from pythonsim import SimVector
+import numpy as np
+import argparse
+
+parser = argparse.ArgumentParser(description='Simulation for M/G/c and M/G/c/k')
+parser.add_argument('--stationary', default = False, type=bool, help='determine if the arrival is stationary')
+parser.add_argument('--runlength', default = 24, type=int, help='running length of the simulation')
+parser.add_argument('--numreps', default = 2000, type=int, help='replication of the simulation')
+parser.add_argument('--engine', default = 'event', choices=['event', 'vector'], help='event loop (as in the original homework) or vectorized infinite-server engine')
+# MeanTBA = 0.1
+MeanPT = 1.0 
+
+
+class Simulation:
+    def __init__(self, args) -> None:
+        self.ParkingLot = sc.FIFOQueue()
+        self.Cars = sc.EntityTable()
+        self.Calendar = sc.EventCalendar()
+        self.TimeSpent = sc.DTStat()
+        self.MaxCars = 0 # maximum number of cars in the garage
+        self.MaxCarsAvg =[]
+        self.TimeSpentAvg = [] 
+        self.NumCarsAvg = []
+        self.NUmCarsT = []
+        self.args = args
+        # hourly arrival rates; the spreadsheet is parsed once and cached
+        self.car_rates = SimInput.CountRates(SimInput.LoadTable('CarCounts.xls'))
+        if self.args.stationary: 
+            self.MeanTBA = 1 / self.car_rates.mean()
+        else:
+            self.MeanTBA = 1 / self.car_rates
+        # draws between the streams of consecutive replications: streams 1
+        #   and 2, at most 10,000 draws each per replication (about 1,200)
+        self.Spacing = SimRNG.ReplicationSpacing(2, 10000)
+        
+        
+    def Arrival(self):
+        newCar = self.Cars.New()
+        self.ParkingLot.Add(newCar)
+        if self.MaxCars < self.ParkingLot.NumQueue():
+            self.MaxCars = self.ParkingLot.NumQueue()
+        if self.args.stationary:
+            sf.Schedule(self.Calendar, "Arrival", SimRNG.Expon(self.MeanTBA,1))
+        else:
+            i = int(sc.Clock % 8)
+            sf.Schedule(self.Calendar, "Arrival", SimRNG.Expon(self.MeanTBA[i],1))
+        sf.Schedule(self.Calendar, "Departure", SimRNG.Expon(MeanPT,2)) 
+
+    def Departure(self): 
+        DepartingCar = self.ParkingLot.Remove() 
+        self.TimeSpent.Record(sc.Clock - self.Cars.CreateTime[DepartingCar]) 
+        self.Cars.Free(DepartingCar)
+
+    def run(self):
+        if self.args.engine == 'vector':
+            self.run_vector()
+        else:
+            self.run_event()
+        self.report()
+
+    def run_vector(self):
+        # The garage has no capacity limit (M/G/infinity), so every replication
+        # is computed at once from its arrival and parking times; replication
+        # reps uses the same random numbers as in run_event(self.Spacing) and
+        # has the same number of cars over time, but TimeSpent is the mean
+        # parking time of the cars that left, while run_event takes every
+        # departing car from the front of ParkingLot
+        Seeds1 = SimRNG.SeedBlock(1, 0, self.args.numreps, self.Spacing)
+        Seeds2 = SimRNG.SeedBlock(2, 0, self.args.numreps, self.Spacing)
+        if self.args.stationary:
+            Interarrival = lambda Now: SimRNG.ExponBlock(self.MeanTBA, Seeds1, 1)[:, 0]
+        else:
+            MeanTBA = np.asarray(self.MeanTBA)
+            Interarrival = lambda Now: SimRNG.ExponBlock(1.0, Seeds1, 1)[:, 0] * MeanTBA[(Now % 8).astype(int)]
+        Arrivals = SimVector.GenerateArrivals(self.args.numreps, self.args.runlength, Interarrival)
+        ParkingTimes = SimRNG.ExponBlock(MeanPT, Seeds2, Arrivals.shape[1])
+        output = SimVector.InfiniteServer(Arrivals, ParkingTimes, self.args.runlength)
+        self.MaxCarsAvg = list(output["MaxOccupancy"])
+        self.TimeSpentAvg = list(output["TimeSpent"])
+        self.NumCarsAvg = list(output["TimeAverage"])
+
+    def run_event(self, Spacing=None):
+        # With Spacing, replication reps uses the streams set by
+        # SimRNG.SeedReplication(reps, Spacing), as in run_vector; without,
+        # the streams continue from one replication to the next, as in the
+        # original homework, whose results this reproduces
+        for reps in range(self.args.numreps):
+            if Spacing is not None:
+                SimRNG.SeedReplication(reps, Spacing)
+            sf.SimFunctionsInit(self.Calendar)
+            self.MaxCars = 0
+            
+            if self.args.stationary:
+                sf.Schedule(self.Calendar, "Arrival", SimRNG.Expon(self.MeanTBA,1))
+            else:
+                i = int(sc.Clock % 8)
+                sf.Schedule(self.Calendar, "Arrival", SimRNG.Expon(self.MeanTBA[i],1))
+            sf.Schedule(self.Calendar,"EndSimulation", self.args.runlength) 
+
+            while (self.Calendar.N() > 0):
+                NextEvent = self.Calendar.Remove() 
+                sc.Clock = NextEvent.EventTime 
+                if NextEvent.EventType =="Arrival": 
+                    self.Arrival() 
+                elif NextEvent.EventType =="Departure": 
+                    self.Departure()
+                else: # NextEvent.EventType =="EndSimulation" 
+                    break    
+            
+            self.MaxCarsAvg.append(self.MaxCars)
+            self.TimeSpentAvg.append(self.TimeSpent.Mean())
+            self.NumCarsAvg.append(self.ParkingLot.Mean())
+            if sc.Clock // 8 == 0:
+                self.NUmCarsT.append(self.ParkingLot)
+
+    def report(self):
+        print(np.mean(self.MaxCarsAvg)) 
+        print(np.std(self.MaxCarsAvg)) 
+        print(np.mean(self.TimeSpentAvg)) 
+        print(np.std(self.TimeSpentAvg)) 
+        print(np.mean(self.NumCarsAvg)) 
+        print(np.std(self.NumCarsAvg))
+
+        # output = pd.DataFrame( 
+        #     {"MaxCarAvg": self.MaxCarsAvg, 
+        #     "TimeSpentAvg": self.TimeSpentAvg,  
+        #     "NumCarsAvg" : self.NumCarsAvg}) 
+        # output.to_csv("MMInf_output.csv", sep=",")  
+
+        print('The estimate of 0.9-quantile of the maximum number of cars is {}'.format(np.quantile(self.MaxCarsAvg, 0.9)))
+            
+                
+
+def main():
+    args = parser.parse_args()  
+    
+    sc.Clock = 0.0 # initialize the simulation Clock to be 0 
+    RunLength = 8.0 # determine the end of the simulation
+    sim = Simulation(args)
+    sim.run()
+
+if __name__ == "__main__":
     main()
\ No newline at end of file
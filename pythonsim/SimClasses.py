@@ -0,0 +1,1361 @@
+###############################################################
+
+# Contains Clock variable and classes for Activity, 
+#   CTStat (continuous-time statistic), DTStat (discrete-time
+#   statistic), Trajectory (batched time path of a statistic),
+#   Entity, EntityTable (entities stored as rows of typed
+#   arrays), EventNotice, EventCalendar, EventProfile (event
+#   counts and handler times of a run loop), FIFOQueue,
+#   and Resource objects.
+
+###############################################################
+
+import array
+import heapq
+import math
+
+# Keeps track of simulation clock time
+Clock = 0
+    
+class CTStat:
+    '''
+    Class of objects for continuous-time statistics
+
+    Class attributes:
+        InstanceList: list of CTStat objects instantiated
+            in simulation model
+
+    Instance attributes:
+        Name: string or None, label of the statistic in
+            across-replication results
+        Area: float
+        Tlast: float, clock time at last call of Record (last update)
+        TClear: float, clock time at last call of Clear
+        Xlast: float, state value at last call of Record
+        Path: Trajectory object or None, time averages over
+            batches of BaseWidth since the last Clear, kept
+            for batch means
+
+    Instance attributes:
+        Record
+        Mean
+        Clear
+        KeepTrajectory
+        BatchMeansCI
+    '''
+
+    InstanceList = []
+
+    def __init__(self, Name=None):
+        '''
+        Initializes variables when a CTStat instance is created
+
+        Input:
+            Name: string, optional, label used by
+                SimResults.ReplicationResults
+        '''
+
+        self.Name = Name
+        self.Area = 0.0
+        self.Tlast = 0.0
+        self.TClear = 0.0
+        self.Xlast = 0.0
+        self.Max = -math.inf
+        self.Min = math.inf
+        self.Path = None
+
+        # Append self to class attribute InstanceList
+        self.__class__.InstanceList.append(self)
+        
+    def Record(self,X):
+        '''
+        Updates Area, Tlast, and Xlast 
+        Updates observed Max and Min
+        Note that this method should be called after the variable value changes
+
+        Input:
+            X: float, new value of variable monitored for CTStat instance
+        '''
+
+        self.Area += self.Xlast * (Clock - self.Tlast)
+        self.Tlast = Clock
+        self.Xlast = X
+
+        if X > self.Max:
+            self.Max = X
+
+        if X < self.Min:
+            self.Min = X
+
+    def Mean(self):
+        '''
+        Returns the sample mean up through the current time but does not update any values
+
+        Output:
+            mean: float
+        '''
+
+        mean = 0.0
+        if (Clock - self.TClear) > 0.0:
+           mean = ((self.Area + self.Xlast * (Clock - self.Tlast)) 
+            / (Clock - self.TClear))
+        return mean
+    
+    def Clear(self):
+        '''
+        Resets Area to 0.0 and sets Tlast and TClear to current clock time
+        '''
+
+        self.Area = 0.0
+        self.Tlast = Clock
+        self.TClear = Clock
+
+    def KeepTrajectory(self, BaseWidth):
+        '''
+        Starts keeping time averages over batches of BaseWidth time
+            units (from the next replication, or call Path.Start), 
+            which BatchMeansCI combines into larger batches
+        BaseWidth should be small compared with the run length
+
+        Input:
+            BaseWidth: float, positive
+        '''
+
+        self.Path = Trajectory(self, BaseWidth, None)
+
+    def BatchMeansCI(self, Alpha=0.05, NumBatches=None, Method="Fixed"):
+        '''
+        Returns a batch-means confidence interval for the steady-state
+            time average from a single long replication, using the
+            batches of BaseWidth kept since the last Clear
+        See SimResults.BatchMeansCI
+
+        Input:
+            Alpha: float, between 0 and 1
+            NumBatches: integer, optional; if None, the batch size
+                is chosen by a lag-1 autocorrelation test
+            Method: string, "Fixed" (nonoverlapping batch means)
+                or "Overlapping"
+
+        Output:
+            (mean, halfwidth, batchsize): tuple of floats
+        '''
+
+        from . import SimResults
+        return SimResults.BatchMeansCI(self.Path.Data[-1], Alpha, NumBatches, Method)
+
+class DTStat():
+    '''
+    Class of objects for discrete-time statistics
+
+    Class attributes:
+        InstanceList: list of DTStat objects instantiated
+            in simulation model
+
+    Instance attributes:
+        Name: string or None, label of the statistic in
+            across-replication results
+        Sum: float, current sum of observations
+        SumOfSquares: float, current sum of squared observations
+        NumberOfObservations: integer, current number of observations
+        Observations: list of floats or None, observations since
+            the last Clear, kept for batch means
+
+    Instance attributes:
+        Record
+        Mean
+        StdDev
+        N
+        Clear
+        KeepObservations
+        BatchMeansCI
+    '''
+
+    InstanceList = []
+
+    def __init__(self, Name=None):
+        '''
+        Initializes variables when a DTStat instance is created
+
+        Input:
+            Name: string, optional, label used by
+                SimResults.ReplicationResults
+        '''
+
+        self.Name = Name
+        self.Sum = 0.0
+        self.SumOfSquares = 0.0
+        self.NumberOfObservations = 0.0
+        self.Max = -math.inf
+        self.Min = math.inf
+        self.Observations = None
+
+        # Append self to class attribute InstanceList
+        self.__class__.InstanceList.append(self)
+    
+    def Record(self,X):
+        '''
+        Updates Sum, SumOfSquares, and NumberOfObservations
+        Updates observed Max and Min
+
+        Input:
+            X: float, newest observation value to incorporate in Sum
+                and SumOfSquares
+        '''
+
+        self.Sum += + X
+        self.SumOfSquares += X * X
+        self.NumberOfObservations += 1
+        if self.Observations is not None:
+            self.Observations.append(X)
+
+        if X > self.Max:
+            self.Max = X
+
+        if X < self.Min:
+            self.Min = X
+        
+    def Mean(self):
+        '''
+        Returns the sample mean of the DTStat based on 
+            observations collected thus far
+
+        Output:
+            mean: float
+        '''
+
+        mean = 0.0
+        if self.NumberOfObservations > 0.0:
+            mean = self.Sum / self.NumberOfObservations
+        return mean
+
+    def StdDev(self):
+        '''
+        Returns the sample standard deviation of the DTStat based on
+            observations collected thus far
+
+        Output:
+            stddev: float, nonnegative
+        '''
+
+        stddev = 0.0
+        if self.NumberOfObservations > 1.0:
+            stddev = math.sqrt((self.SumOfSquares - self.Sum**2 
+                / self.NumberOfObservations) / (self.NumberOfObservations - 1))
+        return stddev
+            
+    def N(self):
+        '''
+        Returns NumberOfObservations
+
+        Output
+            integer, nonnegative
+        '''
+        
+        return self.NumberOfObservations
+    
+    def Clear(self):
+        '''
+        Resets Sum, SumOfSquares, and NumberOfObservations to 0.0
+        '''
+        
+        self.Sum = 0.0
+        self.SumOfSquares = 0.0
+        self.NumberOfObservations = 0.0
+        if self.Observations is not None:
+            self.Observations = []
+
+    def KeepObservations(self):
+        '''
+        Starts keeping every observation recorded after this call
+            (until the next Clear), for BatchMeansCI
+        '''
+
+        self.Observations = []
+
+    def BatchMeansCI(self, Alpha=0.05, NumBatches=None, Method="Fixed"):
+        '''
+        Returns a batch-means confidence interval for the steady-state
+            mean from a single long replication, using the 
+            observations kept since the last Clear
+        See SimResults.BatchMeansCI
+
+        Input:
+            Alpha: float, between 0 and 1
+            NumBatches: integer, optional; if None, the batch size
+                is chosen by a lag-1 autocorrelation test
+            Method: string, "Fixed" (nonoverlapping batch means)
+                or "Overlapping"
+
+        Output:
+            (mean, halfwidth, batchsize): tuple of floats
+        '''
+
+        from . import SimResults
+        return SimResults.BatchMeansCI(self.Observations, Alpha, NumBatches, Method)
+
+class Trajectory():
+    '''
+    Class of objects for recording the time path of a CTStat or
+        DTStat in batches of BatchWidth time units, e.g. for 
+        warm-up analysis with SimWarmup
+    Batches are taken by internal events on the event calendar,
+        so recording costs nothing per call of Record
+    Each batch value is the time average (CTStat) or the mean of
+        the observations (DTStat, NaN if there are none) within
+        the batch; ClearStats restarts the trajectory, so for 
+        warm-up analysis statistics should not be cleared
+
+    Class attributes:
+        InstanceList: list of Trajectory objects instantiated
+            in simulation model
+
+    Instance attributes:
+        Stat: CTStat or DTStat object
+        BatchWidth: float, positive, length of a batch in time
+        NumBatches: integer, positive, batches per replication,
+            or None to keep sampling until the replication ends
+        Data: list of lists of floats, one list per replication
+        Last: tuple, cumulative area or (sum, number of 
+            observations) at the end of the last batch
+        Pending: EventNotice object, end of the current batch
+
+    Instance methods:
+        Start
+        Restart
+        Sample
+    '''
+
+    InstanceList = []
+
+    def __init__(self, Stat, BatchWidth, NumBatches):
+        '''
+        Initializes an empty trajectory
+
+        Input:
+            Stat: CTStat or DTStat object
+            BatchWidth: float, positive
+            NumBatches: integer, positive, or None for no limit
+        '''
+
+        self.Stat = Stat
+        self.BatchWidth = BatchWidth
+        self.NumBatches = NumBatches
+        self.Data = []
+        self.Last = None
+        self.Pending = None
+
+        # Append self to class attribute InstanceList
+        self.__class__.InstanceList.append(self)
+
+    def Cumulative(self):
+        '''
+        Returns the cumulative area (CTStat) or the sum and number of
+            observations (DTStat) of Stat at the current time
+
+        Output:
+            tuple of floats
+        '''
+
+        if isinstance(self.Stat, CTStat):
+            return (self.Stat.Area + self.Stat.Xlast * (Clock - self.Stat.Tlast), 1.0)
+        return (self.Stat.Sum, self.Stat.NumberOfObservations)
+
+    def Start(self, calendar):
+        '''
+        Starts the trajectory of a new replication and schedules
+            the end of the first batch on calendar
+        Called by SimFunctionsInit
+
+        Input:
+            calendar: EventCalendar object
+        '''
+
+        self.Data.append([])
+        self.Last = self.Cumulative()
+        self.ScheduleSample(calendar)
+
+    def Restart(self):
+        '''
+        Discards the batches of the current replication and starts
+            the first batch at the current time
+        Called by ClearStats after the statistics are cleared
+        '''
+
+        if self.Pending is None:
+            return
+        self.Pending.Cancelled = True
+        self.Data[-1] = []
+        self.Last = self.Cumulative()
+        self.ScheduleSample(self.Pending.WhichObject)
+
+    def ScheduleSample(self, calendar):
+        '''
+        Schedules the internal event at the end of the next batch
+
+        Input:
+            calendar: EventCalendar object
+        '''
+
+        addedEvent = EventNotice()
+        addedEvent.EventType = "TrajectorySample"
+        addedEvent.EventTime = Clock + self.BatchWidth
+        addedEvent.WhichObject = calendar
+        addedEvent.Handler = self.Sample
+        calendar.Schedule(addedEvent)
+        self.Pending = addedEvent
+
+    def Sample(self, Event):
+        '''
+        Handler of the internal "TrajectorySample" event: appends 
+            the value of the batch that just ended
+
+        Input:
+            Event: EventNotice object
+        '''
+
+        current = self.Cumulative()
+        if isinstance(self.Stat, CTStat):
+            value = (current[0] - self.Last[0]) / self.BatchWidth
+        elif current[1] > self.Last[1]:
+            value = (current[0] - self.Last[0]) / (current[1] - self.Last[1])
+        else:
+            value = math.nan
+        self.Data[-1].append(value)
+        self.Last = current
+
+        if self.NumBatches is None or len(self.Data[-1]) < self.NumBatches:
+            self.ScheduleSample(Event.WhichObject)
+        else:
+            self.Pending = None
+
+class Entity():
+    '''
+    Class of objects for modeling generic simulation entities
+
+    Instance attributes:
+        CreateTime: float, value of Clock at creation time
+    '''
+
+    def __init__(self):
+        '''
+        Assigns a new instance the current Clock time at creation time
+        Add additional problem-specific attributes here
+        '''
+
+        self.CreateTime = Clock
+class Entity2():
+    '''
+    Class of objects for modeling generic simulation entities
+
+    Instance attributes:
+        CreateTime: float, value of Clock at creation time
+    '''
+
+    def __init__(self, type):
+        '''
+        Assigns a new instance the current Clock time at creation time
+        Add additional problem-specific attributes here
+        '''
+
+        self.CreateTime = Clock
+        self.Type = type
+
+class EntityTable():
+    '''
+    Class of objects for storing many entities compactly: each
+        attribute is a column (array.array of one type code) and
+        an entity is an integer id, the row that holds its
+        attributes, e.g. Customers.CreateTime[ID]
+    Ids are what queues, resources and event notices
+        (WhichObject) carry; ids of entities that left are kept
+        on a free list and reused by New, and the columns double
+        in length when no id is free
+    Memory per entity is the item size of each column (8 bytes
+        for "d" and "q") instead of an object with a __dict__
+
+    Class attributes:
+        InstanceList: list of EntityTable objects instantiated
+            in simulation model
+
+    Instance attributes:
+        Columns: dict, attribute name -> array type code
+        One array.array per column, named after the attribute
+        FreeIDs: array.array of ids available for reuse
+        Capacity: integer, number of rows allocated
+        NumEntities: integer, number of ids in use
+
+    Instance methods:
+        New
+        Free
+        N
+        Clear
+    '''
+
+    InstanceList = []
+
+    def __init__(self, Columns=None, Capacity=1024):
+        '''
+        Allocates Capacity rows of every column
+
+        Input:
+            Columns: dict, attribute name -> array type code,
+                default {"CreateTime": "d"}; a "CreateTime"
+                column is set to Clock by New, as in Entity
+            Capacity: integer, positive, initial number of rows
+        '''
+
+        if Columns is None:
+            Columns = {"CreateTime": "d"}
+        self.Columns = dict(Columns)
+        for name, typecode in self.Columns.items():
+            setattr(self, name, array.array(typecode, [0]) * Capacity)
+        self.Capacity = Capacity
+        self.FreeIDs = array.array("q", range(Capacity - 1, -1, -1))
+        self.NumEntities = 0
+        self.HasCreateTime = "CreateTime" in self.Columns
+
+        # Append self to class attribute InstanceList
+        self.__class__.InstanceList.append(self)
+
+    def New(self):
+        '''
+        Returns the id of a new entity, reusing a freed id if
+            there is one; other attributes keep the values of
+            the previous entity with that id, so set them next
+
+        Output:
+            integer, nonnegative
+        '''
+
+        if len(self.FreeIDs) == 0:
+            for name, typecode in self.Columns.items():
+                getattr(self, name).extend(array.array(typecode, [0]) * self.Capacity)
+            self.FreeIDs.extend(range(2 * self.Capacity - 1, self.Capacity - 1, -1))
+            self.Capacity *= 2
+        ID = self.FreeIDs.pop()
+        self.NumEntities += 1
+        if self.HasCreateTime:
+            self.CreateTime[ID] = Clock
+        return ID
+
+    def Free(self, ID):
+        '''
+        Releases the id of an entity that left the model
+
+        Input:
+            ID: integer, returned by New
+        '''
+
+        self.FreeIDs.append(ID)
+        self.NumEntities -= 1
+
+    def N(self):
+        '''
+        Returns the number of entities in use
+
+        Output:
+            integer, nonnegative
+        '''
+
+        return self.NumEntities
+
+    def Clear(self):
+        '''
+        Frees all ids, keeping the allocated rows
+        '''
+
+        self.FreeIDs = array.array("q", range(self.Capacity - 1, -1, -1))
+        self.NumEntities = 0
+
+class EventNotice():
+    '''
+    Class of objects for modeling event notices
+
+    Instance attributes:
+        EventTime: float
+        EventType: string
+        WhichObject: Entity object
+        Cancelled: Boolean, True if the event was cancelled after
+            being scheduled; cancelled events are skipped by
+            EventCalendar.Remove
+        Handler: function or None, internal events (e.g. resource
+            capacity changes) carry a Handler that EventCalendar.Remove
+            calls itself instead of returning the event to the model
+    '''
+
+    def __init__(self):
+        '''
+        Initializes EventTime, EventType, and WhichObject attributes
+        Add additional problem-specific attributes here
+        '''
+
+        self.EventTime = 0.0
+        self.EventType = ""
+        self.WhichObject = None
+        self.Cancelled = False
+        self.Handler = None
+        
+        
+class EventCalendar:
+    '''
+    Class of objects for modeling event calendars, which are
+        lists of event notices ordered by time
+    Based on a blueprint created by Steve Roberts
+
+    Note: the event calendar is kept as a binary heap, so 
+        scheduling and removing an event take O(log n) time.
+        Events with equal EventTime are removed in the order
+        in which they were scheduled
+
+    Instance attributes:
+        ThisCalendar: list used as a heap of 
+            (EventTime, Sequence, EventNotice) entries
+        Sequence: integer, number of events scheduled so far,
+            used to break ties in EventTime
+
+    Instance methods:
+        Schedule
+        Remove
+        Cancel
+        N
+
+    '''
+
+    def __init__(self):
+        '''
+        Initializes event calendar as empty list by default
+        '''
+
+        self.ThisCalendar = []   
+        self.Sequence = 0
+    
+    def Schedule(self,addedEvent):
+        '''
+        Adds EventNotice to ThisCalendar using its EventTime
+            so that events are removed in increasing order
+            of event time
+
+        Input:
+            addedEvent: EventNotice object
+        '''
+        
+        self.Sequence += 1
+        heapq.heappush(self.ThisCalendar, (addedEvent.EventTime, self.Sequence, addedEvent))
+    
+    def Remove(self):
+        '''
+        Removes the next event from the event calendar and returns it
+        Cancelled events are discarded, and internal events (those
+            with a Handler) are executed at their event time and
+            not returned
+
+        Output:
+            EventNotice object
+        '''
+
+        global Clock
+        while len(self.ThisCalendar) > 0:
+            NextEvent = heapq.heappop(self.ThisCalendar)[2]
+            if NextEvent.Cancelled:
+                continue
+            if NextEvent.Handler is None:
+                return NextEvent
+            Clock = NextEvent.EventTime
+            NextEvent.Handler(NextEvent)
+
+    def Cancel(self,removedEvent):
+        '''
+        Cancels a scheduled EventNotice in O(1) time; the notice
+            stays on ThisCalendar until its time is reached and
+            is then discarded by Remove
+
+        Input:
+            removedEvent: EventNotice object
+        '''
+
+        removedEvent.Cancelled = True
+        
+    def N(self):
+        '''
+        Returns current number of events on the event calendar,
+            including cancelled events not yet discarded
+
+        Output
+            integer, nonnegative
+        '''
+
+        return len(self.ThisCalendar)
+    
+class EventProfile():
+    '''
+    Class of objects for profiling the run loop of a model,
+        filled by the loop that SimFunctions.RunLoop returns
+        when it is given an EventProfile; accumulates over
+        replications until Clear
+
+    Instance attributes:
+        Counts: dict, EventType -> number of events handled
+        TotalNs: dict, EventType -> total handler time, in
+            nanoseconds (time.perf_counter_ns)
+        MaxNs: dict, EventType -> longest handler call, in nanoseconds
+        RemoveNs: integer, total time in EventCalendar.Remove,
+            including the internal events that it executes
+        PeakCalendar: integer, largest number of events on the calendar
+        PeakQueues: list of integers, largest number in queue of
+            each FIFOQueue in FIFOQueue.InstanceList
+
+    Instance methods:
+        Record
+        Table
+        Clear
+    '''
+
+    def __init__(self):
+        '''
+        Initializes an empty profile
+        '''
+
+        self.Clear()
+
+    def Record(self, EventType, Ns, calendar):
+        '''
+        Records one handled event and updates the peak calendar
+            and queue sizes
+
+        Input:
+            EventType: string
+            Ns: integer, handler time in nanoseconds
+            calendar: EventCalendar object
+        '''
+
+        if EventType in self.Counts:
+            self.Counts[EventType] += 1
+            self.TotalNs[EventType] += Ns
+            if Ns > self.MaxNs[EventType]:
+                self.MaxNs[EventType] = Ns
+        else:
+            self.Counts[EventType] = 1
+            self.TotalNs[EventType] = Ns
+            self.MaxNs[EventType] = Ns
+
+        if len(calendar.ThisCalendar) > self.PeakCalendar:
+            self.PeakCalendar = len(calendar.ThisCalendar)
+        Queues = FIFOQueue.InstanceList
+        if len(self.PeakQueues) < len(Queues):
+            self.PeakQueues.extend([0] * (len(Queues) - len(self.PeakQueues)))
+        for i in range(len(Queues)):
+            if len(Queues[i].ThisQueue) > self.PeakQueues[i]:
+                self.PeakQueues[i] = len(Queues[i].ThisQueue)
+
+    def Table(self):
+        '''
+        Returns a summary table, one row per EventType in
+            decreasing order of total time, followed by the
+            time in EventCalendar.Remove and the peak sizes
+
+        Output:
+            string
+        '''
+
+        Total = sum(self.TotalNs.values()) + self.RemoveNs
+        lines = ["{:<20}{:>10}{:>12}{:>8}{:>12}{:>12}".format(
+            "EventType", "Count", "Total ms", "%", "Mean us", "Max us")]
+        for EventType in sorted(self.Counts, key=lambda E: -self.TotalNs[E]):
+            lines.append("{:<20}{:>10}{:>12.1f}{:>8.1f}{:>12.2f}{:>12.1f}".format(
+                str(EventType), self.Counts[EventType], self.TotalNs[EventType] / 1e6,
+                100.0 * self.TotalNs[EventType] / max(Total, 1),
+                self.TotalNs[EventType] / self.Counts[EventType] / 1e3,
+                self.MaxNs[EventType] / 1e3))
+        NumEvents = sum(self.Counts.values())
+        lines.append("{:<20}{:>10}{:>12.1f}{:>8.1f}{:>12.2f}".format(
+            "(calendar Remove)", NumEvents, self.RemoveNs / 1e6,
+            100.0 * self.RemoveNs / max(Total, 1), self.RemoveNs / max(NumEvents, 1) / 1e3))
+        lines.append("Peak calendar size: {}".format(self.PeakCalendar))
+        lines.append("Peak queue lengths: {}".format(self.PeakQueues))
+        return "\n".join(lines)
+
+    def Clear(self):
+        '''
+        Discards everything recorded so far
+        '''
+
+        self.Counts = {}
+        self.TotalNs = {}
+        self.MaxNs = {}
+        self.RemoveNs = 0
+        self.PeakCalendar = 0
+        self.PeakQueues = []
+
+class FIFOQueue:
+    '''
+    Class of objects for FIFO (first-in-first-out) Queues
+
+    Class attributes:
+        InstanceList: list of FIFOQueue objects instantiated
+            in simulation model
+
+    Instance attributes:
+        WIP: CTStat object, for number in queue
+            (work-in-progress) over time
+        ThisQueue: list of Entity objects
+
+    Instance methods:
+        NumQueue
+        Add
+        AddFirst
+        Remove
+        Mean
+    '''
+
+    InstanceList = []
+
+    def __init__(self):
+        '''
+        Initializes FIFOQueue attributes
+        '''
+
+        self.WIP = CTStat()
+        self.ThisQueue = []
+
+        # Append self to class attribute InstanceList
+        self.__class__.InstanceList.append(self)
+        
+    def NumQueue(self):
+        '''
+        Returns current number in queue
+
+        Output:
+            integer, nonnegative
+        '''
+        
+        return len(self.ThisQueue)
+        
+    def Add(self,X):
+        '''
+        Adds an entity to the end of the queue
+
+        Input:
+            X: Entity object
+        '''
+
+        self.ThisQueue.append(X)
+        numqueue = self.NumQueue()
+        self.WIP.Record(float(numqueue))    
+
+    def AddFirst(self,X):
+        '''
+        Adds an entity to the front of the queue, e.g. an entity
+            that was preempted and should resume service next
+
+        Input:
+            X: Entity object
+        '''
+
+        self.ThisQueue.insert(0,X)
+        self.WIP.Record(float(self.NumQueue()))
+    
+    def Remove(self):
+        '''
+        Removes and returns the first entity from the queue
+            and updates queue statistics
+
+        Output:
+            remove: Entity object
+        '''
+
+        if len(self.ThisQueue) > 0:
+            remove = self.ThisQueue.pop(0)
+            self.WIP.Record(float(self.NumQueue()))
+            return remove
+        
+    def Mean(self):
+        '''
+        Returns the average number in queue up to the current time
+
+        Output:
+            float, nonnegative
+        '''
+        return self.WIP.Mean()
+
+class Activity:
+    '''
+    Class of objects for modeling an activity 
+        between nodes in a stochastic 
+        activity network (SAN)
+
+    Works with class Node
+
+    Instance attributes:
+        Destination: Node object 
+        CompletionTime: float, nonnegative,
+            random variable realization
+    '''
+
+    def __init__(self):
+        self.Destination = None
+        self.CompletionTime = 0
+
+class Node:
+    '''
+    Class of objects for modeling a node 
+        in a stochastic activity network (SAN)
+
+    Works with class Activity
+
+    Instance attributes:
+        Incoming: list of Node objects
+        Outgoing: list of Node objects
+    '''
+
+    def __init__(self):
+        self.Incoming = []
+        self.Outgoing = []
+        
+class Resource:
+    '''
+    Class of objects for resources 
+
+    Class attributes:
+        InstanceList: list of FIFOQueue objects instantiated
+            in simulation model
+
+    Instance attributes:
+        CurrentNumBusy: integer, current number of busy resources
+        NumberOfUnits: integer, current total number of resources
+        NumBusyStat: CTStat object, for number of busy resources
+            over time
+        NumUnitsStat: CTStat object, for number of scheduled 
+            resources (capacity) over time
+        CapacitySchedule: list of (time, units) pairs, or None if
+            the capacity is fixed
+        CycleLength: float or None, period after which the 
+            capacity schedule repeats
+        Policy: string, "Finish" or "Preempt", what happens to
+            busy units when the capacity is reduced
+        PreemptMode: string or None, "Resume" or "Repeat" if a 
+            higher-priority entity may preempt a lower-priority one
+            in SeizeEntity, None otherwise
+        Queue: FIFOQueue object, where preempted entities rejoin
+            unless the entity has its own Queue attribute
+        OnChange: function or None, called with the resource
+            after every scheduled capacity change
+        InService: list used as a heap of [key, Entity] entries for 
+            the entities seized with SeizeEntity, so that the 
+            lowest-priority entity is found in O(log n) time
+        Serving: dictionary, for every entity in service, its
+            [key, Entity, CompletionEvent, ServiceTime] entry
+        RemainingService: dictionary, for every preempted entity,
+            the service time left when it is seized again
+        NumStarted: integer, number of SeizeEntity calls, used to
+            order entities with equal priority
+        ProcessQueue: FIFOQueue object or None, where processes
+            wait to seize units (see SimProcess and SetProcessQueue)
+
+    Instance methods:
+        Seize
+        Free
+        SeizeEntity
+        FreeEntity
+        Preempt
+        LowestPriority
+        Mean
+        Utilization
+        SetUnits
+        SetPreemption
+        SetSchedule
+        StartSchedule
+        SetProcessQueue
+        ServeProcesses
+    '''
+
+    # This is a generic Resource object that also keeps track of statistics
+    # on number of busy resources
+
+    InstanceList = []
+
+    def __init__(self):
+        '''
+        Initializes attributes
+        '''
+        
+        self.CurrentNumBusy = 0
+        self.NumberOfUnits = 0
+        self.NumBusyStat = CTStat()
+        self.NumUnitsStat = CTStat()
+        self.CapacitySchedule = None
+        self.CycleLength = None
+        self.Policy = "Finish"
+        self.PreemptMode = None
+        self.Queue = None
+        self.OnChange = None
+        self.InService = []
+        self.Serving = {}
+        self.RemainingService = {}
+        self.NumStarted = 0
+        self.ProcessQueue = None
+
+        # Append self to class attribute InstanceList
+        self.__class__.InstanceList.append(self)
+        
+    def Seize(self, Units):
+        '''
+        Attempts to seize Units of resource and then update statistics
+        If Units is greater than the number of units available, 
+            no units are seized and the method returns False
+        Otherwise, Units are seized and the method returns True
+
+        Input:
+            Units: integer, nonnegative
+
+        Output:
+            free: Boolean
+        '''
+
+        # Computes number of non-busy units
+        available = self.NumberOfUnits - self.CurrentNumBusy
+
+        if available >= Units:
+            self.CurrentNumBusy += Units
+            self.NumBusyStat.Record(float(self.CurrentNumBusy))
+            seize = True
+        else:
+            seize = False
+        return seize
+        
+    def Free(self, Units):
+        '''
+        Attempts to free Units of resource and then update statistics
+        If Units is greater than the number of busy units, 
+            no units are freed and the method returns False
+        Otherwise, Units are freed and the method returns True
+
+        Input:
+            Units: integer, nonnegative
+
+        Output:
+            free: Boolean
+        '''
+
+        if self.CurrentNumBusy >= Units:
+            self.CurrentNumBusy -= Units
+            self.NumBusyStat.Record(float(self.CurrentNumBusy))
+            free = True
+        else:
+            free = False
+        return free
+
+    def SeizeEntity(self, calendar, TheEntity, EventType, ServiceTime=None, Priority=0):
+        '''
+        Seizes one unit for TheEntity and schedules its end of service
+        The end-of-service EventNotice, ServiceTime and Priority are
+            kept by the resource in Serving, keyed by TheEntity, so 
+            that TheEntity can be an Entity object or an integer id
+            of an EntityTable; the EventNotice is cancelled if 
+            TheEntity is preempted
+        If no unit is available and PreemptMode is set, the 
+            lowest-priority entity in service is preempted when its
+            Priority is larger (less urgent) than Priority
+        Otherwise, if no unit is available, nothing is scheduled and 
+            the method returns False
+
+        Input:
+            calendar: EventCalendar object
+            TheEntity: Entity object or integer EntityTable id
+            EventType: string, type of the end-of-service event
+            ServiceTime: float, nonnegative; if None, the service 
+                time left when TheEntity was preempted is used
+            Priority: number, smaller values are more urgent
+
+        Output:
+            seize: Boolean
+        '''
+
+        # Preempting frees one unit, which is enough only if the
+        #   capacity was not cut below CurrentNumBusy (Policy "Finish")
+        busy = self.CurrentNumBusy
+        if self.PreemptMode is not None and busy - 1 < self.NumberOfUnits <= busy:
+            victim = self.LowestPriority()
+            if victim is not None and -self.Serving[victim][0][0] > Priority:
+                self.Preempt(victim)
+
+        if not self.Seize(1):
+            return False
+
+        # The full service time is kept for PreemptMode "Repeat"
+        remaining = self.RemainingService.pop(TheEntity, None)
+        if ServiceTime is None:
+            delay, ServiceTime = remaining
+        else:
+            delay = ServiceTime
+
+        addedEvent = EventNotice()
+        addedEvent.EventType = EventType
+        addedEvent.EventTime = Clock + delay
+        addedEvent.WhichObject = TheEntity
+        calendar.Schedule(addedEvent)
+
+        # Entities with the largest Priority, and among them the 
+        #   latest started, are at the top of the heap
+        self.NumStarted += 1
+        entry = [(-Priority, -self.NumStarted), TheEntity, addedEvent, ServiceTime]
+        heapq.heappush(self.InService, entry)
+        self.Serving[TheEntity] = entry
+        return True
+
+    def FreeEntity(self, TheEntity):
+        '''
+        Frees the unit held by TheEntity, typically called from
+            its end-of-service event
+
+        Input:
+            TheEntity: Entity object or integer EntityTable id
+                seized with SeizeEntity
+
+        Output:
+            free: Boolean
+        '''
+
+        # Entries are removed lazily from the InService heap
+        entry = self.Serving.pop(TheEntity)
+        entry[1] = None
+        return self.Free(1)
+
+    def LowestPriority(self):
+        '''
+        Returns the entity in service with the largest Priority,
+            the most recently started one in case of ties,
+            or None if no entity was seized with SeizeEntity
+
+        Output:
+            Entity object, integer EntityTable id or None
+        '''
+
+        while len(self.InService) > 0 and self.InService[0][1] is None:
+            heapq.heappop(self.InService)
+        if len(self.InService) > 0:
+            return self.InService[0][1]
+        return None
+
+    def Preempt(self, TheEntity):
+        '''
+        Removes TheEntity from service: cancels its end-of-service 
+            event, frees its unit and puts it at the front of its
+            queue (TheEntity.Queue if set, otherwise Queue)
+        With PreemptMode "Repeat" the whole ServiceTime starts over 
+            when the entity is seized again; otherwise ("Resume")
+            the remaining service time is used
+        The time to serve is kept by the resource in RemainingService,
+            keyed by TheEntity, until SeizeEntity is called for 
+            TheEntity without a ServiceTime
+
+        Input:
+            TheEntity: Entity object or integer EntityTable id 
+                seized with SeizeEntity; an integer id has no Queue 
+                attribute and always rejoins Queue
+        Raises ValueError if there is no queue to rejoin
+        '''
+
+        queue = getattr(TheEntity, "Queue", self.Queue)
+        if queue is None:
+            raise ValueError("no queue for the preempted entity; "
+                             "set one with SetPreemption or SetSchedule")
+        entry = self.Serving[TheEntity]
+        completion, serviceTime = entry[2], entry[3]
+        completion.Cancelled = True
+        if self.PreemptMode == "Repeat":
+            self.RemainingService[TheEntity] = (serviceTime, serviceTime)
+        else:
+            self.RemainingService[TheEntity] = (completion.EventTime - Clock, serviceTime)
+        self.FreeEntity(TheEntity)
+        queue.AddFirst(TheEntity)
+    
+    def Mean(self):
+        '''
+        Returns time-average number of busy resources up to current time
+        
+        Output:
+            float, nonnegative
+        '''
+
+        return self.NumBusyStat.Mean()
+
+    def Utilization(self):
+        '''
+        Returns time-average number of busy resources divided by 
+            time-average scheduled capacity up to current time
+
+        Output:
+            float, nonnegative
+        '''
+
+        capacity = self.NumUnitsStat.Mean()
+        utilization = 0.0
+        if capacity > 0.0:
+            utilization = self.NumBusyStat.Mean() / capacity
+        return utilization
+        
+    def SetUnits(self, Units):
+        '''
+        Sets the capacity of the resource (number of identical units)
+        If the capacity drops below CurrentNumBusy and Policy is
+            "Preempt", the lowest-priority entities are preempted
+
+        Input:
+            Units: integer, nonnegative
+        '''
+
+        self.NumberOfUnits = Units
+        self.NumUnitsStat.Record(float(Units))
+
+        if self.Policy == "Preempt":
+            while self.CurrentNumBusy > self.NumberOfUnits:
+                victim = self.LowestPriority()
+                if victim is None:
+                    break
+                self.Preempt(victim)
+
+    def SetPreemption(self, Mode="Resume", Queue=None):
+        '''
+        Lets a higher-priority entity preempt a lower-priority one
+            in SeizeEntity when no unit is available
+        A preempted entity's end-of-service event is cancelled and
+            the entity rejoins the front of its queue
+
+        Input:
+            Mode: string, "Resume" to continue the remaining service
+                time after preemption, "Repeat" to start the whole
+                service time over, or None to disable preemption
+            Queue: FIFOQueue object, where preempted entities rejoin
+                unless the entity has its own Queue attribute
+        '''
+
+        self.PreemptMode = Mode
+        if Queue is not None:
+            self.Queue = Queue
+
+    def SetSchedule(self, Schedule, CycleLength=None, Policy="Finish", Queue=None, OnChange=None):
+        '''
+        Sets a piecewise-constant capacity schedule, e.g. staffing 
+            by shift. The schedule is started by SimFunctionsInit at
+            the beginning of every replication, and the capacity
+            changes are executed by the event calendar without any
+            event handling in the model
+
+        With Policy "Finish", busy units above a reduced capacity
+            finish their current job before leaving. With Policy 
+            "Preempt", entities in service (seized with SeizeEntity)
+            are preempted immediately, lowest priority first, and
+            rejoin their queue as described in Preempt
+
+        Input:
+            Schedule: list of (time, units) pairs; units apply from 
+                time until the next pair
+            CycleLength: float, optional, the schedule repeats every
+                CycleLength time units (e.g. 24 hours)
+            Policy: string, "Finish" or "Preempt"
+            Queue: FIFOQueue object, where preempted entities rejoin
+            OnChange: function, optional, called with the resource 
+                after every capacity change, e.g. to start service
+                for waiting entities when capacity increases
+        '''
+
+        self.CapacitySchedule = sorted(Schedule)
+        self.CycleLength = CycleLength
+        self.Policy = Policy
+        if Queue is not None:
+            self.Queue = Queue
+        self.OnChange = OnChange
+
+    def StartSchedule(self, calendar):
+        '''
+        Applies the capacity in effect at the current time and 
+            schedules the next capacity change on calendar
+        Called by SimFunctionsInit
+
+        Input:
+            calendar: EventCalendar object
+        '''
+
+        current = None
+        for k in range(len(self.CapacitySchedule)):
+            if self.CapacitySchedule[k][0] <= Clock:
+                current = k
+        if current is not None:
+            self.SetUnits(self.CapacitySchedule[current][1])
+        self.ScheduleNextChange(calendar, 0 if current is None else current + 1, 0.0)
+
+    def ScheduleNextChange(self, calendar, Index, CycleStart):
+        '''
+        Schedules the internal event for entry Index of 
+            CapacitySchedule in the cycle that starts at CycleStart
+
+        Input:
+            calendar: EventCalendar object
+            Index: integer, nonnegative
+            CycleStart: float
+        '''
+
+        if Index >= len(self.CapacitySchedule):
+            if self.CycleLength is None:
+                return
+            Index = 0
+            CycleStart += self.CycleLength
+
+        addedEvent = EventNotice()
+        addedEvent.EventType = "CapacityChange"
+        addedEvent.EventTime = CycleStart + self.CapacitySchedule[Index][0]
+        addedEvent.WhichObject = (calendar, Index, CycleStart)
+        addedEvent.Handler = self.ChangeCapacity
+        calendar.Schedule(addedEvent)
+
+    def ChangeCapacity(self, Event):
+        '''
+        Handler of the internal "CapacityChange" event
+
+        Input:
+            Event: EventNotice object
+        '''
+
+        calendar, Index, CycleStart = Event.WhichObject
+        self.SetUnits(self.CapacitySchedule[Index][1])
+        self.ScheduleNextChange(calendar, Index + 1, CycleStart)
+        if self.ProcessQueue is not None:
+            self.ServeProcesses()
+        if self.OnChange is not None:
+            self.OnChange(self)
+
+    def SetProcessQueue(self, Queue=None):
+        '''
+        Sets the queue where processes wait to seize units of the
+            resource (see SimProcess). Call it when the model is set
+            up, like the other queues, so that SimFunctionsInit,
+            ClearStats and Snapshot include the queue from the start
+            of every replication
+
+        Input:
+            Queue: FIFOQueue object, optional, e.g. to keep statistics
+                on a queue of the model; by default a new FIFOQueue
+
+        Output:
+            FIFOQueue object
+        '''
+
+        if Queue is None:
+            Queue = FIFOQueue()
+        self.ProcessQueue = Queue
+        return Queue
+
+    def ServeProcesses(self):
+        '''
+        Gives available units to the processes waiting in 
+            ProcessQueue, in FIFO order, and resumes them at the 
+            current time; called by SimProcess after a Release and
+            after every scheduled capacity change
+        '''
+
+        Queue = self.ProcessQueue.ThisQueue
+        while Queue and self.Seize(Queue[0].Units):
+            Waiting = self.ProcessQueue.Remove()
+            Waiting.EventTime = Clock
+            Waiting.Calendar.Schedule(Waiting)
@@ -0,0 +1,540 @@
+###############################################################
+
+# Contains an array-based simulation core that can be compiled
+#   with numba: a heap event calendar, banks of ring-buffer FIFO
+#   queues, DTStat and CTStat records held in float arrays, and
+#   the PMMLCG of SimRNG with its seeds in an integer array.
+
+# Everything is a plain function of numpy arrays, so a model
+#   writes its event handlers and its event loop as functions
+#   of arrays too and decorates them with Compile; the whole
+#   replication then runs as compiled code. Without numba,
+#   Compile returns the function unchanged and the same model
+#   still runs, as ordinary Python; indexing numpy arrays one
+#   element at a time is slower than SimClasses, so a model
+#   should fall back to its SimClasses version when NUMBA is False.
+
+# lcgrand, Expon, Uniform and Erlang reproduce SimRNG exactly,
+#   so a compiled replication that draws the same variates in
+#   the same order gives the same results as one built on
+#   SimClasses. Use Seeds to start from the current SimRNG
+#   streams (e.g. after SimRNG.SeedReplication) and SaveSeeds
+#   to hand them back.
+
+# Containers have a fixed capacity chosen when they are created;
+#   IndexError is raised when it is exceeded.
+
+###############################################################
+
+import numpy as np
+from . import SimRNG
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+NUMBA = numba is not None
+
+def Compile(Function):
+    '''
+    Compiles Function with numba in nopython mode, caching the
+    machine code on disk, or returns it unchanged if numba is not
+    installed; use as a decorator on event handlers and event loops
+
+    Input:
+        Function: function of numbers and numpy arrays
+
+    Output:
+        function
+    '''
+
+    if numba is None:
+        return Function
+    return numba.njit(cache=True)(Function)
+
+def Seeds():
+    '''
+    Returns a copy of the current SimRNG seeds as an integer array
+
+    Output:
+        numpy array of integers, one per stream
+    '''
+
+    return np.array(SimRNG.ZRNG, dtype=np.int64)
+
+def SaveSeeds(TheSeeds):
+    '''
+    Sets the SimRNG seeds to TheSeeds, e.g. after a compiled
+    replication, so that later scalar draws continue the streams
+
+    Input:
+        TheSeeds: numpy array of integers, see Seeds
+    '''
+
+    for i in range(len(TheSeeds)):
+        SimRNG.ZRNG[i] = int(TheSeeds[i])
+
+@Compile
+def lcgrand(TheSeeds, Stream):
+    '''
+    Obtains the next Uniform(0,1) random variate from Stream,
+    as SimRNG.lcgrand does, and advances TheSeeds[Stream-1]
+
+    Input:
+        TheSeeds: numpy array of integers, see Seeds
+        Stream: integer, random number stream
+
+    Output:
+        float
+    '''
+
+    MODLUS = 2147483647
+    MULT1 = 24112
+    MULT2 = 26143
+    zi = TheSeeds[Stream-1]
+    lowprd = (zi & 65535) * MULT1
+    hi31 = (zi // 65536) * MULT1 + lowprd // 65536
+    zi = ((lowprd & 65535) - MODLUS) + ((hi31 & 32767) * 65536) + (hi31 // 32768)
+    if zi < 0:
+        zi += MODLUS
+    lowprd = (zi & 65535) * MULT2
+    hi31 = (zi // 65536) * MULT2 + (lowprd // 65536)
+    zi = ((lowprd & 65535) - MODLUS) + ((hi31 & 32767) * 65536) + (hi31 // 32768)
+    if zi < 0:
+        zi += MODLUS
+    TheSeeds[Stream-1] = zi
+    return (zi // 128 | 1) / 16777216.0
+
+@Compile
+def Expon(Mean, TheSeeds, Stream):
+    '''
+    Obtains an exponential random variate with given Mean,
+    as SimRNG.Expon does
+
+    Input:
+        Mean: float, positive
+        TheSeeds: numpy array of integers, see Seeds
+        Stream: integer, random number stream
+
+    Output:
+        float
+    '''
+
+    return -np.log(1 - lcgrand(TheSeeds, Stream)) * Mean
+
+@Compile
+def Uniform(Lower, Upper, TheSeeds, Stream):
+    '''
+    Obtains a Uniform(Lower,Upper) random variate,
+    as SimRNG.Uniform does
+
+    Input:
+        Lower: float
+        Upper: float, must be greater than Lower
+        TheSeeds: numpy array of integers, see Seeds
+        Stream: integer, random number stream
+
+    Output:
+        float
+    '''
+
+    return Lower + (Upper - Lower) * lcgrand(TheSeeds, Stream)
+
+@Compile
+def Erlang(m, Mean, TheSeeds, Stream):
+    '''
+    Obtains an Erlang random variate with m phases and given
+    Mean, as SimRNG.Erlang does
+
+    Input:
+        m: integer, positive, number of phases
+        Mean: float, positive
+        TheSeeds: numpy array of integers, see Seeds
+        Stream: integer, random number stream
+
+    Output:
+        float
+    '''
+
+    Sum = 0.0
+    for i in range(m):
+        Sum = Sum + Expon(Mean / m, TheSeeds, Stream)
+    return Sum
+
+@Compile
+def EventCalendar(Capacity=1024):
+    '''
+    Returns an empty event calendar holding at most Capacity
+    events, as a tuple of arrays (Times, Events, Meta):
+        Times: event times, a binary heap ordered by time and
+            then by scheduling order (FIFO on ties, as in
+            SimClasses.EventCalendar)
+        Events: rows (sequence number, EventType, WhichObject)
+        Meta: (number of events, next sequence number)
+    Event types and objects are integers, e.g. constants of the
+    model and entity ids
+
+    Input:
+        Capacity: integer, positive
+
+    Output:
+        tuple of numpy arrays
+    '''
+
+    return (np.zeros(Capacity), np.zeros((Capacity, 3), dtype=np.int64),
+        np.zeros(2, dtype=np.int64))
+
+@Compile
+def CalendarBefore(Calendar, i, j):
+    '''
+    Returns True if heap entry i comes before heap entry j
+
+    Input:
+        Calendar: tuple, see EventCalendar
+        i, j: integers, nonnegative
+
+    Output:
+        boolean
+    '''
+
+    Times, Events, Meta = Calendar
+    if Times[i] != Times[j]:
+        return Times[i] < Times[j]
+    return Events[i, 0] < Events[j, 0]
+
+@Compile
+def CalendarSwap(Calendar, i, j):
+    '''
+    Exchanges heap entries i and j
+
+    Input:
+        Calendar: tuple, see EventCalendar
+        i, j: integers, nonnegative
+    '''
+
+    Times, Events, Meta = Calendar
+    Times[i], Times[j] = Times[j], Times[i]
+    for k in range(3):
+        Events[i, k], Events[j, k] = Events[j, k], Events[i, k]
+
+@Compile
+def CalendarSchedule(Calendar, EventTime, EventType, WhichObject):
+    '''
+    Adds an event to Calendar
+
+    Input:
+        Calendar: tuple, see EventCalendar
+        EventTime: float, absolute time of the event
+        EventType: integer
+        WhichObject: integer
+    '''
+
+    Times, Events, Meta = Calendar
+    i = Meta[0]
+    if i == len(Times):
+        raise IndexError("EventCalendar is full")
+    Times[i] = EventTime
+    Events[i, 0] = Meta[1]
+    Events[i, 1] = EventType
+    Events[i, 2] = WhichObject
+    Meta[0] += 1
+    Meta[1] += 1
+    while i > 0:
+        parent = (i - 1) // 2
+        if not CalendarBefore(Calendar, i, parent):
+            break
+        CalendarSwap(Calendar, i, parent)
+        i = parent
+
+@Compile
+def CalendarRemove(Calendar):
+    '''
+    Removes the next event from Calendar
+
+    Input:
+        Calendar: tuple, see EventCalendar
+
+    Output:
+        (EventTime, EventType, WhichObject): float, integer, integer
+    '''
+
+    Times, Events, Meta = Calendar
+    n = Meta[0]
+    if n == 0:
+        raise IndexError("EventCalendar is empty")
+    EventTime = Times[0]
+    EventType = Events[0, 1]
+    WhichObject = Events[0, 2]
+    n -= 1
+    Meta[0] = n
+    if n > 0:
+        CalendarSwap(Calendar, 0, n)
+        i = 0
+        while True:
+            first = i
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < n and CalendarBefore(Calendar, child, first):
+                    first = child
+            if first == i:
+                break
+            CalendarSwap(Calendar, i, first)
+            i = first
+    return EventTime, EventType, WhichObject
+
+@Compile
+def CalendarN(Calendar):
+    '''
+    Returns the number of events on Calendar
+
+    Input:
+        Calendar: tuple, see EventCalendar
+
+    Output:
+        integer, nonnegative
+    '''
+
+    return Calendar[2][0]
+
+@Compile
+def CalendarClear(Calendar):
+    '''
+    Removes all events from Calendar and restarts its sequence numbers
+
+    Input:
+        Calendar: tuple, see EventCalendar
+    '''
+
+    Calendar[2][0] = 0
+    Calendar[2][1] = 0
+
+@Compile
+def FIFOQueues(Number=1, Capacity=1024):
+    '''
+    Returns Number empty FIFO queues of integers (e.g. entity ids),
+    each holding at most Capacity items, as a tuple of arrays
+    (Items, Meta): row q of Items is the ring buffer of queue q,
+    and row q of Meta is (position of the first item, number of items)
+
+    Input:
+        Number: integer, positive
+        Capacity: integer, positive
+
+    Output:
+        tuple of numpy arrays
+    '''
+
+    return (np.zeros((Number, Capacity), dtype=np.int64),
+        np.zeros((Number, 2), dtype=np.int64))
+
+@Compile
+def QueueAdd(Queues, q, X):
+    '''
+    Adds X at the end of queue q
+
+    Input:
+        Queues: tuple, see FIFOQueues
+        q: integer, nonnegative, queue index
+        X: integer
+    '''
+
+    Items, Meta = Queues
+    Capacity = Items.shape[1]
+    if Meta[q, 1] == Capacity:
+        raise IndexError("FIFOQueue is full")
+    Items[q, (Meta[q, 0] + Meta[q, 1]) % Capacity] = X
+    Meta[q, 1] += 1
+
+@Compile
+def QueueRemove(Queues, q):
+    '''
+    Removes and returns the first item of queue q
+
+    Input:
+        Queues: tuple, see FIFOQueues
+        q: integer, nonnegative, queue index
+
+    Output:
+        integer
+    '''
+
+    Items, Meta = Queues
+    if Meta[q, 1] == 0:
+        raise IndexError("FIFOQueue is empty")
+    X = Items[q, Meta[q, 0]]
+    Meta[q, 0] = (Meta[q, 0] + 1) % Items.shape[1]
+    Meta[q, 1] -= 1
+    return X
+
+@Compile
+def QueueN(Queues, q):
+    '''
+    Returns the number of items in queue q
+
+    Input:
+        Queues: tuple, see FIFOQueues
+        q: integer, nonnegative, queue index
+
+    Output:
+        integer, nonnegative
+    '''
+
+    return Queues[1][q, 1]
+
+@Compile
+def QueueClear(Queues):
+    '''
+    Empties all queues
+
+    Input:
+        Queues: tuple, see FIFOQueues
+    '''
+
+    Queues[1][:, :] = 0
+
+# Positions of the fields of DTStat and CTStat arrays
+DT_SUM, DT_SUMOFSQUARES, DT_N, DT_MAX, DT_MIN = 0, 1, 2, 3, 4
+CT_AREA, CT_TLAST, CT_TCLEAR, CT_XLAST, CT_MAX, CT_MIN = 0, 1, 2, 3, 4, 5
+
+@Compile
+def DTStat(Number=1):
+    '''
+    Returns Number discrete-time statistics, one row each with
+    the fields of SimClasses.DTStat (Sum, SumOfSquares,
+    NumberOfObservations, Max, Min)
+
+    Input:
+        Number: integer, positive
+
+    Output:
+        numpy array of floats, shape (Number, 5)
+    '''
+
+    Stat = np.zeros((Number, 5))
+    Stat[:, DT_MAX] = -np.inf
+    Stat[:, DT_MIN] = np.inf
+    return Stat
+
+@Compile
+def DTRecord(Stat, i, X):
+    '''
+    Records observation X in statistic i, as DTStat.Record does
+
+    Input:
+        Stat: numpy array, see DTStat
+        i: integer, nonnegative
+        X: float
+    '''
+
+    Stat[i, DT_SUM] += X
+    Stat[i, DT_SUMOFSQUARES] += X * X
+    Stat[i, DT_N] += 1
+    if X > Stat[i, DT_MAX]:
+        Stat[i, DT_MAX] = X
+    if X < Stat[i, DT_MIN]:
+        Stat[i, DT_MIN] = X
+
+@Compile
+def DTMean(Stat, i):
+    '''
+    Returns the sample mean of statistic i
+
+    Input:
+        Stat: numpy array, see DTStat
+        i: integer, nonnegative
+
+    Output:
+        float
+    '''
+
+    if Stat[i, DT_N] > 0.0:
+        return Stat[i, DT_SUM] / Stat[i, DT_N]
+    return 0.0
+
+@Compile
+def DTClear(Stat):
+    '''
+    Resets Sum, SumOfSquares and NumberOfObservations of every
+    statistic, as DTStat.Clear does
+
+    Input:
+        Stat: numpy array, see DTStat
+    '''
+
+    Stat[:, DT_SUM] = 0.0
+    Stat[:, DT_SUMOFSQUARES] = 0.0
+    Stat[:, DT_N] = 0.0
+
+@Compile
+def CTStat(Number=1):
+    '''
+    Returns Number continuous-time statistics, one row each with
+    the fields of SimClasses.CTStat (Area, Tlast, TClear, Xlast,
+    Max, Min)
+
+    Input:
+        Number: integer, positive
+
+    Output:
+        numpy array of floats, shape (Number, 6)
+    '''
+
+    Stat = np.zeros((Number, 6))
+    Stat[:, CT_MAX] = -np.inf
+    Stat[:, CT_MIN] = np.inf
+    return Stat
+
+@Compile
+def CTRecord(Stat, i, X, Clock):
+    '''
+    Records that statistic i changes to X at time Clock,
+    as CTStat.Record does
+
+    Input:
+        Stat: numpy array, see CTStat
+        i: integer, nonnegative
+        X: float
+        Clock: float
+    '''
+
+    Stat[i, CT_AREA] += Stat[i, CT_XLAST] * (Clock - Stat[i, CT_TLAST])
+    Stat[i, CT_TLAST] = Clock
+    Stat[i, CT_XLAST] = X
+    if X > Stat[i, CT_MAX]:
+        Stat[i, CT_MAX] = X
+    if X < Stat[i, CT_MIN]:
+        Stat[i, CT_MIN] = X
+
+@Compile
+def CTMean(Stat, i, Clock):
+    '''
+    Returns the time average of statistic i up to time Clock
+
+    Input:
+        Stat: numpy array, see CTStat
+        i: integer, nonnegative
+        Clock: float
+
+    Output:
+        float
+    '''
+
+    if Clock - Stat[i, CT_TCLEAR] > 0.0:
+        return ((Stat[i, CT_AREA] + Stat[i, CT_XLAST] * (Clock - Stat[i, CT_TLAST]))
+            / (Clock - Stat[i, CT_TCLEAR]))
+    return 0.0
+
+@Compile
+def CTClear(Stat, Clock):
+    '''
+    Resets Area and sets Tlast and TClear of every statistic to
+    Clock, as CTStat.Clear does
+
+    Input:
+        Stat: numpy array, see CTStat
+        Clock: float
+    '''
+
+    Stat[:, CT_AREA] = 0.0
+    Stat[:, CT_TLAST] = Clock
+    Stat[:, CT_TCLEAR] = Clock
@@ -0,0 +1,288 @@
+###############################################################
+
+# Contains SimFunctionsInit, Schedule, SchedulePlus,
+#   RunLoop, ClearStats and EndReplication functions, which 
+#   operate on discrete event simulation objects defined in 
+#   SimClasses, and Snapshot and Restore, which copy the
+#   complete state of a model (e.g. at the end of the warm-up
+#   period) and put it back, so that many replications can be
+#   forked from one warm-up.
+
+# Forked replications are not independent: they share the state
+#   at the snapshot, including the events already on the
+#   calendar, so treating them as independent replications gives
+#   confidence intervals that are too narrow. Each fork on its own
+#   has the distribution of a full replication, so point estimates
+#   are unchanged; for confidence intervals use independent
+#   warm-ups and the average of the forks of each one, as
+#   SimResults.RunForked does.
+
+###############################################################
+
+import copy
+import sys
+import time
+from . import SimClasses
+from . import SimRNG
+
+def SimFunctionsInit(calendar):
+    '''
+    Initializes simulation replication
+    Clears states from previous replication 
+    Typically called before the first replication and between replications
+
+    Input:
+        calendar: EventCalendar object
+    '''
+    
+    # Reset simulation clock to time 0
+    SimClasses.Clock = 0.0
+    
+    # Empty the event calendar
+    calendar.ThisCalendar = []
+        
+    # Empty queues
+    for Q in SimClasses.FIFOQueue.InstanceList:
+        Q.ThisQueue = []
+
+    # Free all entity ids
+    for Table in SimClasses.EntityTable.InstanceList:
+        Table.Clear()
+
+    # Reinitialize resources
+    for Re in SimClasses.Resource.InstanceList:
+        Re.CurrentNumBusy = 0.0
+        Re.InService = []
+        Re.Serving = {}
+        Re.RemainingService = {}
+    
+    # Clear statistics
+    for CT in SimClasses.CTStat.InstanceList:
+        CT.Clear()
+        CT.Xlast = 0.0   
+        
+    for DT in SimClasses.DTStat.InstanceList:
+        DT.Clear()
+
+    # Restart capacity schedules, or keep the fixed capacity
+    for Re in SimClasses.Resource.InstanceList:
+        Re.NumUnitsStat.Xlast = float(Re.NumberOfUnits)
+        if Re.CapacitySchedule is not None:
+            Re.StartSchedule(calendar)
+
+    # Start recording trajectories of the new replication
+    for Tr in SimClasses.Trajectory.InstanceList:
+        Tr.Start(calendar)
+ 
+def Schedule(calendar,EventType, TimeUntilEvent):
+    '''
+    Creates EventNotice object with given EventType and EventTime
+    Schedules event to occur at time SimClasses.Clock + TimeUntilEvent
+
+    Input:
+        calendar: EventCalendar object
+        EventType: string
+        TimeUntilEvent: float, nonnegative, cannot be before current clock time
+    '''
+    
+    addedEvent = SimClasses.EventNotice()
+    addedEvent.EventType = EventType
+    addedEvent.EventTime = SimClasses.Clock + TimeUntilEvent
+    calendar.Schedule(addedEvent)
+    
+
+def SchedulePlus(calendar,EventType, TimeUntilEvent, TheObject):
+    '''
+    Same functionality as function Schedule(calendar, EventType, TimeUntilEvent)
+    With addition of setting TheObject as the WhichObject attribute
+
+    Input:
+        calendar: EventCalendar object
+        EventType: string
+        TimeUntilEvent: float, nonnegative, cannot be before current clock time
+        TheObject: PythonSim class object, e.g. Entity object
+    '''
+    
+    addedEvent = SimClasses.EventNotice()
+    addedEvent.EventType = EventType
+    addedEvent.EventTime = SimClasses.Clock + TimeUntilEvent
+    addedEvent.WhichObject = TheObject
+    calendar.Schedule(addedEvent)
+    
+    
+def RunLoop(calendar, Handlers, EndType="EndSimulation", Profile=None):
+    '''
+    Returns a function that runs a replication: it removes events
+        from calendar in time order, sets SimClasses.Clock and calls
+        Handlers[EventType](WhichObject), until an event of EndType
+        or an empty calendar
+    With an EventProfile object as Profile, the returned loop also
+        times every handler and every EventCalendar.Remove with
+        time.perf_counter_ns and records them in Profile; the
+        choice is made here, once, so the loop without Profile
+        has no per-event overhead
+
+    Input:
+        calendar: EventCalendar object
+        Handlers: dict, EventType -> function of one argument,
+            the WhichObject of the event (None for events
+            scheduled with Schedule)
+        EndType: string, event type that ends the replication
+        Profile: EventProfile object or None
+
+    Output:
+        function of no arguments
+    '''
+
+    def Run():
+        while calendar.N() > 0:
+            NextEvent = calendar.Remove()
+            if NextEvent is None:
+                break
+            SimClasses.Clock = NextEvent.EventTime
+            if NextEvent.EventType == EndType:
+                break
+            Handlers[NextEvent.EventType](NextEvent.WhichObject)
+
+    def RunProfiled():
+        clock = time.perf_counter_ns
+        while calendar.N() > 0:
+            start = clock()
+            NextEvent = calendar.Remove()
+            Profile.RemoveNs += clock() - start
+            if NextEvent is None:
+                break
+            SimClasses.Clock = NextEvent.EventTime
+            if NextEvent.EventType == EndType:
+                break
+            start = clock()
+            Handlers[NextEvent.EventType](NextEvent.WhichObject)
+            Profile.Record(NextEvent.EventType, clock() - start, calendar)
+
+    if Profile is None:
+        return Run
+    return RunProfiled
+
+def ClearStats():
+    '''
+    Clears all DT and CT statistics, i.e. clears
+        all statistics in DTStat.InstanceList and CTStat.InstanceList
+    '''
+
+    for CT in SimClasses.CTStat.InstanceList:
+        CT.Clear()
+        CT.Xlast = 0.0   
+        
+    for DT in SimClasses.DTStat.InstanceList:
+        DT.Clear()
+
+    # The capacity of a resource does not reset with its statistics
+    for Re in SimClasses.Resource.InstanceList:
+        Re.NumUnitsStat.Xlast = float(Re.NumberOfUnits)
+
+    # Trajectories start over from the cleared statistics
+    for Tr in SimClasses.Trajectory.InstanceList:
+        Tr.Restart()
+
+def EndReplication():
+    '''
+    Records the end-of-replication value of the outputs of every
+        ReplicationResults object, i.e. all objects in 
+        SimResults.ReplicationResults.InstanceList
+    Typically called after the EndSimulation event of each replication
+    '''
+
+    # Without SimResults loaded there are no ReplicationResults objects,
+    #   and it is not imported here, so models without it never load numpy
+    SimResults = sys.modules.get(__package__ + ".SimResults")
+    if SimResults is None:
+        return
+    for Results in SimResults.ReplicationResults.InstanceList:
+        Results.Record()
+
+def ModelObjects(calendar, Objects=()):
+    '''
+    Returns the objects whose attributes make up the state of a
+    model: calendar, every CTStat, DTStat, Trajectory, EntityTable,
+    FIFOQueue and Resource in order of creation, and Objects
+
+    Input:
+        calendar: EventCalendar object
+        Objects: list of other model objects with a state, e.g.
+            lists or dicts of records, or the model object itself
+
+    Output:
+        list
+    '''
+
+    return ([calendar] + SimClasses.CTStat.InstanceList + SimClasses.DTStat.InstanceList
+        + SimClasses.Trajectory.InstanceList + SimClasses.EntityTable.InstanceList
+        + SimClasses.FIFOQueue.InstanceList + SimClasses.Resource.InstanceList + list(Objects))
+
+def Snapshot(calendar, Objects=()):
+    '''
+    Returns a copy of the complete state of the model: the clock,
+    the random-number streams and the objects of ModelObjects,
+    with the entities and event notices they hold
+    The snapshot can be pickled (e.g. sent to worker processes)
+        if the entities and the WhichObject of every event can;
+        models written with SimProcess cannot be copied, since
+        generators cannot
+
+    Input:
+        calendar: EventCalendar object
+        Objects: list, see ModelObjects
+
+    Output:
+        dict with keys "Clock", "Streams", "Objects"
+    '''
+
+    return {"Clock": SimClasses.Clock, "Streams": list(SimRNG.ZRNG),
+        "Objects": copy.deepcopy(ModelObjects(calendar, Objects))}
+
+def Restore(State, calendar, Objects=(), Rep=None, Spacing=SimRNG.REPLICATION_SPACING):
+    '''
+    Puts the model back in the state of a snapshot; the objects of
+    the model are updated in place (from a fresh copy, so a snapshot
+    can be restored any number of times), so the event handlers
+    keep working on them
+    The random-number streams are restored as well, or, if Rep is
+        given, set by SimRNG.SeedReplication(Rep, Spacing), so that
+        every replication forked from the snapshot gets its own
+        random numbers from then on
+    calendar and Objects must be those of the model the snapshot
+        was taken from (in another process: the same objects
+        created in the same order, e.g. by importing the model)
+
+    Input:
+        State: dict returned by Snapshot
+        calendar: EventCalendar object
+        Objects: list, see ModelObjects
+        Rep: integer, nonnegative, optional
+        Spacing: integer, positive
+    '''
+
+    Live = ModelObjects(calendar, Objects)
+    Saved = State["Objects"]
+    if len(Saved) != len(Live):
+        raise ValueError("the snapshot was taken from a different model")
+
+    # references between the saved objects become references
+    #   between the live objects
+    memo = {id(s): l for s, l in zip(Saved, Live)}
+    for s, l in zip(Saved, Live):
+        if isinstance(l, list):
+            l[:] = [copy.deepcopy(x, memo) for x in s]
+        elif isinstance(l, dict):
+            l.clear()
+            l.update(copy.deepcopy(dict(s), memo))
+        else:
+            Attributes = copy.deepcopy(s.__dict__, memo)
+            l.__dict__.clear()
+            l.__dict__.update(Attributes)
+
+    SimClasses.Clock = State["Clock"]
+    if Rep is None:
+        SimRNG.ZRNG[:] = State["Streams"]
+    else:
+        SimRNG.SeedReplication(Rep, Spacing)
\ No newline at end of file
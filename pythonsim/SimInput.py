@@ -0,0 +1,692 @@
+###############################################################
+
+# Contains LoadTable, which reads a spreadsheet of input data
+#   (e.g. hw3/CarCounts.xls) into plain numpy arrays, one per
+#   numeric column, and CountRates, which turns a table of
+#   counts per period into arrival rates.
+
+# Also contains the input modeling functions: FitExpon,
+#   FitErlang, FitGamma, FitLognormal and FitEmpirical fit a
+#   distribution to data by maximum likelihood, and FitAll
+#   fits every parametric candidate and ranks them by a
+#   goodness-of-fit statistic; every fit is a FittedDistribution,
+#   whose Sampler is the matching SimRNG generator. ArrivalRates
+#   estimates the piecewise-constant rate function of a
+#   nonstationary Poisson process (NHPP) from arrival times, and
+#   NHPP generates arrivals from it by inversion. All fitting is
+#   done with numpy reductions over the whole data set.
+
+# A spreadsheet is parsed with pandas only the first time it
+#   is loaded; the columns are then saved in a binary cache,
+#   __simcache__/<file name>.npz next to the spreadsheet, and
+#   later runs (and every worker process of a parallel run)
+#   load the cache instead. The cache is used while the size
+#   and modification time of the spreadsheet are unchanged; if
+#   they change, it is still used when the SHA-256 hash of the
+#   file is unchanged, and rebuilt otherwise.
+
+###############################################################
+
+import bisect
+import functools
+import hashlib
+import math
+import os
+
+import numpy as np
+
+from . import SimRNG
+
+# Name of the cache directory, created next to the spreadsheets
+CACHE_DIRECTORY = "__simcache__"
+
+# Version of the cache file layout; caches of another version are rebuilt
+CACHE_VERSION = 1
+
+def FileHash(FileName):
+    '''
+    Returns the SHA-256 hash of the contents of FileName
+
+    Input:
+        FileName: string
+
+    Output:
+        string, hexadecimal digest
+    '''
+
+    h = hashlib.sha256()
+    with open(FileName, "rb") as f:
+        for Block in iter(lambda: f.read(1 << 20), b""):
+            h.update(Block)
+    return h.hexdigest()
+
+def CacheFile(FileName, Header):
+    '''
+    Returns the name of the cache file of spreadsheet FileName
+    '''
+
+    Directory, Base = os.path.split(os.path.abspath(FileName))
+    return os.path.join(Directory, CACHE_DIRECTORY,
+        "{}.{}.npz".format(Base, "header" if Header else "noheader"))
+
+def ReadCache(Cache, Stat, FileName):
+    '''
+    Returns the table saved in Cache if it is valid for the
+    spreadsheet FileName with os.stat result Stat, else None
+    '''
+
+    try:
+        with np.load(Cache) as Data:
+            if int(Data["version"]) != CACHE_VERSION:
+                return None
+            Size, MTime = (int(x) for x in Data["key"])
+            if (Size, MTime) != (Stat.st_size, Stat.st_mtime_ns) and str(Data["sha256"]) != FileHash(FileName):
+                return None
+            return {str(Name): Data["c{}".format(k)] for k, Name in enumerate(Data["columns"])}
+    except (OSError, KeyError, ValueError):
+        return None
+
+def WriteCache(Cache, Stat, FileName, Table):
+    '''
+    Saves Table in Cache; the file is written under a temporary
+    name and then renamed, so that processes loading the same
+    spreadsheet at the same time never read a partial cache
+    '''
+
+    os.makedirs(os.path.dirname(Cache), exist_ok=True)
+    Temp = "{}.{}.tmp".format(Cache, os.getpid())
+    Arrays = {"c{}".format(k): Column for k, Column in enumerate(Table.values())}
+    with open(Temp, "wb") as f:
+        np.savez(f, version=CACHE_VERSION, key=np.array([Stat.st_size, Stat.st_mtime_ns], dtype=np.int64),
+            sha256=FileHash(FileName), columns=np.array(list(Table), dtype=str), **Arrays)
+    os.replace(Temp, Cache)
+
+def ParseTable(FileName, Header):
+    '''
+    Parses spreadsheet FileName with pandas, keeping the numeric
+    columns that have at least one value
+
+    Output:
+        dict, column name (string) -> 1-D numpy array of floats,
+            padded with NaN where a column is shorter than the sheet
+    '''
+
+    import pandas as pd
+    Frame = pd.read_excel(FileName, header=0 if Header else None)
+    Table = {}
+    for Name in Frame.columns:
+        Column = pd.to_numeric(Frame[Name], errors="coerce").to_numpy(dtype=float)
+        if Frame[Name].dtype.kind in "iuf" and not np.isnan(Column).all():
+            Table[str(Name)] = Column
+    return Table
+
+def LoadTable(FileName, Header=True, Cache=True):
+    '''
+    Returns the numeric columns of spreadsheet FileName, from the
+    binary cache when it is valid, else by parsing the spreadsheet
+    (and saving the cache)
+
+    Input:
+        FileName: string, spreadsheet (any format pandas.read_excel reads)
+        Header: boolean, the first row holds the column names; if
+            False the columns are named "0", "1", ...
+        Cache: boolean, use and update the cache
+
+    Output:
+        dict, column name -> 1-D numpy array of floats, in the order
+            of the sheet, padded with NaN
+    '''
+
+    Stat = os.stat(FileName)
+    if Cache:
+        CacheName = CacheFile(FileName, Header)
+        Table = ReadCache(CacheName, Stat, FileName)
+        if Table is not None:
+            return Table
+    Table = ParseTable(FileName, Header)
+    if Cache:
+        try:
+            WriteCache(CacheName, Stat, FileName, Table)
+        except OSError:
+            pass
+    return Table
+
+def CountRates(Table):
+    '''
+    Returns the arrival rates of a table of counts with one column
+    per period, e.g. cars arriving per hour, one row per day: the
+    mean count of every column, skipping missing values
+
+    Input:
+        Table: dict of 1-D arrays, as returned by LoadTable
+
+    Output:
+        numpy array of floats, one rate (arrivals per period) per column
+    '''
+
+    return np.array([np.nanmean(Column) for Column in Table.values()])
+
+# Relative accuracy and largest number of terms of GammaP
+GAMMAP_EPS = 1e-15
+GAMMAP_MAXITER = 1000
+
+def Digamma(x):
+    '''
+    Returns the digamma function (derivative of math.lgamma) at x > 0
+    '''
+
+    result = 0.0
+    while x < 6:
+        result -= 1 / x
+        x += 1
+    f = 1 / (x * x)
+    return result + math.log(x) - 0.5 / x - f * (1 / 12 - f * (1 / 120 - f * (1 / 252 - f * (1 / 240 - f / 132))))
+
+def Trigamma(x):
+    '''
+    Returns the trigamma function (derivative of Digamma) at x > 0
+    '''
+
+    result = 0.0
+    while x < 6:
+        result += 1 / (x * x)
+        x += 1
+    f = 1 / (x * x)
+    return result + 1 / x + f / 2 + f / x * (1 / 6 - f * (1 / 30 - f * (1 / 42 - f / 30)))
+
+def GammaP(a, X):
+    '''
+    Returns the regularized lower incomplete gamma function
+    P(a, x), the Gamma(a, 1) CDF, at every x of X, by its series
+    for x < a + 1 and its continued fraction otherwise
+
+    Input:
+        a: float, positive
+        X: numpy array of floats
+
+    Output:
+        numpy array of floats, shape of X
+    '''
+
+    X = np.asarray(X, dtype=float)
+    P = np.zeros(X.shape)
+    Positive = X > 0
+    x = X[Positive]
+    Front = np.exp(-x + a * np.log(x) - math.lgamma(a))
+    Series = x < a + 1
+
+    xs = x[Series]
+    term = np.full(xs.shape, 1 / a)
+    total = term.copy()
+    ap = a
+    for i in range(GAMMAP_MAXITER):
+        ap += 1
+        term = term * xs / ap
+        total += term
+        if np.all(term < total * GAMMAP_EPS):
+            break
+
+    # Modified Lentz's method for the complement Q(a, x)
+    tiny = 1e-300
+    xc = x[~Series]
+    b = xc + 1 - a
+    c = np.full(xc.shape, 1 / tiny)
+    d = 1 / b
+    h = d.copy()
+    for i in range(1, GAMMAP_MAXITER):
+        an = -i * (i - a)
+        b = b + 2
+        d = an * d + b
+        d[np.abs(d) < tiny] = tiny
+        c = b + an / c
+        c[np.abs(c) < tiny] = tiny
+        d = 1 / d
+        delta = d * c
+        h = h * delta
+        if np.all(np.abs(delta - 1) < GAMMAP_EPS):
+            break
+
+    Result = np.empty(x.shape)
+    Result[Series] = Front[Series] * total
+    Result[~Series] = 1 - Front[~Series] * h
+    P[Positive] = Result
+    return P
+
+def NormalCDF(Z):
+    '''
+    Returns the standard Normal CDF at every z of Z (numpy array)
+    '''
+
+    Z = np.asarray(Z, dtype=float)
+    return 0.5 + 0.5 * np.sign(Z) * GammaP(0.5, Z * Z / 2)
+
+def PositiveData(Data):
+    '''
+    Returns Data as a 1-D numpy array of floats without missing
+    values (NaN), checking that it is positive
+    '''
+
+    X = np.asarray(Data, dtype=float).ravel()
+    X = X[~np.isnan(X)]
+    if len(X) == 0:
+        raise ValueError("no data to fit")
+    if X.min() <= 0:
+        raise ValueError("data must be positive")
+    return X
+
+class FittedDistribution:
+    '''
+    Class of distributions fitted to data. Name is the SimRNG
+        generator taking Parameters, e.g. a fit with Name "Erlang"
+        and Parameters (m, Mean) is sampled by
+        SimRNG.Erlang(m, Mean, Stream)
+
+    Instance attributes:
+        Name: string, "Expon", "Erlang", "Gamma", "Lognormal",
+            "Empirical" or "PiecewiseLinear"
+        Parameters: tuple, arguments of the SimRNG generator before Stream
+        NumParameters: integer, number of estimated parameters
+        NumData: integer, number of data
+        LogLikelihood: float
+        KS: float, Kolmogorov-Smirnov statistic
+        AD: float, Anderson-Darling statistic
+        AIC: float, Akaike information criterion
+
+    Instance methods:
+        CDF
+        GoodnessOfFit
+        Sampler
+    '''
+
+    def __init__(self, Name, Parameters, NumParameters, NumData, LogLikelihood):
+        self.Name = Name
+        self.Parameters = tuple(Parameters)
+        self.NumParameters = NumParameters
+        self.NumData = NumData
+        self.LogLikelihood = LogLikelihood
+        self.AIC = 2 * NumParameters - 2 * LogLikelihood
+        self.KS = math.nan
+        self.AD = math.nan
+
+    def __repr__(self):
+        if self.Name in ("Empirical", "PiecewiseLinear"):
+            return "{}({} data)".format(self.Name, self.NumData)
+        return "{}({})".format(self.Name, ", ".join("{:.6g}".format(p) for p in self.Parameters))
+
+    def CDF(self, X):
+        '''
+        Returns the CDF at every x of X
+
+        Input:
+            X: numpy array of floats
+
+        Output:
+            numpy array of floats, shape of X
+        '''
+
+        X = np.asarray(X, dtype=float)
+        if self.Name == "Expon":
+            return 1 - np.exp(-np.maximum(X, 0) / self.Parameters[0])
+        if self.Name == "Erlang":
+            m, Mean = self.Parameters
+            return GammaP(m, X * m / Mean)
+        if self.Name == "Gamma":
+            Alpha, Beta = self.Parameters
+            return GammaP(Alpha, X / Beta)
+        if self.Name == "Lognormal":
+            Mu, Sigma = LognormalLog(*self.Parameters)
+            with np.errstate(divide="ignore"):
+                return NormalCDF((np.log(X) - Mu) / Sigma)
+        if self.Name in ("Empirical", "PiecewiseLinear"):
+            Values, Cumulative, Lower, Guide = self.Parameters[0].Arrays()
+            Cumulative = np.concatenate(([0.0], Cumulative))
+            if self.Name == "Empirical":
+                return Cumulative[np.searchsorted(Values, X, side="right")]
+            return np.interp(X, Values, Cumulative)
+        raise ValueError("unknown distribution {}".format(self.Name))
+
+    def GoodnessOfFit(self, Data):
+        '''
+        Sets KS and AD, the Kolmogorov-Smirnov and Anderson-Darling
+            statistics of the fit to Data (smaller is better)
+
+        Input:
+            Data: numpy array of floats, sorted, without NaN
+        '''
+
+        n = len(Data)
+        F = np.clip(self.CDF(Data), 1e-300, 1 - 1e-16)
+        i = np.arange(1, n + 1)
+        self.KS = float(max(np.max(i / n - F), np.max(F - (i - 1) / n)))
+        self.AD = float(-n - np.sum((2 * i - 1) * (np.log(F) + np.log1p(-F[::-1]))) / n)
+
+    def Sampler(self, Block=False):
+        '''
+        Returns the SimRNG generator of the distribution with its
+            parameters filled in: a function of Stream, or with
+            Block True of (Stream, Size), e.g.
+            Fit.Sampler()(1) == SimRNG.Expon(Mean, 1)
+
+        Input:
+            Block: boolean, return the Block version
+
+        Output:
+            function
+        '''
+
+        Name = self.Name + ("Block" if Block else "")
+        if not hasattr(SimRNG, Name):
+            raise ValueError("SimRNG has no generator {}".format(Name))
+        return functools.partial(getattr(SimRNG, Name), *self.Parameters)
+
+def LognormalLog(MeanPrime, VariancePrime):
+    '''
+    Returns the mean and standard deviation of the logarithm of a
+    lognormal random variable with mean MeanPrime and variance
+    VariancePrime (the parameters of SimRNG.Lognormal)
+    '''
+
+    Variance = math.log(1 + VariancePrime / MeanPrime ** 2)
+    return math.log(MeanPrime) - Variance / 2, math.sqrt(Variance)
+
+def GammaLogLikelihood(Alpha, Beta, n, Sum, SumLog):
+    '''
+    Returns the Gamma(Alpha, Beta) log-likelihood of n data with
+    the given sum and sum of logarithms
+    '''
+
+    return (Alpha - 1) * SumLog - Sum / Beta - n * (math.lgamma(Alpha) + Alpha * math.log(Beta))
+
+def FitExpon(Data):
+    '''
+    Fits an exponential distribution by maximum likelihood
+
+    Input:
+        Data: array of positive floats; NaN are ignored
+
+    Output:
+        FittedDistribution, Parameters (Mean,)
+    '''
+
+    X = PositiveData(Data)
+    n = len(X)
+    Mean = float(X.mean())
+    return FittedDistribution("Expon", (Mean,), 1, n, -n * math.log(Mean) - n)
+
+def FitGamma(Data):
+    '''
+    Fits a Gamma distribution by maximum likelihood: the shape
+    solves log(Alpha) - Digamma(Alpha) = log(mean) - mean of logs,
+    by Newton's method from the approximation of Minka (2002)
+
+    Input:
+        Data: array of positive floats; NaN are ignored
+
+    Output:
+        FittedDistribution, Parameters (Alpha, Beta) of SimRNG.Gamma
+    '''
+
+    X = PositiveData(Data)
+    n = len(X)
+    Sum = float(X.sum())
+    SumLog = float(np.log(X).sum())
+    s = math.log(Sum / n) - SumLog / n
+    if s <= 0:
+        raise ValueError("all data are equal")
+    Alpha = (3 - s + math.sqrt((s - 3) ** 2 + 24 * s)) / (12 * s)
+    for i in range(100):
+        Step = (math.log(Alpha) - Digamma(Alpha) - s) / (1 / Alpha - Trigamma(Alpha))
+        Alpha = max(Alpha - Step, Alpha / 10)
+        if abs(Step) < 1e-12 * Alpha:
+            break
+    Beta = Sum / n / Alpha
+    return FittedDistribution("Gamma", (Alpha, Beta), 2, n, GammaLogLikelihood(Alpha, Beta, n, Sum, SumLog))
+
+def FitErlang(Data):
+    '''
+    Fits an Erlang distribution by maximum likelihood: the mean is
+    the sample mean, and the number of phases is whichever integer
+    next to the Gamma shape estimate has the larger likelihood
+
+    Input:
+        Data: array of positive floats; NaN are ignored
+
+    Output:
+        FittedDistribution, Parameters (m, Mean) of SimRNG.Erlang
+    '''
+
+    X = PositiveData(Data)
+    n = len(X)
+    Sum = float(X.sum())
+    SumLog = float(np.log(X).sum())
+    Mean = Sum / n
+    Alpha = FitGamma(X).Parameters[0]
+    Best = None
+    for m in {max(1, math.floor(Alpha)), max(1, math.ceil(Alpha))}:
+        LogLikelihood = GammaLogLikelihood(m, Mean / m, n, Sum, SumLog)
+        if Best is None or LogLikelihood > Best.LogLikelihood:
+            Best = FittedDistribution("Erlang", (m, Mean), 2, n, LogLikelihood)
+    return Best
+
+def FitLognormal(Data):
+    '''
+    Fits a lognormal distribution by maximum likelihood (the mean
+    and variance of the logarithms of the data)
+
+    Input:
+        Data: array of positive floats; NaN are ignored
+
+    Output:
+        FittedDistribution, Parameters (MeanPrime, VariancePrime)
+            of SimRNG.Lognormal, i.e. the mean and variance of the
+            distribution itself
+    '''
+
+    X = PositiveData(Data)
+    n = len(X)
+    Y = np.log(X)
+    Mu = float(Y.mean())
+    Variance = float(Y.var())
+    if Variance <= 0:
+        raise ValueError("all data are equal")
+    MeanPrime = math.exp(Mu + Variance / 2)
+    VariancePrime = (math.exp(Variance) - 1) * MeanPrime ** 2
+    LogLikelihood = -float(Y.sum()) - n / 2 * (math.log(2 * math.pi * Variance) + 1)
+    return FittedDistribution("Lognormal", (MeanPrime, VariancePrime), 2, n, LogLikelihood)
+
+def FitEmpirical(Data, Continuous=False):
+    '''
+    Returns the empirical distribution of Data, which puts mass
+    1/n on every datum, or with Continuous True its piecewise-linear
+    version, which spreads mass 1/(n-1) uniformly between
+    consecutive sorted data; it has no likelihood and fits its own
+    data (almost) perfectly, so FitAll does not rank it
+
+    Input:
+        Data: array of floats; NaN are ignored
+        Continuous: boolean
+
+    Output:
+        FittedDistribution, Name "Empirical" or "PiecewiseLinear",
+            Parameters (SimRNG.EmpiricalTable,)
+    '''
+
+    X = np.asarray(Data, dtype=float).ravel()
+    X = np.sort(X[~np.isnan(X)])
+    if Continuous:
+        return FittedDistribution("PiecewiseLinear", (SimRNG.EmpiricalTable(X.tolist(), Continuous=True),),
+            len(X), len(X), math.nan)
+    Values, Counts = np.unique(X, return_counts=True)
+    return FittedDistribution("Empirical", (SimRNG.EmpiricalTable(Values.tolist(), Counts.tolist()),),
+        len(Values), len(X), math.nan)
+
+# Distributions fitted by FitAll
+CANDIDATES = ("Expon", "Erlang", "Gamma", "Lognormal")
+
+def FitAll(Data, Criterion="AD", Candidates=CANDIDATES):
+    '''
+    Fits every candidate distribution to Data and returns the fits
+    in increasing order of Criterion, best first
+
+    Input:
+        Data: array of positive floats; NaN are ignored
+        Criterion: "AD" (Anderson-Darling), "KS" (Kolmogorov-Smirnov)
+            or "AIC"
+        Candidates: names of distributions, see CANDIDATES
+
+    Output:
+        list of FittedDistribution
+    '''
+
+    X = np.sort(PositiveData(Data))
+    Fits = []
+    for Name in Candidates:
+        try:
+            Fit = globals()["Fit" + Name](X)
+        except ValueError:
+            continue
+        Fit.GoodnessOfFit(X)
+        Fits.append(Fit)
+    return sorted(Fits, key=lambda Fit: getattr(Fit, Criterion))
+
+def FitTable(Fits):
+    '''
+    Returns a table of fits, one row per fit
+
+    Input:
+        Fits: list of FittedDistribution, e.g. from FitAll
+
+    Output:
+        string
+    '''
+
+    lines = ["{:<36}{:>14}{:>12}{:>10}{:>10}".format("Distribution", "LogLikelihood", "AIC", "KS", "AD")]
+    for Fit in Fits:
+        lines.append("{:<36}{:>14.2f}{:>12.2f}{:>10.4f}{:>10.3f}".format(
+            repr(Fit), Fit.LogLikelihood, Fit.AIC, Fit.KS, Fit.AD))
+    return "\n".join(lines)
+
+def ArrivalRates(Times, Period, Width, NumObservations=1):
+    '''
+    Estimates the piecewise-constant rate function of a NHPP from
+    the arrival times of NumObservations independent observations
+    of the process over [0, Period]: the rate of every interval of
+    length Width is its number of arrivals per unit time, averaged
+    over the observations
+
+    Input:
+        Times: array of floats, the arrival times of all observations
+            together; NaN are ignored
+        Period: float, positive
+        Width: float, positive, about Period / number of intervals
+        NumObservations: integer, positive
+
+    Output:
+        Edges: numpy array of floats, the interval ends, from 0 to Period
+        Rates: numpy array of floats, one per interval
+    '''
+
+    Times = np.asarray(Times, dtype=float).ravel()
+    Times = Times[~np.isnan(Times)]
+    Edges = np.linspace(0.0, Period, max(1, round(Period / Width)) + 1)
+    Counts, Edges = np.histogram(Times, bins=Edges)
+    return Edges, Counts / (NumObservations * np.diff(Edges))
+
+class NHPP:
+    '''
+    Class of NHPP arrival processes with a piecewise-constant rate,
+        e.g. from ArrivalRates. Arrivals are generated by inverting
+        the integrated rate, so every arrival uses one Expon(1)
+        variate; if Cyclic, the rate function repeats every Period,
+        else there are no arrivals after Period
+
+    Instance attributes:
+        Edges: list of floats, from 0 to Period
+        Rates: list of floats, one per interval
+        Cumulative: list of floats, integrated rate at every edge
+        Period: float
+        Cyclic: boolean
+
+    Instance methods:
+        Next
+        NextBlock
+    '''
+
+    def __init__(self, Edges, Rates, Cyclic=True):
+        self.Edges = [float(Edge) for Edge in Edges]
+        self.Rates = [float(Rate) for Rate in Rates]
+        self.Cumulative = [0.0]
+        for k in range(len(self.Rates)):
+            self.Cumulative.append(self.Cumulative[-1] + self.Rates[k] * (self.Edges[k+1] - self.Edges[k]))
+        self.Period = self.Edges[-1]
+        self.Cyclic = Cyclic
+        if self.Edges[0] != 0 or self.Cumulative[-1] <= 0:
+            raise ValueError("Edges must start at 0 and some rate must be positive")
+
+    def Next(self, Now, Stream):
+        '''
+        Returns the time of the next arrival after time Now, using
+            the next Uniform(0,1) in Stream (also when there is
+            no next arrival)
+
+        Input:
+            Now: float
+            Stream: integer, random number stream
+
+        Output:
+            float (inf if there are no more arrivals)
+        '''
+
+        # drawn even when there is no next arrival, so that every
+        #   call uses one random number, as in NextBlock
+        E = SimRNG.Expon(1, Stream)
+        Total = self.Cumulative[-1]
+        Cycles = math.floor(Now / self.Period) if self.Cyclic else 0
+        t = Now - Cycles * self.Period
+        if t >= self.Period:
+            return math.inf
+        k = bisect.bisect_right(self.Edges, t) - 1
+        Target = Cycles * Total + self.Cumulative[k] + self.Rates[k] * (t - self.Edges[k]) + E
+        Cycles = math.floor(Target / Total) if self.Cyclic else 0
+        Target -= Cycles * Total
+        if Target > Total:
+            return math.inf
+        j = bisect.bisect_left(self.Cumulative, Target)
+        if j == 0:
+            return Cycles * self.Period
+        return Cycles * self.Period + self.Edges[j-1] + (Target - self.Cumulative[j-1]) / self.Rates[j-1]
+
+    def NextBlock(self, Now, Stream):
+        '''
+        Returns the time of the next arrival after every time of Now,
+            using the same random numbers as calls of Next
+
+        Input:
+            Now: numpy array of floats
+            Stream: integer, random number stream, or array of seeds
+                (see SimRNG.lcgrandblock) with one seed per time
+
+        Output:
+            numpy array of floats, shape of Now
+        '''
+
+        Now = np.asarray(Now, dtype=float)
+        if isinstance(Stream, np.ndarray):
+            E = SimRNG.ExponBlock(1, Stream, 1)[:, 0].reshape(Now.shape)
+        else:
+            E = SimRNG.ExponBlock(1, Stream, Now.shape)
+        Edges = np.array(self.Edges)
+        Rates = np.array(self.Rates)
+        Cumulative = np.array(self.Cumulative)
+        Total = Cumulative[-1]
+        Cycles = np.floor(Now / self.Period) if self.Cyclic else np.zeros(Now.shape)
+        t = Now - Cycles * self.Period
+        k = np.clip(np.searchsorted(Edges, t, side="right") - 1, 0, len(Rates) - 1)
+        Target = Cycles * Total + Cumulative[k] + Rates[k] * (t - Edges[k]) + E
+        Cycles = np.floor(Target / Total) if self.Cyclic else np.zeros(Now.shape)
+        Target = Target - Cycles * Total
+        j = np.clip(np.searchsorted(Cumulative, Target, side="left"), 1, len(Rates))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            Next = Cycles * self.Period + Edges[j-1] + (Target - Cumulative[j-1]) / Rates[j-1]
+        Next = np.where(Target <= 0, Cycles * self.Period, Next)
+        return np.where((t >= self.Period) | (Target > Total), np.inf, Next)
@@ -0,0 +1,169 @@
+###############################################################
+
+# Contains the process-interaction layer: a model entity is a
+#   Python generator function that yields Timeout(Delay),
+#   Seize(TheResource, Units) and Release(TheResource, Units),
+#   e.g. a customer of a single-server queue:
+
+#       def Customer():
+#           yield SimProcess.Seize(Server)
+#           yield SimProcess.Timeout(SimRNG.Expon(1.0, 2))
+#           yield SimProcess.Release(Server)
+
+# and is started with Start(calendar, Customer()). A process
+#   is resumed by its own Process record, which goes on the
+#   EventCalendar in place of an EventNotice and is run by
+#   EventCalendar.Remove as an internal event, so processes
+#   mix with ordinary events and RunLoop; e.g. EndSimulation
+#   and ClearIt stay ordinary events.
+
+# Processes waiting to seize a resource wait in its
+#   ProcessQueue, set up with the model by
+#   Resource.SetProcessQueue, e.g. Server.SetProcessQueue()
+#   after Server = SimClasses.Resource(); Release, and
+#   every capacity increase of a SetSchedule, gives the free 
+#   units to the waiting processes in FIFO order and resumes
+#   them at the current time (Resource.ServeProcesses).
+
+# Commands are tuples, so a yield costs one tuple and one
+#   generator resumption; processes resume without closures.
+
+###############################################################
+
+import heapq
+
+from . import SimClasses
+
+# Kinds of commands
+TIMEOUT = 0
+SEIZE = 1
+RELEASE = 2
+
+def Timeout(Delay):
+    '''
+    Returns the command to wait for Delay time units
+
+    Input:
+        Delay: float, nonnegative
+
+    Output:
+        tuple
+    '''
+
+    return (TIMEOUT, Delay)
+
+def Seize(TheResource, Units=1):
+    '''
+    Returns the command to seize Units of TheResource, waiting in
+    its ProcessQueue until they are available
+
+    Input:
+        TheResource: Resource object
+        Units: integer, positive
+
+    Output:
+        tuple
+    '''
+
+    return (SEIZE, TheResource, Units)
+
+def Release(TheResource, Units=1):
+    '''
+    Returns the command to free Units of TheResource, which go
+    to the processes waiting for it
+
+    Input:
+        TheResource: Resource object
+        Units: integer, positive
+
+    Output:
+        tuple
+    '''
+
+    return (RELEASE, TheResource, Units)
+
+class Process:
+    '''
+    Class of process records: a generator and the calendar on
+        which it is resumed. The record is scheduled on the
+        calendar itself, as an internal event whose Handler is
+        Step
+
+    Instance attributes:
+        EventTime: float, time at which the process resumes
+        Generator: generator of commands
+        Calendar: EventCalendar object
+        Units: integer, units the process is waiting to seize
+        Cancelled: Boolean, see EventNotice
+    '''
+
+    __slots__ = ("EventTime", "Generator", "Calendar", "Units", "Cancelled")
+
+    def __init__(self, calendar, Generator):
+        self.EventTime = 0.0
+        self.Generator = Generator
+        self.Calendar = calendar
+        self.Units = 0
+        self.Cancelled = False
+
+def Start(calendar, Generator, Delay=0.0):
+    '''
+    Starts a process that runs Generator, Delay time units from now
+
+    Input:
+        calendar: EventCalendar object
+        Generator: generator of commands, e.g. Customer()
+        Delay: float, nonnegative
+
+    Output:
+        Process object
+    '''
+
+    TheProcess = Process(calendar, Generator)
+    TheProcess.EventTime = SimClasses.Clock + Delay
+    calendar.Schedule(TheProcess)
+    return TheProcess
+
+def Step(TheProcess):
+    '''
+    Resumes TheProcess and carries out its commands until it waits
+        (Timeout, or Seize of unavailable units) or ends; called by
+        EventCalendar.Remove at the process's EventTime
+
+    Input:
+        TheProcess: Process object
+    '''
+
+    Send = TheProcess.Generator.send
+    while True:
+        try:
+            Command = Send(None)
+        except StopIteration:
+            return
+        Kind = Command[0]
+        if Kind == TIMEOUT:
+            # EventCalendar.Schedule, inlined on the most frequent path
+            calendar = TheProcess.Calendar
+            calendar.Sequence += 1
+            TheProcess.EventTime = EventTime = SimClasses.Clock + Command[1]
+            heapq.heappush(calendar.ThisCalendar, (EventTime, calendar.Sequence, TheProcess))
+            return
+        TheResource = Command[1]
+        Units = Command[2]
+        Queue = TheResource.ProcessQueue
+        if Kind == SEIZE:
+            if Queue is None:
+                raise ValueError("no process queue for the resource; set one with SetProcessQueue")
+            # Units go to waiting processes first
+            if not Queue.ThisQueue and TheResource.Seize(Units):
+                continue
+            TheProcess.Units = Units
+            Queue.Add(TheProcess)
+            return
+        TheResource.Free(Units)
+        if Queue is not None:
+            TheResource.ServeProcesses()
+
+# EventCalendar.Remove calls Handler(record); as a staticmethod no
+#   bound method is made at every step
+Process.Handler = staticmethod(Step)
@@ -0,0 +1,1326 @@
+###############################################################
+
+# This random number generator and random-variate generation 
+#   functions are translations of the C programs found in 
+#   Law, A. M. and Kelton, W. D., ''Simulation Modeling and 
+#   Analysis'', Singapore: The McGraw-Hill Book Co, pp. 430-431.
+
+# Empirical and PiecewiseLinear sample data-driven distributions
+#   from an EmpiricalTable, whose guide table makes every
+#   variate cost a single lookup, like the parametric generators;
+#   Choice uses the same tables for random routing decisions.
+
+# For very large or serious real-world applications, 
+#   we recommend using tools found in the numpy python package,
+#   and do not recommend using the random number generator
+#   in this file, which is mainly used for illustrative
+#   and educational purposes.
+
+# This random number generator is a prime modulus 
+#   multiplicative linear congruential generator (PMMLCG)
+#   based on Marse and Robert's (1983) generator UNIRAN.
+
+# There is support for 100 streams, with seeds spaced
+#   100,000 apart. Streams can be jumped ahead with lcgrandjump,
+#   and SeedReplication gives every replication its own block
+#   of streams, so that results do not depend on the order
+#   (or the process) in which replications are run; it raises
+#   ValueError rather than wrap around the period, and
+#   ReplicationSpacing packs the replications of models that
+#   use few streams closer, so that more of them fit
+#   (SpacingFor gives the default of the SimResults runners).
+
+# The Block functions return numpy arrays of variates generated
+#   from the same random numbers as repeated calls of the scalar
+#   functions, for vectorized models; numpy is only imported when they are used.
+#   The Block versions of the rejection methods (Gamma, Beta, and
+#   Poisson and Binomial with large means) generate variates with
+#   the same distribution as the scalar functions, but not the same values.
+
+###############################################################
+
+import math
+
+# Define constants
+MODLUS = 2147483647
+MULT1 = 24112
+MULT2 = 26143
+
+# Each call of lcgrand multiplies the seed by MULT1 and then MULT2
+MULT = MULT1 * MULT2 % MODLUS
+
+# Number of draws in the period of the generator, between the
+#   default seeds of consecutive streams, and between the seeds of
+#   replication Rep and Rep+1 in SeedReplication (by default one
+#   block of 100 streams x 100,000 draws)
+PERIOD = MODLUS - 1
+NUM_STREAMS = 100
+STREAM_SPACING = 100000
+REPLICATION_SPACING = NUM_STREAMS * STREAM_SPACING
+
+def InitializeRNSeed():
+    '''
+    Set the default streams for the 100 streams.
+
+    Output:
+        list of 100 integers
+    '''
+
+    zrng = []
+    zrng.append(1973272912)
+    zrng.append(281629770)
+    zrng.append(20006270)
+    zrng.append(1280689831)
+    zrng.append(2096730329)
+    zrng.append(1933576050)
+    zrng.append(913566091)
+    zrng.append(246780520)
+    zrng.append(1363774876)
+    zrng.append(604901985)
+    zrng.append(1511192140)
+    zrng.append(1259851944)
+    zrng.append(824064364)
+    zrng.append(150493284)
+    zrng.append(242708531)
+    zrng.append(75253171)
+    zrng.append(1964472944)
+    zrng.append(1202299975)
+    zrng.append(233217322)
+    zrng.append(1911216000)
+    zrng.append(726370533)
+    zrng.append(403498145)
+    zrng.append(993232223)
+    zrng.append(1103205531)
+    zrng.append(762430696)
+    zrng.append(1922803170)
+    zrng.append(1385516923)
+    zrng.append(76271663)
+    zrng.append(413682397)
+    zrng.append(726466604)
+    zrng.append(336157058)
+    zrng.append(1432650381)
+    zrng.append(1120463904)
+    zrng.append(595778810)
+    zrng.append(877722890)
+    zrng.append(1046574445)
+    zrng.append(68911991)
+    zrng.append(2088367019)
+    zrng.append(748545416)
+    zrng.append(622401386)
+    zrng.append(2122378830)
+    zrng.append(640690903)
+    zrng.append(1774806513)
+    zrng.append(2132545692)
+    zrng.append(2079249579)
+    zrng.append(78130110)
+    zrng.append(852776735)
+    zrng.append(1187867272)
+    zrng.append(1351423507)
+    zrng.append(1645973084)
+    zrng.append(1997049139)
+    zrng.append(922510944)
+    zrng.append(2045512870)
+    zrng.append(898585771)
+    zrng.append(243649545)
+    zrng.append(1004818771)
+    zrng.append(773686062)
+    zrng.append(403188473)
+    zrng.append(372279877)
+    zrng.append(1901633463)
+    zrng.append(498067494)
+    zrng.append(2087759558)
+    zrng.append(493157915)
+    zrng.append(597104727)
+    zrng.append(1530940798)
+    zrng.append(1814496276)
+    zrng.append(536444882)
+    zrng.append(1663153658)
+    zrng.append(855503735)
+    zrng.append(67784357)
+    zrng.append(1432404475)
+    zrng.append(619691088)
+    zrng.append(119025595)
+    zrng.append(880802310)
+    zrng.append(176192644)
+    zrng.append(1116780070)
+    zrng.append(277854671)
+    zrng.append(1366580350)
+    zrng.append(1142483975)
+    zrng.append(2026948561)
+    zrng.append(1053920743)
+    zrng.append(786262391)
+    zrng.append(1792203830)
+    zrng.append(1494667770)
+    zrng.append(1923011392)
+    zrng.append(1433700034)
+    zrng.append(1244184613)
+    zrng.append(1147297105)
+    zrng.append(539712780)
+    zrng.append(1545929719)
+    zrng.append(190641742)
+    zrng.append(1645390429)
+    zrng.append(264907697)
+    zrng.append(620389253)
+    zrng.append(1502074852)
+    zrng.append(927711160)
+    zrng.append(364849192)
+    zrng.append(2049576050)
+    zrng.append(638580085)
+    zrng.append(547070247)
+    return zrng
+
+ZRNG = InitializeRNSeed()
+
+def lcgrand(Stream):
+    '''
+    Obtains the next Uniform(0,1) random variate from Stream.
+
+    Input: 
+        Stream: integer, random number stream
+    
+    Output: 
+        lcgrand: float
+    '''
+
+    MODLUS = 2147483647
+    MULT1 = 24112
+    MULT2 = 26143
+    zi = ZRNG[Stream-1]  
+    lowprd = (zi & 65535) * MULT1
+    hi31 = (zi // 65536) * MULT1 + lowprd // 65536
+    zi = ((lowprd & 65535) - MODLUS) + ((hi31 & 32767) * 65536) + (hi31 // 32768)  
+    if zi < 0:
+        zi += MODLUS
+    lowprd = (zi & 65535) * MULT2
+    hi31 = (zi // 65536) * MULT2 + (lowprd // 65536)
+    zi = ((lowprd & 65535) - MODLUS) + ((hi31 & 32767) * 65536) + (hi31 // 32768)
+    if zi < 0:
+        zi += MODLUS
+    ZRNG[Stream-1] = zi
+    lcgrand = (zi // 128 | 1) / 16777216.0
+    return lcgrand
+    
+def lcgrandst(zset,Stream):
+    '''
+    Set the seed for Stream to desired value zset.
+
+    Input: 
+        zset: integer
+        Stream: integer, random number stream
+    '''
+
+    ZRNG[Stream-1] = zset
+    
+def lcgrandgt(Stream):
+    '''
+    Returns the current seed for Stream.
+
+    Input:
+        Stream: integer, random number stream
+
+    Output:
+        integer
+    '''
+
+    return ZRNG[Stream-1]
+
+def lcgrandjump(Stream, Steps):
+    '''
+    Advances Stream by Steps draws in O(log Steps) time, i.e. as if
+    lcgrand(Stream) had been called Steps times.
+
+    Input:
+        Stream: integer, random number stream
+        Steps: integer, nonnegative
+    '''
+
+    ZRNG[Stream-1] = ZRNG[Stream-1] * pow(MULT, Steps, MODLUS) % MODLUS
+
+def SeedReplication(Rep, Spacing=REPLICATION_SPACING):
+    '''
+    Sets every stream to its default seed advanced by Rep * Spacing
+    draws, so that replication Rep uses the same random numbers
+    whether replications run in sequence or in parallel.
+
+    With the default Spacing, replication Rep uses the Rep-th block 
+    of 100 streams; the period of the generator holds 214 such
+    blocks, and ValueError is raised for a Rep whose streams would
+    wrap around the period onto those of replication 0. Models 
+    that use few streams can pass the smaller Spacing returned by
+    ReplicationSpacing to run more replications.
+
+    Input:
+        Rep: integer, nonnegative, replication number
+        Spacing: integer, positive
+    '''
+
+    CheckReplication(Rep, Spacing)
+    jump = pow(MULT, Rep * Spacing, MODLUS)
+    zrng = InitializeRNSeed()
+    for i in range(len(zrng)):
+        ZRNG[i] = zrng[i] * jump % MODLUS
+
+def CheckReplication(Rep, Spacing):
+    '''
+    Raises ValueError if the streams that SeedReplication(Rep, Spacing)
+    sets would run past the end of the period of the generator, i.e.
+    reuse the random numbers of the first replications
+
+    Input:
+        Rep: integer, nonnegative, replication number
+        Spacing: integer, positive
+    '''
+
+    if Rep * Spacing + NUM_STREAMS * STREAM_SPACING > PERIOD:
+        raise ValueError("replication {} with Spacing {} runs past the period of the generator; "
+            "at most {} replications fit (see ReplicationSpacing)".format(
+            Rep, Spacing, (PERIOD - NUM_STREAMS * STREAM_SPACING) // Spacing + 1))
+
+def ReplicationSpacing(NumStreams, Draws):
+    '''
+    Returns the smallest Spacing for SeedReplication and SeedBlock
+    with which streams 1, ..., NumStreams of all replications use
+    disjoint blocks of at least Draws random numbers, so a model 
+    that uses only those streams, and at most Draws random numbers
+    from each per replication, never reuses random numbers
+
+    Stream k of replication Rep starts (k - 1) * STREAM_SPACING + 
+        Rep * Spacing draws after the default seed of stream 1;
+        with Spacing = NumStreams * L, where L divides STREAM_SPACING
+        and STREAM_SPACING / L has no factor in common with
+        NumStreams, these starts are distinct multiples of L
+
+    Input:
+        NumStreams: integer, between 1 and 100, streams used
+        Draws: integer, positive, largest number of random numbers
+            taken from one stream in one replication
+
+    Output:
+        integer, positive
+    '''
+
+    if NumStreams == 1:
+        return Draws
+    for L in range(Draws, STREAM_SPACING + 1):
+        if STREAM_SPACING % L == 0 and math.gcd(STREAM_SPACING // L, NumStreams) == 1:
+            return NumStreams * L
+    raise ValueError("with more than one stream, no stream can take more than {} draws".format(STREAM_SPACING))
+
+def SpacingFor(NumReps):
+    '''
+    Returns the Spacing that SimResults uses by default for
+    replications 0, ..., NumReps - 1: REPLICATION_SPACING if they
+    all fit in the period of the generator with it (up to 214
+    replications), otherwise the largest Spacing with which they fit
+
+    With more than 214 replications, the streams of a replication
+    then start inside the blocks of the streams of the replications
+    before it; a model that uses several streams, or many draws,
+    should pass a Spacing from ReplicationSpacing instead
+
+    Input:
+        NumReps: integer, positive
+
+    Output:
+        integer, positive
+    '''
+
+    if NumReps <= 1:
+        return REPLICATION_SPACING
+    return min(REPLICATION_SPACING, (PERIOD - NUM_STREAMS * STREAM_SPACING) // (NumReps - 1))
+
+# MULT**1, ..., MULT**len(POWERS) modulo MODLUS, extended as needed
+POWERS = None
+
+def SeedBlock(Stream, FirstRep, NumReps, Spacing=REPLICATION_SPACING):
+    '''
+    Returns the seeds that SeedReplication(Rep, Spacing) gives Stream
+    for Rep = FirstRep, ..., FirstRep + NumReps - 1, as a numpy array
+    that the Block functions accept in place of a stream number to
+    generate one row per replication.
+
+    Input:
+        Stream: integer, random number stream
+        FirstRep: integer, nonnegative
+        NumReps: integer, positive
+        Spacing: integer, positive
+
+    Output:
+        numpy array of integers
+    '''
+
+    import numpy as np
+    CheckReplication(FirstRep + NumReps - 1, Spacing)
+    seed = InitializeRNSeed()[Stream-1]
+    jump = pow(MULT, Spacing, MODLUS)
+    seeds = np.empty(NumReps, dtype=np.int64)
+    seeds[0] = seed * pow(MULT, FirstRep * Spacing, MODLUS) % MODLUS
+    for r in range(1, NumReps):
+        seeds[r] = int(seeds[r-1]) * jump % MODLUS
+    return seeds
+
+def lcgrandblock(Stream, Size):
+    '''
+    Obtains Size Uniform(0,1) random variates from Stream as a numpy
+    array, identical to Size calls of lcgrand(Stream) in row-major
+    order, and advances Stream past them.
+
+    Stream can also be an array of seeds, e.g. from SeedBlock; then
+    the result has one row per seed, row r holds the next variates
+    from seed r, and the seeds are advanced in place.
+
+    Input:
+        Stream: integer, random number stream, or numpy array of seeds
+        Size: integer or tuple of integers, shape of the array
+            (of each row if Stream is an array)
+
+    Output:
+        numpy array of floats
+    '''
+
+    import numpy as np
+    global POWERS
+
+    n = int(np.prod(Size))
+    if POWERS is None:
+        POWERS = np.array([MULT], dtype=np.int64)
+    while len(POWERS) < n:
+        # Products of two numbers below 2**31 fit in int64
+        POWERS = np.concatenate((POWERS, POWERS * POWERS[-1] % MODLUS))
+
+    if isinstance(Stream, np.ndarray):
+        Shape = (len(Stream),) + ((Size,) if np.isscalar(Size) else tuple(Size))
+        if n == 0:
+            return np.empty(Shape)
+        zi = Stream[:, None] * POWERS[:n] % MODLUS
+        Stream[:] = zi[:, -1]
+        return ((zi // 128 | 1) / 16777216.0).reshape(Shape)
+
+    if n == 0:
+        return np.empty(Size)
+    zi = ZRNG[Stream-1] * POWERS[:n] % MODLUS
+    ZRNG[Stream-1] = int(zi[-1])
+    return ((zi // 128 | 1) / 16777216.0).reshape(Size)
+
+def ExponBlock(Mean, Stream, Size):
+    '''
+    Obtains an array of exponential random variates with given Mean,
+    using the same random numbers as Size calls of Expon(Mean, Stream).
+
+    Input:
+        Mean: float, positive
+        Stream: integer, random number stream, or array of
+            seeds (see lcgrandblock)
+        Size: integer or tuple of integers
+
+    Output:
+        numpy array of floats
+    '''
+
+    import numpy as np
+    return -np.log(1 - lcgrandblock(Stream, Size)) * float(Mean)
+
+def UniformBlock(Lower, Upper, Stream, Size):
+    '''
+    Obtains an array of Uniform(Lower,Upper) random variates,
+    using the same random numbers as Size calls of Uniform(Lower, Upper, Stream).
+
+    Input:
+        Lower: float
+        Upper: float, must be greater than Lower
+        Stream: integer, random number stream, or array of
+            seeds (see lcgrandblock)
+        Size: integer or tuple of integers
+
+    Output:
+        numpy array of floats
+    '''
+
+    Lower = float(Lower)
+    Upper = float(Upper)
+    return Lower + (Upper - Lower) * lcgrandblock(Stream, Size)
+
+def ErlangBlock(m, Mean, Stream, Size):
+    '''
+    Obtains an array of Erlang random variates with m phases and 
+    given Mean, using the same random numbers as Size calls of 
+    Erlang(m, Mean, Stream).
+
+    Input:
+        m: integer, positive, number of phases
+        Mean: float, positive
+        Stream: integer, random number stream, or array of
+            seeds (see lcgrandblock)
+        Size: integer or tuple of integers
+
+    Output:
+        numpy array of floats
+    '''
+
+    import numpy as np
+    Shape = (Size,) if np.isscalar(Size) else tuple(Size)
+    phases = ExponBlock(float(Mean) / m, Stream, Shape + (m,))
+    return phases.sum(axis=-1)
+
+def TriangularBlock(a, b, c, Stream, Size):
+    '''
+    Obtains an array of Triangular random variates with lower limit a,
+    mode b, and upper limit c, using the same random numbers as Size
+    calls of Triangular(a, b, c, Stream).
+
+    Input:
+        a: float
+        b: float, must be greater than a
+        c: float, must be greater than b
+        Stream: integer, random number stream, or array of
+            seeds (see lcgrandblock)
+        Size: integer or tuple of integers
+
+    Output:
+        numpy array of floats
+    '''
+
+    import numpy as np
+    a = float(a)
+    b = float(b)
+    c = float(c)
+    Standardb = (b - a) / (c - a)
+    U = lcgrandblock(Stream, Size)
+    triangular = np.where(U <= Standardb, np.sqrt(Standardb * U),
+        1 - np.sqrt((1 - Standardb) * (1 - U)))
+    return a + (c - a) * triangular
+
+def Expon(Mean, Stream):
+    '''
+    Obtains an exponential random variate with given Mean
+    using the next Uniform(0,1) in Stream. 
+
+    Input: 
+        Mean: integer, positive
+        Stream: integer, random number stream
+
+    Output:
+        float
+    '''
+
+    Mean = float(Mean)
+    return -math.log(1 - lcgrand(Stream)) * Mean
+        
+def Uniform(Lower, Upper, Stream):
+    '''
+    Obtains a Uniform(Lower,Upper) random variate 
+    using the next Uniform(0,1) in Stream. 
+
+    Input:
+        Lower: float
+        Upper: float, must be greater than Lower
+        Stream: integer, random number stream
+
+    Output:
+        float
+    '''
+
+    Lower = float(Lower)
+    Upper = float(Upper)
+    return Lower + (Upper - Lower) * lcgrand(Stream)
+        
+def RandomInteger(prob_distrib, Stream):
+    '''
+    Obtains an random integer distributed according
+    to the cumulative distribution function prob_distrib
+    using the next Uniform(0,1) in Stream. 
+
+    Input:
+        prob_distrib: function, CDF of random integer
+            to generate
+        Stream: integer, random number stream
+
+    Output:
+        integer
+    '''
+    U = lcgrand(Stream)
+    random_integer = 1
+    while U >= prob_distrib[random_integer-1]:
+        random_integer = random_integer + 1
+    return random_integer
+                
+def Erlang(m, Mean, Stream):
+    '''
+    Obtains an Erlang random variate with m phases and
+    given Mean using the next Uniform(0,1) in Stream.
+
+    Input:
+        m: integer, positive, number of phases
+        Mean: float, positive
+        Stream: integer, random number stream
+
+    Output:
+        float
+    '''
+
+    Mean = float(Mean)
+    mean_exponential = Mean / m
+    Sum = 0.0
+    for i in range(0,m,1):
+        Sum = Sum + Expon(mean_exponential, Stream)
+    erlang = Sum
+    return erlang
+    
+def Triangular(a, b, c, Stream):
+    '''
+    Obtains a Triangular random variate with lower
+    limit a, mode b, and upper limit c, using the 
+    next Uniform(0,1) in Stream.
+
+    Input:
+        a: float
+        b: float, must be greater than a
+        c: float, must be greater than b
+        Stream: integer, random number stream
+
+    Output:
+        float
+    '''
+
+    a = float(a)
+    b = float(b)
+    c = float(c)
+    Standardb = (b - a) / (c - a)
+    U = lcgrand(Stream)
+    if U <= Standardb:
+        triangular = math.sqrt(Standardb * U)
+    else:
+        triangular = 1 - math.sqrt((1 - Standardb) * (1 - U))
+    triangular = a + (c - a) * triangular
+    return triangular
+
+def Normal(Mean, Variance, Stream):
+    '''
+    Obtains a Normal random variate with given
+    Mean and Variance using the next Uniform(0,1) in Stream.
+
+    Input:
+        Mean: float
+        Variance: float, must be positive
+        Stream: integer, random number stream
+
+    Output:
+        float
+    '''
+
+    Mean = float(Mean)
+    Variance = float(Variance)
+    U1 = lcgrand(Stream)
+    U2 = lcgrand(Stream)
+    V1 = 2 * U1 - 1
+    V2 = 2 * U2 - 1
+    W = V1 ** 2 + V2 ** 2
+    while (W > 1):
+        U1 = lcgrand(Stream)
+        U2 = lcgrand(Stream)
+        V1 = 2 * U1 - 1
+        V2 = 2 * U2 - 1
+        W = V1 ** 2 + V2 ** 2
+    Y = math.sqrt(-2 * math.log(W) / W)
+    normal = V1 * Y
+    normal = Mean + math.sqrt(Variance) * normal
+    return normal
+    
+def Lognormal(MeanPrime, VariancePrime, Stream):
+    '''
+    Obtains a Lognormal random variate with given
+    MeanPrime and VariancePrime using the next 
+    Uniform(0,1) in Stream.
+    
+    Input:
+        MeanPrime: float, desired mean for lognormal
+        VariancePrime: float, desired variance for
+            lognormal, must be positive
+        Stream: integer, random number stream
+
+    Output:
+        float
+    '''
+
+    MeanPrime = float(MeanPrime)
+    VariancePrime = float(VariancePrime)
+    Mean = math.log(MeanPrime ** 2 / math.sqrt(MeanPrime ** 2 + VariancePrime))
+    Variance = math.log(1 + VariancePrime / MeanPrime ** 2)
+    lognormal = math.exp(Normal(Mean, Variance, Stream))
+    return lognormal
+
+def Gamma(Alpha, Beta, Stream):
+    '''
+    Obtains a Gamma random variate with shape Alpha and scale
+    Beta (mean Alpha * Beta) using Uniform(0,1)s from Stream,
+    by the method of Marsaglia and Tsang (2000): a Normal
+    variate is accepted or rejected with a squeeze test, so
+    about 1.05 Normals are needed per variate for any Alpha.
+    For Alpha < 1, a Gamma(Alpha+1, Beta) variate is multiplied
+    by U ** (1/Alpha), U being the next Uniform(0,1).
+
+    Input:
+        Alpha: float, positive, shape
+        Beta: float, positive, scale
+        Stream: integer, random number stream
+
+    Output:
+        float
+    '''
+
+    Alpha = float(Alpha)
+    Beta = float(Beta)
+    if Alpha < 1:
+        gamma = Gamma(Alpha + 1, Beta, Stream)
+        return gamma * lcgrand(Stream) ** (1 / Alpha)
+    d = Alpha - 1 / 3
+    c = 1 / math.sqrt(9 * d)
+    while True:
+        Z = Normal(0, 1, Stream)
+        V = 1 + c * Z
+        if V <= 0:
+            continue
+        V = V ** 3
+        U = lcgrand(Stream)
+        if U < 1 - 0.0331 * Z ** 4 or math.log(U) < 0.5 * Z ** 2 + d * (1 - V + math.log(V)):
+            return d * V * Beta
+
+class EmpiricalTable:
+    '''
+    Class of lookup tables of empirical distributions, for
+        Empirical (Continuous False: probability Probabilities[i]
+        on Values[i]) and PiecewiseLinear (Continuous True:
+        probability Probabilities[i] spread uniformly between
+        the sorted Values[i] and Values[i+1]). Without
+        Probabilities, every value (interval) is equally likely,
+        i.e. the empirical distribution of data Values, or its
+        piecewise-linear version in Law and Kelton.
+
+    A guide table (Chen and Asau, 1974) makes the lookup of a
+        Uniform(0,1) U take O(1) expected time: Guide[k] is the
+        first i with Cumulative[i] > k/n, and the search for the
+        first i with Cumulative[i] > U starts at Guide[int(U*n)].
+
+    Instance attributes:
+        Values: list of floats, sorted
+        Cumulative: list of floats, cumulative probability of
+            every value (interval), the last being 1
+        Lower: list of floats, cumulative probability before
+            every value (interval)
+        Guide: list of integers
+        Continuous: boolean
+
+    Instance methods:
+        Arrays
+        LookupBlock
+    '''
+
+    def __init__(self, Values, Probabilities=None, Continuous=False):
+        n = len(Values) - 1 if Continuous else len(Values)
+        if Probabilities is None:
+            Probabilities = [1.0] * n
+        if n < 1 or len(Probabilities) != n:
+            raise ValueError("need {} probabilities for {} values".format(n, len(Values)))
+        if Continuous:
+            Values = sorted(float(x) for x in Values)
+        else:
+            Pairs = sorted(zip((float(x) for x in Values), Probabilities))
+            Values = [x for x, p in Pairs]
+            Probabilities = [p for x, p in Pairs]
+        Total = float(sum(Probabilities))
+        Cumulative = []
+        Sum = 0.0
+        for p in Probabilities:
+            Sum += p
+            Cumulative.append(Sum / Total)
+        Cumulative[-1] = 1.0
+        self.Values = Values
+        self.Cumulative = Cumulative
+        self.Lower = [0.0] + Cumulative[:-1]
+        self.Continuous = Continuous
+        self.Guide = []
+        i = 0
+        for k in range(n):
+            while Cumulative[i] <= k / n:
+                i += 1
+            self.Guide.append(i)
+        self.NumpyArrays = None
+
+    def Arrays(self):
+        '''
+        Returns Values, Cumulative, Lower and Guide as numpy arrays,
+            for the Block functions; they are made on the first call
+
+        Output:
+            tuple of 4 numpy arrays
+        '''
+
+        if self.NumpyArrays is None:
+            import numpy as np
+            self.NumpyArrays = (np.array(self.Values), np.array(self.Cumulative),
+                np.array(self.Lower), np.array(self.Guide, dtype=np.int64))
+        return self.NumpyArrays
+
+    def LookupBlock(self, U):
+        '''
+        Returns, for every U of the numpy array U, the first i with
+            Cumulative[i] > U, searching from the guide table
+
+        Output:
+            numpy array of integers, shape of U
+        '''
+
+        Values, Cumulative, Lower, Guide = self.Arrays()
+        i = Guide[(U * len(Cumulative)).astype(Guide.dtype)]
+        while True:
+            Below = Cumulative[i] <= U
+            if not Below.any():
+                return i
+            i += Below
+
+def Empirical(Table, Stream):
+    '''
+    Obtains a random variate from the discrete empirical
+    distribution of Table using the next Uniform(0,1) in Stream,
+    in O(1) expected time.
+
+    Input:
+        Table: EmpiricalTable, with Continuous False
+        Stream: integer, random number stream
+
+    Output:
+        float
+    '''
+
+    U = lcgrand(Stream)
+    Cumulative = Table.Cumulative
+    i = Table.Guide[int(U * len(Cumulative))]
+    while Cumulative[i] <= U:
+        i += 1
+    return Table.Values[i]
+
+def PiecewiseLinear(Table, Stream):
+    '''
+    Obtains a random variate from the continuous, piecewise-linear
+    empirical distribution of Table using the next Uniform(0,1) in
+    Stream, by inversion in O(1) expected time.
+
+    Input:
+        Table: EmpiricalTable, with Continuous True
+        Stream: integer, random number stream
+
+    Output:
+        float
+    '''
+
+    U = lcgrand(Stream)
+    Cumulative = Table.Cumulative
+    i = Table.Guide[int(U * len(Cumulative))]
+    while Cumulative[i] <= U:
+        i += 1
+    Values = Table.Values
+    Lower = Table.Lower[i]
+    return Values[i] + (U - Lower) / (Cumulative[i] - Lower) * (Values[i+1] - Values[i])
+
+def EmpiricalBlock(Table, Stream, Size):
+    '''
+    Obtains an array of random variates from the discrete empirical
+    distribution of Table, using the same random numbers as Size
+    calls of Empirical(Table, Stream).
+
+    Input:
+        Table: EmpiricalTable, with Continuous False
+        Stream: integer, random number stream, or array of
+            seeds (see lcgrandblock)
+        Size: integer or tuple of integers
+
+    Output:
+        numpy array of floats
+    '''
+
+    Values, Cumulative, Lower, Guide = Table.Arrays()
+    return Values[Table.LookupBlock(lcgrandblock(Stream, Size))]
+
+def PiecewiseLinearBlock(Table, Stream, Size):
+    '''
+    Obtains an array of random variates from the piecewise-linear
+    empirical distribution of Table, using the same random numbers
+    as Size calls of PiecewiseLinear(Table, Stream).
+
+    Input:
+        Table: EmpiricalTable, with Continuous True
+        Stream: integer, random number stream, or array of
+            seeds (see lcgrandblock)
+        Size: integer or tuple of integers
+
+    Output:
+        numpy array of floats
+    '''
+
+    Values, Cumulative, Lower, Guide = Table.Arrays()
+    U = lcgrandblock(Stream, Size)
+    i = Table.LookupBlock(U)
+    return Values[i] + (U - Lower[i]) / (Cumulative[i] - Lower[i]) * (Values[i+1] - Values[i])
+
+# Tables made by ChoiceTable, by tuple of probabilities
+CHOICE_TABLES = {}
+
+def ChoiceTable(Probabilities):
+    '''
+    Returns the EmpiricalTable of a choice among 0, 1, ..., n-1
+    with the given (relative) probabilities, for Choice and
+    ChoiceBlock; tables are cached, so calling it again with the
+    same probabilities returns the same table.
+
+    Input:
+        Probabilities: sequence of n floats, nonnegative
+
+    Output:
+        EmpiricalTable
+    '''
+
+    Key = tuple(float(p) for p in Probabilities)
+    Table = CHOICE_TABLES.get(Key)
+    if Table is None:
+        Table = EmpiricalTable(range(len(Key)), Key)
+        CHOICE_TABLES[Key] = Table
+    return Table
+
+def Choice(Table, Stream):
+    '''
+    Obtains a random choice (e.g. a route or a customer type)
+    among 0, 1, ..., n-1 using the next Uniform(0,1) in Stream,
+    in O(1) expected time.
+
+    Input:
+        Table: EmpiricalTable, from ChoiceTable
+        Stream: integer, random number stream
+
+    Output:
+        integer
+    '''
+
+    U = lcgrand(Stream)
+    Cumulative = Table.Cumulative
+    i = Table.Guide[int(U * len(Cumulative))]
+    while Cumulative[i] <= U:
+        i += 1
+    return i
+
+def ChoiceBlock(Table, Stream, Size):
+    '''
+    Obtains an array of random choices among 0, 1, ..., n-1,
+    using the same random numbers as Size calls of
+    Choice(Table, Stream).
+
+    Input:
+        Table: EmpiricalTable, from ChoiceTable
+        Stream: integer, random number stream, or array of
+            seeds (see lcgrandblock)
+        Size: integer or tuple of integers
+
+    Output:
+        numpy array of integers
+    '''
+
+    return Table.LookupBlock(lcgrandblock(Stream, Size))
+
+# Largest Uniform(0,1) that lcgrand returns
+LCGRAND_MAX = 1 - 2.0 ** -24
+
+def RejectionBlock(Attempt, NumUniforms, Stream, Size):
+    '''
+    Returns an array of variates generated by a rejection method:
+    Attempt is called on NumUniforms Uniform(0,1)s for every
+    variate not yet accepted, until all are accepted. The variates
+    have the distribution of the scalar generator, but not the same
+    values. With an array of seeds, every row draws only from its
+    own seed, so that a replication's variates do not depend on the
+    other rows of the block.
+
+    Input:
+        Attempt: function, (numpy array of Uniform(0,1)s, shape
+            (..., NumUniforms)) -> (variates, accepted), shape (...)
+        NumUniforms: integer, positive
+        Stream: integer, random number stream, or array of
+            seeds (see lcgrandblock)
+        Size: integer or tuple of integers
+
+    Output:
+        numpy array of floats
+    '''
+
+    import numpy as np
+    Shape = (Size,) if np.isscalar(Size) else tuple(Size)
+    if isinstance(Stream, np.ndarray):
+        Result = np.empty((len(Stream),) + Shape)
+        Pending = np.ones(Result.shape, dtype=bool)
+        while Pending.any():
+            Rows = Pending.reshape(len(Stream), -1).any(axis=1)
+            Seeds = Stream[Rows]
+            X, Accepted = Attempt(lcgrandblock(Seeds, Shape + (NumUniforms,)))
+            Stream[Rows] = Seeds
+            Take = Accepted & Pending[Rows]
+            Block = Result[Rows]
+            Block[Take] = X[Take]
+            Result[Rows] = Block
+            Pending[Rows] = Pending[Rows] & ~Accepted
+        return Result
+
+    Result = np.empty(Shape)
+    Pending = np.ones(Shape, dtype=bool)
+    while Pending.any():
+        X, Accepted = Attempt(lcgrandblock(Stream, (int(Pending.sum()), NumUniforms)))
+        Index = np.flatnonzero(Pending)[Accepted]
+        Result.flat[Index] = X[Accepted]
+        Pending.flat[Index] = False
+    return Result
+
+def LogFactorialBlock(K):
+    '''
+    Returns log(k!) for every k of the numpy array K (nonnegative
+    integers), exactly below 10 and by Stirling's series above
+    '''
+
+    import numpy as np
+    K = np.asarray(K, dtype=float)
+    x = np.maximum(K, 10) + 1
+    Stirling = (x - 0.5) * np.log(x) - x + 0.5 * math.log(2 * math.pi) \
+        + (1 / 12 - (1 / 360 - 1 / (1260 * x * x)) / (x * x)) / x
+    Small = np.array([math.lgamma(k + 1) for k in range(10)])
+    return np.where(K < 10, Small[np.minimum(K, 9).astype(np.int64)], Stirling)
+
+def InversionCDF(P0, Ratio, Last):
+    '''
+    Returns the CDF of a distribution on 0, 1, ..., Last with
+    P(0) = P0 and P(x) = P(x-1) * Ratio(x), up to the first x
+    whose CDF reaches LCGRAND_MAX, summed as in the inversion
+    loops of Poisson and Binomial
+
+    Output:
+        list of floats
+    '''
+
+    x = 0
+    p = P0
+    F = [p]
+    while F[-1] < LCGRAND_MAX and x < Last and p > 0:
+        x += 1
+        p *= Ratio(x)
+        F.append(F[-1] + p)
+    return F
+
+def Weibull(Alpha, Beta, Stream):
+    '''
+    Obtains a Weibull random variate with shape Alpha and scale
+    Beta by inversion, using the next Uniform(0,1) in Stream.
+
+    Input:
+        Alpha: float, positive, shape
+        Beta: float, positive, scale
+        Stream: integer, random number stream
+
+    Output:
+        float
+    '''
+
+    Alpha = float(Alpha)
+    Beta = float(Beta)
+    return Beta * (-math.log(1 - lcgrand(Stream))) ** (1 / Alpha)
+
+def WeibullBlock(Alpha, Beta, Stream, Size):
+    '''
+    Obtains an array of Weibull random variates with shape Alpha and
+    scale Beta, using the same random numbers as Size calls of
+    Weibull(Alpha, Beta, Stream).
+
+    Input:
+        Alpha: float, positive, shape
+        Beta: float, positive, scale
+        Stream: integer, random number stream, or array of
+            seeds (see lcgrandblock)
+        Size: integer or tuple of integers
+
+    Output:
+        numpy array of floats
+    '''
+
+    import numpy as np
+    Alpha = float(Alpha)
+    Beta = float(Beta)
+    return Beta * (-np.log(1 - lcgrandblock(Stream, Size))) ** (1 / Alpha)
+
+def GammaBlock(Alpha, Beta, Stream, Size):
+    '''
+    Obtains an array of Gamma random variates with shape Alpha and
+    scale Beta by the method of Marsaglia and Tsang, vectorized with
+    RejectionBlock: every attempt takes a Box-Muller Normal and
+    one Uniform(0,1), three Uniform(0,1)s in all. The variates have
+    the distribution of Gamma(Alpha, Beta, Stream), not its values.
+
+    Input:
+        Alpha: float, positive, shape
+        Beta: float, positive, scale
+        Stream: integer, random number stream, or array of
+            seeds (see lcgrandblock)
+        Size: integer or tuple of integers
+
+    Output:
+        numpy array of floats
+    '''
+
+    import numpy as np
+    Alpha = float(Alpha)
+    Beta = float(Beta)
+    if Alpha < 1:
+        gamma = GammaBlock(Alpha + 1, Beta, Stream, Size)
+        return gamma * lcgrandblock(Stream, Size) ** (1 / Alpha)
+    d = Alpha - 1 / 3
+    c = 1 / math.sqrt(9 * d)
+    def Attempt(U):
+        Z = np.sqrt(-2 * np.log(U[..., 0])) * np.cos(2 * math.pi * U[..., 1])
+        V = 1 + c * Z
+        Positive = V > 0
+        V = np.where(Positive, V, 1.0) ** 3
+        Accepted = Positive & ((U[..., 2] < 1 - 0.0331 * Z ** 4)
+            | (np.log(U[..., 2]) < 0.5 * Z ** 2 + d * (1 - V + np.log(V))))
+        return d * V * Beta, Accepted
+    return RejectionBlock(Attempt, 3, Stream, Size)
+
+def Beta(Alpha1, Alpha2, Stream):
+    '''
+    Obtains a Beta random variate with shapes Alpha1 and Alpha2
+    as X / (X + Y), X and Y being Gamma(Alpha1, 1) and
+    Gamma(Alpha2, 1) variates from Stream.
+
+    Input:
+        Alpha1: float, positive
+        Alpha2: float, positive
+        Stream: integer, random number stream
+
+    Output:
+        float
+    '''
+
+    X = Gamma(Alpha1, 1, Stream)
+    Y = Gamma(Alpha2, 1, Stream)
+    return X / (X + Y)
+
+def BetaBlock(Alpha1, Alpha2, Stream, Size):
+    '''
+    Obtains an array of Beta random variates with shapes Alpha1 and
+    Alpha2 from two GammaBlock arrays; the variates have the
+    distribution of Beta(Alpha1, Alpha2, Stream), not its values.
+
+    Input:
+        Alpha1: float, positive
+        Alpha2: float, positive
+        Stream: integer, random number stream, or array of
+            seeds (see lcgrandblock)
+        Size: integer or tuple of integers
+
+    Output:
+        numpy array of floats
+    '''
+
+    X = GammaBlock(Alpha1, 1, Stream, Size)
+    Y = GammaBlock(Alpha2, 1, Stream, Size)
+    return X / (X + Y)
+
+# Means (and n * min(p, 1-p) of binomials) from which the rejection
+#   methods are used instead of inversion
+INVERSION_LIMIT = 10
+
+def Poisson(Mean, Stream):
+    '''
+    Obtains a Poisson random variate with given Mean using
+    Uniform(0,1)s from Stream: by inversion with one Uniform(0,1)
+    for Mean < INVERSION_LIMIT, else by the transformed rejection
+    method PTRS of Hormann (1993), which takes about 2.3
+    Uniform(0,1)s per variate for any Mean.
+
+    Input:
+        Mean: float, positive
+        Stream: integer, random number stream
+
+    Output:
+        integer
+    '''
+
+    Mean = float(Mean)
+    if Mean < INVERSION_LIMIT:
+        U = lcgrand(Stream)
+        x = 0
+        p = math.exp(-Mean)
+        F = p
+        while U > F and p > 0:
+            x += 1
+            p *= Mean / x
+            F += p
+        return x
+    slam = math.sqrt(Mean)
+    loglam = math.log(Mean)
+    b = 0.931 + 2.53 * slam
+    a = -0.059 + 0.02483 * b
+    invalpha = 1.1239 + 1.1328 / (b - 3.4)
+    vr = 0.9277 - 3.6224 / (b - 2)
+    while True:
+        U = lcgrand(Stream) - 0.5
+        V = lcgrand(Stream)
+        us = 0.5 - abs(U)
+        k = math.floor((2 * a / us + b) * U + Mean + 0.43)
+        if us >= 0.07 and V <= vr:
+            return k
+        if k < 0 or (us < 0.013 and V > us):
+            continue
+        if math.log(V * invalpha / (a / (us * us) + b)) <= -Mean + k * loglam - math.lgamma(k + 1):
+            return k
+
+def PoissonBlock(Mean, Stream, Size):
+    '''
+    Obtains an array of Poisson random variates with given Mean.
+    For Mean < INVERSION_LIMIT they use the same random numbers as
+    Size calls of Poisson(Mean, Stream); else PTRS is vectorized
+    with RejectionBlock, giving the same distribution.
+
+    Input:
+        Mean: float, positive
+        Stream: integer, random number stream, or array of
+            seeds (see lcgrandblock)
+        Size: integer or tuple of integers
+
+    Output:
+        numpy array of integers
+    '''
+
+    import numpy as np
+    Mean = float(Mean)
+    if Mean < INVERSION_LIMIT:
+        F = np.array(InversionCDF(math.exp(-Mean), lambda x: Mean / x, math.inf))
+        return np.minimum(np.searchsorted(F, lcgrandblock(Stream, Size)), len(F) - 1)
+    slam = math.sqrt(Mean)
+    loglam = math.log(Mean)
+    b = 0.931 + 2.53 * slam
+    a = -0.059 + 0.02483 * b
+    invalpha = 1.1239 + 1.1328 / (b - 3.4)
+    vr = 0.9277 - 3.6224 / (b - 2)
+    def Attempt(UV):
+        U = UV[..., 0] - 0.5
+        V = UV[..., 1]
+        us = 0.5 - np.abs(U)
+        k = np.floor((2 * a / us + b) * U + Mean + 0.43)
+        Accepted = (us >= 0.07) & (V <= vr)
+        Valid = (k >= 0) & ((us >= 0.013) | (V <= us))
+        with np.errstate(invalid="ignore"):
+            Accepted |= Valid & (np.log(V * invalpha / (a / (us * us) + b))
+                <= -Mean + k * loglam - LogFactorialBlock(np.maximum(k, 0)))
+        return k, Accepted
+    return RejectionBlock(Attempt, 2, Stream, Size).astype(np.int64)
+
+def Binomial(n, p, Stream):
+    '''
+    Obtains a Binomial(n, p) random variate (successes in n trials
+    with success probability p) using Uniform(0,1)s from Stream:
+    by inversion with one Uniform(0,1) when n * min(p, 1-p) <
+    INVERSION_LIMIT, else by the transformed rejection method BTRS
+    of Hormann (1993); for p > 1/2 it is n minus a Binomial(n, 1-p)
+    variate.
+
+    Input:
+        n: integer, nonnegative
+        p: float, between 0 and 1
+        Stream: integer, random number stream
+
+    Output:
+        integer
+    '''
+
+    p = float(p)
+    if p > 0.5:
+        return n - Binomial(n, 1 - p, Stream)
+    if n == 0 or p == 0:
+        return 0
+    q = 1 - p
+    if n * p < INVERSION_LIMIT:
+        U = lcgrand(Stream)
+        x = 0
+        Prob = q ** n
+        F = Prob
+        while U > F and x < n and Prob > 0:
+            x += 1
+            Prob *= (n - x + 1) / x * p / q
+            F += Prob
+        return x
+    spq = math.sqrt(n * p * q)
+    b = 1.15 + 2.53 * spq
+    a = -0.0873 + 0.0248 * b + 0.01 * p
+    c = n * p + 0.5
+    vr = 0.92 - 4.2 / b
+    alpha = (2.83 + 5.1 / b) * spq
+    lpq = math.log(p / q)
+    m = math.floor((n + 1) * p)
+    h = math.lgamma(m + 1) + math.lgamma(n - m + 1)
+    while True:
+        U = lcgrand(Stream) - 0.5
+        V = lcgrand(Stream)
+        us = 0.5 - abs(U)
+        k = math.floor((2 * a / us + b) * U + c)
+        if k < 0 or k > n:
+            continue
+        if us >= 0.07 and V <= vr:
+            return k
+        if math.log(V * alpha / (a / (us * us) + b)) <= h - math.lgamma(k + 1) - math.lgamma(n - k + 1) + (k - m) * lpq:
+            return k
+
+def BinomialBlock(n, p, Stream, Size):
+    '''
+    Obtains an array of Binomial(n, p) random variates. When
+    n * min(p, 1-p) < INVERSION_LIMIT they use the same random
+    numbers as Size calls of Binomial(n, p, Stream); else BTRS is
+    vectorized with RejectionBlock, giving the same distribution.
+
+    Input:
+        n: integer, nonnegative
+        p: float, between 0 and 1
+        Stream: integer, random number stream, or array of
+            seeds (see lcgrandblock)
+        Size: integer or tuple of integers
+
+    Output:
+        numpy array of integers
+    '''
+
+    import numpy as np
+    p = float(p)
+    if p > 0.5:
+        return n - BinomialBlock(n, 1 - p, Stream, Size)
+    if n == 0 or p == 0:
+        Shape = (Size,) if np.isscalar(Size) else tuple(Size)
+        if isinstance(Stream, np.ndarray):
+            Shape = (len(Stream),) + Shape
+        return np.zeros(Shape, dtype=np.int64)
+    q = 1 - p
+    if n * p < INVERSION_LIMIT:
+        F = np.array(InversionCDF(q ** n, lambda x: (n - x + 1) / x * p / q, n))
+        return np.minimum(np.searchsorted(F, lcgrandblock(Stream, Size)), len(F) - 1)
+    spq = math.sqrt(n * p * q)
+    b = 1.15 + 2.53 * spq
+    a = -0.0873 + 0.0248 * b + 0.01 * p
+    c = n * p + 0.5
+    vr = 0.92 - 4.2 / b
+    alpha = (2.83 + 5.1 / b) * spq
+    lpq = math.log(p / q)
+    m = math.floor((n + 1) * p)
+    h = math.lgamma(m + 1) + math.lgamma(n - m + 1)
+    def Attempt(UV):
+        U = UV[..., 0] - 0.5
+        V = UV[..., 1]
+        us = 0.5 - np.abs(U)
+        k = np.floor((2 * a / us + b) * U + c)
+        Valid = (k >= 0) & (k <= n)
+        Accepted = Valid & (us >= 0.07) & (V <= vr)
+        K = np.clip(k, 0, n)
+        Accepted |= Valid & (np.log(V * alpha / (a / (us * us) + b))
+            <= h - LogFactorialBlock(K) - LogFactorialBlock(n - K) + (k - m) * lpq)
+        return k, Accepted
+    return RejectionBlock(Attempt, 2, Stream, Size).astype(np.int64)
\ No newline at end of file
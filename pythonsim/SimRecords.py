@@ -0,0 +1,279 @@
+###############################################################
+
+# Contains RecordWriter, which streams per-record outputs of
+#   replications (e.g. the time in system of every customer)
+#   into a directory with one .npy file per column, and
+#   ReadRecords, which memory-maps those files for analysis,
+#   ByReplication, which turns a column back into one
+#   row per replication, and ToCSV, which exports a column as
+#   a ragged CSV file with one row per replication.
+
+# Records are buffered and written in chunks of ChunkSize,
+#   by a background thread unless Background is False, so the
+#   simulation does not wait for the disk. Every column file
+#   is a standard .npy file whose header is rewritten after
+#   each chunk, so np.load can read it at any time, even if
+#   the writer was never closed.
+
+###############################################################
+
+import csv
+import os
+import queue
+import struct
+import threading
+
+import numpy as np
+
+# Bytes of every .npy header written here; fixed, so that the
+#   header can be rewritten in place as the column grows
+HEADER_SIZE = 128
+
+def NpyHeader(DType, Length):
+    '''
+    Returns the header of a version 1.0 .npy file holding a
+    1-D array of Length items of DType, padded to HEADER_SIZE bytes
+
+    Input:
+        DType: numpy dtype
+        Length: integer, nonnegative
+
+    Output:
+        bytes
+    '''
+
+    header = "{{'descr': {!r}, 'fortran_order': False, 'shape': ({},), }}".format(
+        np.lib.format.dtype_to_descr(np.dtype(DType)), Length)
+    header = header.ljust(HEADER_SIZE - 11) + "\n"
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1")
+
+class RecordWriter:
+    '''
+    Class of objects for writing per-record outputs of
+        replications to Directory/<Name>.npy, one file per
+        column; the first column, "Rep", is the replication
+        number of every record
+
+    Instance attributes:
+        Directory: string
+        Names: list of strings, column names, starting with "Rep"
+        DTypes: list of numpy dtypes, one per column
+        ChunkSize: integer, records buffered before a write
+        Length: integer, number of records written to the files
+        Buffers: list of lists of numpy arrays, one per column,
+            records not yet handed to the writer
+        NumBuffered: integer, number of records in Buffers
+
+    Instance methods:
+        Write
+        Flush
+        Close
+    '''
+
+    def __init__(self, Directory, Columns=None, ChunkSize=65536, Background=True):
+        '''
+        Creates Directory if needed and empty column files
+
+        Input:
+            Directory: string
+            Columns: dict, column name -> numpy dtype (e.g. "f8"),
+                default {"Value": "f8"}; "Rep" is added first as "i4"
+            ChunkSize: integer, positive
+            Background: boolean, write chunks in a separate thread
+        '''
+
+        if Columns is None:
+            Columns = {"Value": "f8"}
+        self.Directory = Directory
+        self.Names = ["Rep"] + list(Columns)
+        self.DTypes = [np.dtype("i4")] + [np.dtype(Columns[Name]) for Name in Columns]
+        self.ChunkSize = ChunkSize
+        self.Length = 0
+        self.Buffers = [[] for Name in self.Names]
+        self.NumBuffered = 0
+        self.Error = None
+
+        os.makedirs(Directory, exist_ok=True)
+        self.Files = []
+        for Name, DType in zip(self.Names, self.DTypes):
+            f = open(os.path.join(Directory, Name + ".npy"), "w+b")
+            f.write(NpyHeader(DType, 0))
+            f.flush()
+            self.Files.append(f)
+
+        self.Queue = None
+        if Background:
+            self.Queue = queue.Queue(maxsize=4)
+            self.Thread = threading.Thread(target=self.Run, daemon=True)
+            self.Thread.start()
+
+    def Write(self, Rep, *Values):
+        '''
+        Adds the records of replication Rep, with one sequence of
+            values per column after "Rep", all of the same length
+
+        Input:
+            Rep: integer, replication number
+            Values: sequences, one per column
+        '''
+
+        n = len(Values[0])
+        self.Buffers[0].append(np.full(n, Rep, dtype=self.DTypes[0]))
+        for k in range(len(Values)):
+            self.Buffers[k + 1].append(np.asarray(Values[k], dtype=self.DTypes[k + 1]))
+        self.NumBuffered += n
+        if self.NumBuffered >= self.ChunkSize:
+            self.Flush()
+
+    def Flush(self):
+        '''
+        Hands the buffered records to the writer (the background
+            thread, or the files directly)
+        '''
+
+        if self.Error is not None:
+            raise self.Error
+        if self.NumBuffered == 0:
+            return
+        Chunk = [np.concatenate(Buffer) for Buffer in self.Buffers]
+        self.Buffers = [[] for Name in self.Names]
+        self.NumBuffered = 0
+        if self.Queue is None:
+            self.WriteChunk(Chunk)
+        else:
+            self.Queue.put(Chunk)
+
+    def WriteChunk(self, Chunk):
+        '''
+        Appends a chunk to the column files and updates their headers
+
+        Input:
+            Chunk: list of numpy arrays, one per column, same length
+        '''
+
+        for f, Column in zip(self.Files, Chunk):
+            f.seek(0, os.SEEK_END)
+            f.write(Column.tobytes())
+        self.Length += len(Chunk[0])
+        for f, DType in zip(self.Files, self.DTypes):
+            f.seek(0)
+            f.write(NpyHeader(DType, self.Length))
+            f.flush()
+
+    def Run(self):
+        '''
+        Body of the background thread: writes chunks until Close
+        '''
+
+        while True:
+            Chunk = self.Queue.get()
+            if Chunk is None:
+                return
+            if self.Error is None:
+                try:
+                    self.WriteChunk(Chunk)
+                except Exception as e:
+                    self.Error = e
+
+    def Close(self):
+        '''
+        Writes the remaining records and closes the files
+        '''
+
+        self.Flush()
+        if self.Queue is not None:
+            self.Queue.put(None)
+            self.Thread.join()
+        for f in self.Files:
+            f.close()
+        if self.Error is not None:
+            raise self.Error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.Close()
+
+def ReadRecords(Directory, Names=None):
+    '''
+    Memory-maps the column files written by a RecordWriter; only
+    the parts that are used are read from disk
+
+    Input:
+        Directory: string
+        Names: list of column names, default all columns
+
+    Output:
+        dict, column name -> read-only numpy array (memory map)
+    '''
+
+    if Names is None:
+        Names = sorted(f[:-4] for f in os.listdir(Directory) if f.endswith(".npy"))
+    return {Name: np.load(os.path.join(Directory, Name + ".npy"), mmap_mode="r") for Name in Names}
+
+def ByReplication(Rep, Values, Reps=None):
+    '''
+    Returns Values as one row per replication, in increasing
+    order of replication number, keeping the order of the
+    records within a replication and padding rows with NaN
+    (the layout of a ragged CSV file with one row per replication)
+    A replication without records has no Rep, so it only gets
+    a row (all NaN) if it is in Reps
+
+    Input:
+        Rep: 1-D array of integers, "Rep" column
+        Values: 1-D array, another column
+        Reps: 1-D array of integers, replications to return,
+            default those in Rep
+
+    Output:
+        numpy array of floats, shape (replications, most records)
+    '''
+
+    Rep = np.asarray(Rep)
+    if Reps is None:
+        Reps = Rep
+    Reps = np.unique(np.asarray(Reps, dtype=np.int64))
+    row = np.searchsorted(Reps, Rep)
+    if len(Rep) > 0 and (row.max() >= len(Reps) or np.any(Reps[row] != Rep)):
+        raise ValueError("Rep has replications that are not in Reps")
+    counts = np.bincount(row, minlength=len(Reps))
+    order = np.argsort(row, kind="stable")
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    position = np.empty(len(Rep), dtype=np.int64)
+    position[order] = np.arange(len(Rep)) - np.repeat(starts, counts)
+    table = np.full((len(Reps), counts.max() if len(Reps) > 0 else 0), np.nan)
+    table[row, position] = Values
+    return table
+
+def ToCSV(Directory, FileName, Name="Value", Reps=None):
+    '''
+    Writes column Name of the records in Directory to FileName
+    as a CSV file with one row per replication, in increasing 
+    order of replication number, holding the values of its
+    records in the order they were written, without padding
+    (the format of csv.writer rows, an empty row for a 
+    replication without records)
+
+    Input:
+        Directory: string, written by a RecordWriter
+        FileName: string
+        Name: string, column name
+        Reps: 1-D array of integers, replications to write,
+            default those in the "Rep" column
+    '''
+
+    Records = ReadRecords(Directory, ["Rep", Name])
+    Rep = np.asarray(Records["Rep"])
+    if Reps is None:
+        Reps = Rep
+    Reps = np.unique(np.asarray(Reps, dtype=np.int64))
+    order = np.argsort(Rep, kind="stable")
+    ordered = Rep[order]
+    with open(FileName, "w", newline="") as f:
+        fwriter = csv.writer(f)
+        for k in range(len(Reps)):
+            first = np.searchsorted(ordered, Reps[k], side="left")
+            last = np.searchsorted(ordered, Reps[k], side="right")
+            fwriter.writerow(np.asarray(Records[Name][order[first:last]]).tolist())
@@ -0,0 +1,1277 @@
+###############################################################
+
+# Contains the ReplicationResults class, which stores the
+#   end-of-replication value of named DTStat and CTStat
+#   objects in a preallocated numpy array, functions
+#   for t-based confidence intervals (TCDF, TQuantile), and
+#   the replication runners RunReplications, RunSequential,
+#   RunForked (replications forked from warm-up snapshots) and
+#   RunScenarios (every scenario of a ParameterGrid, with
+#   common random numbers), which can spread replications
+#   over worker processes, and the asyncio driver
+#   RunStreaming, which hands every
+#   replication to consumers (e.g. PrintProgress,
+#   StopWhenConverged, AppendCSV) as soon as it finishes and
+#   can checkpoint the experiment (SaveCheckpoint,
+#   LoadCheckpoint) so that an interrupted run resumes exactly.
+#   Also contains single-replication batch-means confidence
+#   intervals (BatchMeansCI), used by DTStat and CTStat.
+
+###############################################################
+
+import asyncio
+import concurrent.futures
+import contextlib
+import functools
+import inspect
+import itertools
+import math
+import os
+
+import numpy as np
+
+from . import SimClasses
+from . import SimRNG
+
+def BetaCF(a, b, x):
+    '''
+    Evaluates the continued fraction for the incomplete beta
+    function by the modified Lentz's method
+
+    Input:
+        a: float, positive
+        b: float, positive
+        x: float, between 0 and 1
+
+    Output:
+        float
+    '''
+
+    TINY = 1.0e-300
+    qab = a + b
+    qap = a + 1.0
+    qam = a - 1.0
+    c = 1.0
+    d = 1.0 - qab * x / qap
+    if abs(d) < TINY:
+        d = TINY
+    d = 1.0 / d
+    h = d
+    for m in range(1, 301):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1.0 + aa * d
+        if abs(d) < TINY:
+            d = TINY
+        c = 1.0 + aa / c
+        if abs(c) < TINY:
+            c = TINY
+        d = 1.0 / d
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1.0 + aa * d
+        if abs(d) < TINY:
+            d = TINY
+        c = 1.0 + aa / c
+        if abs(c) < TINY:
+            c = TINY
+        d = 1.0 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1.0) < 1.0e-15:
+            break
+    return h
+
+def BetaInc(a, b, x):
+    '''
+    Returns the regularized incomplete beta function I_x(a,b)
+
+    Input:
+        a: float, positive
+        b: float, positive
+        x: float, between 0 and 1
+
+    Output:
+        float, between 0 and 1
+    '''
+
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    lbeta = (math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+        + a * math.log(x) + b * math.log(1.0 - x))
+    if x < (a + 1.0) / (a + b + 2.0):
+        return math.exp(lbeta) * BetaCF(a, b, x) / a
+    return 1.0 - math.exp(lbeta) * BetaCF(b, a, 1.0 - x) / b
+
+def TCDF(t, df):
+    '''
+    Returns the cumulative distribution function of the
+    Student t distribution with df degrees of freedom at t
+
+    Input:
+        t: float
+        df: float, positive
+
+    Output:
+        float, between 0 and 1
+    '''
+
+    tail = 0.5 * BetaInc(df / 2.0, 0.5, df / (df + t * t))
+    if t > 0:
+        return 1.0 - tail
+    return tail
+
+@functools.lru_cache(maxsize=None)
+def TQuantile(p, df):
+    '''
+    Returns the p-quantile of the Student t distribution with
+    df degrees of freedom, found by bisection on TCDF
+
+    Input:
+        p: float, between 0 and 1
+        df: float, positive
+
+    Output:
+        float
+    '''
+
+    if p < 0.5:
+        return -TQuantile(1.0 - p, df)
+    hi = 1.0
+    while TCDF(hi, df) < p:
+        hi *= 2.0
+    lo = 0.0
+    for i in range(100):
+        mid = 0.5 * (lo + hi)
+        if TCDF(mid, df) < p:
+            lo = mid
+        else:
+            hi = mid
+    return 0.5 * (lo + hi)
+
+def Lag1Autocorrelation(Series):
+    '''
+    Returns the lag-1 sample autocorrelation of Series
+
+    Input:
+        Series: 1-D array of floats, at least 2 values
+
+    Output:
+        float
+    '''
+
+    centered = np.asarray(Series, dtype=float) - np.mean(Series)
+    denominator = np.dot(centered, centered)
+    if denominator == 0.0:
+        return 0.0
+    return float(np.dot(centered[:-1], centered[1:]) / denominator)
+
+def BatchMeans(Series, BatchSize):
+    '''
+    Returns the means of consecutive nonoverlapping batches of 
+    BatchSize values; values after the last full batch are dropped
+
+    Input:
+        Series: 1-D array of floats
+        BatchSize: integer, positive
+
+    Output:
+        numpy array
+    '''
+
+    Series = np.asarray(Series, dtype=float)
+    k = len(Series) // BatchSize
+    return Series[:k * BatchSize].reshape(k, BatchSize).mean(axis=1)
+
+def SelectBatchSize(Series, Alpha=0.05, MinBatches=20):
+    '''
+    Returns the smallest batch size, doubling from 1, for which the
+    lag-1 autocorrelation of the batch means is not significantly
+    positive at level Alpha (approximate test: r1 * sqrt(k) is
+    standard normal under independence, k = number of batches).
+    Stops doubling when fewer than 2 * MinBatches batches would remain
+
+    Input:
+        Series: 1-D array of floats
+        Alpha: float, between 0 and 1
+        MinBatches: integer, positive
+
+    Output:
+        integer, positive
+    '''
+
+    Series = np.asarray(Series, dtype=float)
+    z = NormalQuantile(1.0 - Alpha)
+    BatchSize = 1
+    while len(Series) // (2 * BatchSize) >= MinBatches:
+        Y = BatchMeans(Series, BatchSize)
+        if Lag1Autocorrelation(Y) * math.sqrt(len(Y)) <= z:
+            break
+        BatchSize *= 2
+    return BatchSize
+
+def NormalQuantile(p):
+    '''
+    Returns the p-quantile of the standard normal distribution,
+    found by bisection on math.erf
+
+    Input:
+        p: float, between 0 and 1
+
+    Output:
+        float
+    '''
+
+    lo = -40.0
+    hi = 40.0
+    for i in range(200):
+        mid = 0.5 * (lo + hi)
+        if 0.5 * (1.0 + math.erf(mid / math.sqrt(2.0))) < p:
+            lo = mid
+        else:
+            hi = mid
+    return 0.5 * (lo + hi)
+
+def BatchMeansCI(Series, Alpha=0.05, NumBatches=None, Method="Fixed"):
+    '''
+    Returns the mean of Series and the half-width of a 1-Alpha 
+    batch-means confidence interval for the steady-state mean
+
+    With NumBatches given, the batch size is len(Series) // NumBatches;
+        otherwise it is chosen by SelectBatchSize
+    Method "Fixed" uses nonoverlapping batch means with a t quantile
+        on k - 1 degrees of freedom (k batches); "Overlapping" uses
+        all len(Series) - b + 1 overlapping batches of size b with
+        the overlapping batch means variance estimator and
+        1.5 * (n / b - 1) degrees of freedom
+
+    Input:
+        Series: 1-D array of floats, observations in time order
+        Alpha: float, between 0 and 1
+        NumBatches: integer, at least 2, optional
+        Method: string, "Fixed" or "Overlapping"
+
+    Output:
+        (mean, halfwidth, batchsize): tuple
+    '''
+
+    Series = np.asarray(Series, dtype=float)
+    n = len(Series)
+    if NumBatches is None:
+        BatchSize = SelectBatchSize(Series, Alpha)
+    else:
+        BatchSize = max(1, n // NumBatches)
+
+    if Method == "Overlapping":
+        # Means of all n - b + 1 batches from one cumulative sum
+        csum = np.concatenate(([0.0], np.cumsum(Series)))
+        Y = (csum[BatchSize:] - csum[:-BatchSize]) / BatchSize
+        mean = csum[-1] / n
+        variance = (n * BatchSize / ((n - BatchSize + 1.0) * (n - BatchSize))
+            * np.sum((Y - mean) ** 2))
+        df = 1.5 * (n / BatchSize - 1.0)
+        halfwidth = TQuantile(1.0 - Alpha / 2.0, df) * math.sqrt(variance / n)
+        return float(mean), halfwidth, BatchSize
+
+    Y = BatchMeans(Series, BatchSize)
+    k = len(Y)
+    mean = Y.mean()
+    halfwidth = TQuantile(1.0 - Alpha / 2.0, k - 1) * float(Y.std(ddof=1)) / math.sqrt(k)
+    return float(mean), halfwidth, BatchSize
+
+class ReplicationResults:
+    '''
+    Class of objects for across-replication statistics
+
+    Each row of Data holds one replication and each column one
+        output; an output is the Mean of a DTStat or CTStat
+        (or any object with a Mean method) at the end of the
+        replication, or the value returned by a function
+    Rows are preallocated for NumReps replications and the
+        array doubles in size if more replications are recorded
+
+    Class attributes:
+        InstanceList: list of ReplicationResults objects
+            instantiated in simulation model
+
+    Instance attributes:
+        Names: list of strings, output names
+        Outputs: list of DTStat, CTStat objects or functions
+        Data: numpy array, one row per replication
+        NumberOfReplications: integer, number of rows recorded
+
+    Instance methods:
+        Add
+        Record
+        N
+        Column
+        Mean
+        Variance
+        StdDev
+        HalfWidth
+        CI
+        RelativeError
+        Summary
+        ToCSV
+    '''
+
+    InstanceList = []
+
+    def __init__(self, NumReps, Outputs=None, Names=None):
+        '''
+        Initializes an empty store for NumReps replications
+
+        Input:
+            NumReps: integer, positive, expected number of replications
+            Outputs: list of named DTStat or CTStat objects, optional;
+                if None, every DTStat and CTStat with a Name that
+                exists when the first replication is recorded is used
+            Names: list of strings, optional; if given, the values of
+                each replication are passed to Record by the caller
+                (e.g. a replication runner), and the object is not
+                filled by SimFunctions.EndReplication
+        '''
+
+        self.Names = []
+        self.Outputs = []
+        self.Data = np.full((NumReps, 0), np.nan)
+        self.NumberOfReplications = 0
+        self.AutoRegister = Outputs is None and Names is None
+        if Outputs is not None:
+            for Stat in Outputs:
+                self.Add(Stat.Name, Stat)
+        if Names is not None:
+            for Name in Names:
+                self.Add(Name, None)
+            return
+
+        # Append self to class attribute InstanceList
+        self.__class__.InstanceList.append(self)
+
+    def Add(self, Name, Output):
+        '''
+        Registers an additional output column
+
+        Input:
+            Name: string
+            Output: object with a Mean method (e.g. DTStat, CTStat,
+                FIFOQueue, Resource), or function with no arguments
+        '''
+
+        if self.NumberOfReplications > 0:
+            raise ValueError("outputs must be added before the first replication is recorded")
+        self.Names.append(Name)
+        self.Outputs.append(Output)
+        self.Data = np.full((self.Data.shape[0], len(self.Names)), np.nan)
+
+    def Record(self, Values=None):
+        '''
+        Records the current value of every output as a new replication
+        Typically called through SimFunctions.EndReplication at the
+            end of each replication
+
+        Input:
+            Values: list of floats, optional, one value per output;
+                if None, the values are read from the outputs
+        '''
+
+        if self.AutoRegister:
+            self.AutoRegister = False
+            for Stat in SimClasses.DTStat.InstanceList + SimClasses.CTStat.InstanceList:
+                if Stat.Name is not None and Stat.Name not in self.Names:
+                    self.Add(Stat.Name, Stat)
+
+        if Values is None:
+            Values = [Output.Mean() if hasattr(Output, "Mean") else Output()
+                for Output in self.Outputs]
+
+        if self.NumberOfReplications == self.Data.shape[0]:
+            grown = np.full((max(1, 2 * self.Data.shape[0]), self.Data.shape[1]), np.nan)
+            grown[:self.NumberOfReplications] = self.Data
+            self.Data = grown
+        self.Data[self.NumberOfReplications] = Values
+        self.NumberOfReplications += 1
+
+    def N(self):
+        '''
+        Returns the number of replications recorded
+
+        Output:
+            integer, nonnegative
+        '''
+
+        return self.NumberOfReplications
+
+    def Column(self, Name):
+        '''
+        Returns the recorded values of one output
+
+        Input:
+            Name: string
+
+        Output:
+            numpy array, one value per replication
+        '''
+
+        return self.Data[:self.NumberOfReplications, self.Names.index(Name)]
+
+    def Mean(self):
+        '''
+        Returns the across-replication sample mean of every output
+
+        Output:
+            numpy array, one value per output
+        '''
+
+        return self.Data[:self.NumberOfReplications].mean(axis=0)
+
+    def Variance(self):
+        '''
+        Returns the across-replication sample variance of every output
+
+        Output:
+            numpy array, one value per output
+        '''
+
+        if self.NumberOfReplications < 2:
+            return np.zeros(len(self.Names))
+        return self.Data[:self.NumberOfReplications].var(axis=0, ddof=1)
+
+    def StdDev(self):
+        '''
+        Returns the across-replication sample standard deviation
+            of every output
+
+        Output:
+            numpy array, one value per output
+        '''
+
+        return np.sqrt(self.Variance())
+
+    def HalfWidth(self, Alpha=0.05):
+        '''
+        Returns the half-width of the t-based 1-Alpha confidence
+            interval of every output
+
+        Input:
+            Alpha: float, between 0 and 1
+
+        Output:
+            numpy array, one value per output
+        '''
+
+        n = self.NumberOfReplications
+        if n < 2:
+            return np.full(len(self.Names), np.inf)
+        return TQuantile(1.0 - Alpha / 2.0, n - 1) * np.sqrt(self.Variance() / n)
+
+    def CI(self, Alpha=0.05):
+        '''
+        Returns the t-based 1-Alpha confidence interval of every output
+
+        Input:
+            Alpha: float, between 0 and 1
+
+        Output:
+            (lower, upper): tuple of numpy arrays
+        '''
+
+        mean = self.Mean()
+        halfwidth = self.HalfWidth(Alpha)
+        return mean - halfwidth, mean + halfwidth
+
+    def RelativeError(self, Alpha=0.05):
+        '''
+        Returns the half-width divided by the absolute sample mean
+            of every output (infinite if the mean is 0)
+
+        Input:
+            Alpha: float, between 0 and 1
+
+        Output:
+            numpy array, one value per output
+        '''
+
+        mean = np.abs(self.Mean())
+        halfwidth = self.HalfWidth(Alpha)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(mean > 0.0, halfwidth / mean, np.inf)
+
+    def Summary(self, Alpha=0.05):
+        '''
+        Returns the mean, standard deviation, confidence interval
+            half-width and relative error of every output, computed
+            together from one pass over Data
+
+        Input:
+            Alpha: float, between 0 and 1
+
+        Output:
+            dict mapping each output name to a dict with keys
+                "Mean", "StdDev", "HalfWidth", "RelativeError"
+        '''
+
+        n = self.NumberOfReplications
+        data = self.Data[:n]
+        mean = data.mean(axis=0)
+        if n > 1:
+            stddev = data.std(axis=0, ddof=1)
+            halfwidth = TQuantile(1.0 - Alpha / 2.0, n - 1) * stddev / math.sqrt(n)
+        else:
+            stddev = np.zeros(len(self.Names))
+            halfwidth = np.full(len(self.Names), np.inf)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            relerr = np.where(np.abs(mean) > 0.0, halfwidth / np.abs(mean), np.inf)
+
+        summary = {}
+        for k in range(len(self.Names)):
+            summary[self.Names[k]] = {"Mean": mean[k], "StdDev": stddev[k],
+                "HalfWidth": halfwidth[k], "RelativeError": relerr[k]}
+        return summary
+
+    def ToCSV(self, FileName):
+        '''
+        Writes one row per replication with a header of output names
+
+        Input:
+            FileName: string
+        '''
+
+        n = self.NumberOfReplications
+        table = np.column_stack((np.arange(n), self.Data[:n]))
+        np.savetxt(FileName, table, delimiter=",", header=",".join([""] + self.Names),
+            comments="", fmt=["%d"] + ["%.17g"] * len(self.Names))
+
+def FitSpacing(Spacing, NumReps):
+    '''
+    Returns the Spacing for replications 0, ..., NumReps - 1:
+    SimRNG.SpacingFor(NumReps) if Spacing is "Auto", otherwise
+    Spacing, after checking that the last replication fits in the
+    period of the generator, so that an experiment that is too 
+    large raises ValueError before any replication is run
+
+    Input:
+        Spacing: integer, None or "Auto", see RunReplications
+        NumReps: integer, nonnegative
+
+    Output:
+        integer or None
+    '''
+
+    if Spacing == "Auto":
+        return SimRNG.SpacingFor(NumReps)
+    if Spacing is not None and NumReps > 0:
+        SimRNG.CheckReplication(NumReps - 1, Spacing)
+    return Spacing
+
+def RunBlock(Replication, FirstRep, LastRep, Spacing):
+    '''
+    Runs replications FirstRep, ..., LastRep - 1 in the current
+    process and returns their outputs
+    Used by RunReplications and RunSequential, also in worker processes
+
+    Input:
+        Replication: function, see RunReplications
+        FirstRep: integer, nonnegative
+        LastRep: integer, larger than FirstRep
+        Spacing: integer or None, see RunReplications
+
+    Output:
+        list of lists of floats, one list per replication
+    '''
+
+    rows = []
+    for Rep in range(FirstRep, LastRep):
+        if Spacing is not None:
+            SimRNG.SeedReplication(Rep, Spacing)
+        rows.append(list(Replication(Rep)))
+    return rows
+
+def RunBatch(Results, Replication, NumReps, Pool, Workers, Spacing):
+    '''
+    Runs the next NumReps replications, split in one block per 
+    worker if Pool is not None, and records them in Results in 
+    replication order
+
+    Input:
+        Results: ReplicationResults object
+        Replication: function, see RunReplications
+        NumReps: integer, positive
+        Pool: concurrent.futures.Executor object or None
+        Workers: integer, positive
+        Spacing: integer or None, see RunReplications
+    '''
+
+    first = Results.N()
+    if Pool is None:
+        blocks = [RunBlock(Replication, first, first + NumReps, Spacing)]
+    else:
+        size = -(-NumReps // Workers)
+        starts = range(first, first + NumReps, size)
+        futures = [Pool.submit(RunBlock, Replication, start, 
+            min(start + size, first + NumReps), Spacing) for start in starts]
+        blocks = [future.result() for future in futures]
+    for rows in blocks:
+        for row in rows:
+            Results.Record(row)
+
+def RunReplications(Replication, Names, NumReps, Workers=1, Spacing="Auto"):
+    '''
+    Runs NumReps replications and returns their outputs
+
+    Replication is called as Replication(Rep) for Rep = 0, 1, ...
+        and must run one complete replication (including 
+        SimFunctionsInit) and return the values of the outputs in
+        the order of Names, e.g. [Wait.Mean(), ExcessProb.Mean()]
+    If Workers > 1, replications run in a pool of worker processes,
+        so Replication must be a module-level function of a module
+        that can be imported without running the experiment
+
+    Input:
+        Replication: function
+        Names: list of strings, output names
+        NumReps: integer, positive
+        Workers: integer, positive, number of processes
+        Spacing: integer, None or "Auto"; if not None, the random
+            number streams are set by SimRNG.SeedReplication(Rep,
+            Spacing) before every replication, so results do not 
+            depend on Workers; "Auto" is SimRNG.SpacingFor(NumReps),
+            i.e. SimRNG.REPLICATION_SPACING up to 214 replications,
+            and SimRNG.ReplicationSpacing gives a Spacing that keeps
+            the streams of more replications apart for models that
+            use few streams
+
+    Output:
+        ReplicationResults object
+    '''
+
+    Spacing = FitSpacing(Spacing, NumReps)
+    Results = ReplicationResults(NumReps, Names=Names)
+    if Workers > 1:
+        with concurrent.futures.ProcessPoolExecutor(Workers) as Pool:
+            RunBatch(Results, Replication, NumReps, Pool, Workers, Spacing)
+    else:
+        RunBatch(Results, Replication, NumReps, None, 1, Spacing)
+    return Results
+
+def Converged(Results, RelativeError, HalfWidth, Alpha):
+    '''
+    Returns True if every output meets its relative or absolute
+    half-width target; outputs without a target are ignored, and
+    ValueError is raised if no output has one
+
+    Input:
+        Results: ReplicationResults object
+        RelativeError: float, list of floats (None for no target), or None
+        HalfWidth: float, list of floats (None for no target), or None
+        Alpha: float, between 0 and 1
+
+    Output:
+        Boolean
+    '''
+
+    k = len(Results.Names)
+    relative = RelativeError if isinstance(RelativeError, (list, tuple)) else [RelativeError] * k
+    absolute = HalfWidth if isinstance(HalfWidth, (list, tuple)) else [HalfWidth] * k
+    if all(relative[i] is None and absolute[i] is None for i in range(k)):
+        raise ValueError("no RelativeError or HalfWidth target")
+    halfwidth = Results.HalfWidth(Alpha)
+    relerr = Results.RelativeError(Alpha)
+    for i in range(k):
+        met = relative[i] is None and absolute[i] is None
+        if relative[i] is not None and relerr[i] <= relative[i]:
+            met = True
+        if absolute[i] is not None and halfwidth[i] <= absolute[i]:
+            met = True
+        if not met:
+            return False
+    return True
+
+def RunSequential(Replication, Names, RelativeError=None, HalfWidth=None, Alpha=0.05,
+    BatchSize=100, MinReps=None, MaxReps=100000, Workers=1, Spacing="Auto"):
+    '''
+    Runs replications in batches of BatchSize until the 1-Alpha
+    confidence interval of every output meets its target, or
+    MaxReps replications have been run
+
+    An output meets its target if its relative error (half-width
+        divided by the absolute mean) is at most RelativeError, or
+        its half-width is at most HalfWidth; targets can be one 
+        value for all outputs or a list with one value (or None)
+        per output
+    Replication, Names, Workers and Spacing are as in 
+        RunReplications; with Workers > 1 one pool of worker 
+        processes is kept for all batches; "Auto" gives the Spacing
+        that fits MaxReps replications
+
+    Input:
+        Replication: function
+        Names: list of strings, output names
+        RelativeError: float or list, optional
+        HalfWidth: float or list, optional
+        Alpha: float, between 0 and 1
+        BatchSize: integer, positive, replications between checks
+        MinReps: integer, replications before the first check,
+            default BatchSize
+        MaxReps: integer, positive
+        Workers: integer, positive, number of processes
+        Spacing: integer, None or "Auto"
+
+    Output:
+        ReplicationResults object
+    '''
+
+    if RelativeError is None and HalfWidth is None:
+        raise ValueError("no RelativeError or HalfWidth target")
+    # MaxReps is only an upper bound, so an integer Spacing is 
+    #   checked replication by replication
+    if Spacing == "Auto":
+        Spacing = SimRNG.SpacingFor(MaxReps)
+    if MinReps is None:
+        MinReps = BatchSize
+    Results = ReplicationResults(max(MinReps, BatchSize), Names=Names)
+    Pool = None
+    if Workers > 1:
+        Pool = concurrent.futures.ProcessPoolExecutor(Workers)
+    try:
+        while Results.N() < MaxReps:
+            NumReps = min(max(BatchSize, MinReps - Results.N()), MaxReps - Results.N())
+            RunBatch(Results, Replication, NumReps, Pool, Workers, Spacing)
+            if Results.N() >= MinReps and Converged(Results, RelativeError, HalfWidth, Alpha):
+                break
+    finally:
+        if Pool is not None:
+            Pool.shutdown()
+    return Results
+
+def WarmUpBlock(WarmUp, Spacing, Rep):
+    '''
+    Runs the warm-up of replication Rep and returns its snapshot;
+    used by RunForked, also in worker processes
+
+    Input:
+        WarmUp: function, see RunForked
+        Spacing: integer or None, see RunReplications
+        Rep: integer, nonnegative
+
+    Output:
+        dict returned by SimFunctions.Snapshot
+    '''
+
+    if Spacing is not None:
+        SimRNG.SeedReplication(Rep, Spacing)
+    return WarmUp(Rep)
+
+def ForkBlock(Fork, State, FirstRep, LastRep):
+    '''
+    Runs replications FirstRep, ..., LastRep - 1 forked from State
+    and returns their outputs; used by RunForked, also in worker
+    processes
+
+    Input:
+        Fork: function, see RunForked
+        State: dict returned by SimFunctions.Snapshot
+        FirstRep: integer, nonnegative
+        LastRep: integer, larger than FirstRep
+
+    Output:
+        list of lists of floats, one list per replication
+    '''
+
+    return [list(Fork(State, Rep)) for Rep in range(FirstRep, LastRep)]
+
+def RunForked(WarmUp, Fork, Names, NumWarmUps, ForksPerWarmUp, Workers=1,
+    Spacing="Auto"):
+    '''
+    Runs NumWarmUps independent warm-ups and ForksPerWarmUp
+    replications forked from the snapshot at the end of each one,
+    so the warm-up is simulated NumWarmUps times instead of 
+    NumWarmUps * ForksPerWarmUp times
+
+    WarmUp(Rep) must run the warm-up period of replication Rep
+        (streams set by SimRNG.SeedReplication(Rep, Spacing)) and
+        return SimFunctions.Snapshot of the model; Fork(State, Rep)
+        must restore it with SimFunctions.Restore(State, calendar,
+        Rep=Rep), run the rest of the replication and return the
+        values of the outputs, as Replication in RunReplications
+    Warm-ups use replication numbers 0, ..., NumWarmUps - 1 and
+        forks the numbers after them; Spacing must fit all of them,
+        and "Auto" is SimRNG.SpacingFor(NumWarmUps * (ForksPerWarmUp
+        + 1)), which Fork should then also pass to Restore
+    With Workers > 1, warm-ups and then blocks of forks run in a
+        pool of worker processes, and snapshots are pickled to and
+        from the workers
+
+    Statistical trade-off: forks of one warm-up start from the same
+        state, so their outputs are positively correlated and are
+        not independent replications; only the averages of the forks
+        of different warm-ups are. The first result therefore has
+        one row per warm-up, and its confidence intervals have
+        NumWarmUps - 1 degrees of freedom. Each fork has the
+        distribution of a full replication, so the point estimates
+        are those of NumWarmUps * ForksPerWarmUp replications, but
+        the variance of an average is the variance between warm-ups
+        plus the variance within one divided by ForksPerWarmUp:
+        more forks per warm-up only reduce the second part, so they
+        pay off when the warm-up is long and the variance within a
+        warm-up dominates (compare both parts with the second result)
+
+    Input:
+        WarmUp: function
+        Fork: function
+        Names: list of strings, output names
+        NumWarmUps: integer, at least 2
+        ForksPerWarmUp: integer, positive
+        Workers: integer, positive, number of processes
+        Spacing: integer, None or "Auto", see RunReplications
+
+    Output:
+        (Results, Forks): tuple of ReplicationResults objects, with
+            one row per warm-up (the average of its forks) and one
+            row per fork, in order of warm-up
+    '''
+
+    Spacing = FitSpacing(Spacing, NumWarmUps * (ForksPerWarmUp + 1))
+    Results = ReplicationResults(NumWarmUps, Names=Names)
+    Forks = ReplicationResults(NumWarmUps * ForksPerWarmUp, Names=Names)
+    starts = [NumWarmUps + g * ForksPerWarmUp for g in range(NumWarmUps)]
+    if Workers > 1:
+        with concurrent.futures.ProcessPoolExecutor(Workers) as Pool:
+            States = list(Pool.map(functools.partial(WarmUpBlock, WarmUp, Spacing), range(NumWarmUps)))
+            size = -(-ForksPerWarmUp // Workers)
+            futures = [Pool.submit(ForkBlock, Fork, States[g], first,
+                min(first + size, starts[g] + ForksPerWarmUp))
+                for g in range(NumWarmUps) for first in range(starts[g], starts[g] + ForksPerWarmUp, size)]
+            rows = [row for future in futures for row in future.result()]
+    else:
+        rows = []
+        for g in range(NumWarmUps):
+            State = WarmUpBlock(WarmUp, Spacing, g)
+            rows.extend(ForkBlock(Fork, State, starts[g], starts[g] + ForksPerWarmUp))
+    for row in rows:
+        Forks.Record(row)
+    Groups = Forks.Data[:len(rows)].reshape(NumWarmUps, ForksPerWarmUp, len(Names)).mean(axis=1)
+    for row in Groups:
+        Results.Record(row)
+    return Results, Forks
+
+def ParameterGrid(Grid):
+    '''
+    Returns every combination of the parameter values in Grid,
+    the first parameter varying slowest
+
+    Input:
+        Grid: dict, parameter name -> list of values
+
+    Output:
+        list of dicts, parameter name -> value, one per scenario
+    '''
+
+    Names = list(Grid)
+    return [dict(zip(Names, Values)) for Values in itertools.product(*[Grid[Name] for Name in Names])]
+
+def ScenarioBlock(Setup, Replication, Parameters, FirstRep, LastRep, Spacing):
+    '''
+    Sets up a scenario and runs its replications FirstRep, ...,
+    LastRep - 1; used by RunScenarios, also in worker processes
+
+    Input:
+        Setup: function, see RunScenarios
+        Replication: function, see RunReplications
+        Parameters: dict, parameter name -> value
+        FirstRep: integer, nonnegative
+        LastRep: integer, larger than FirstRep
+        Spacing: integer or None, see RunReplications
+
+    Output:
+        list of lists of floats, one list per replication
+    '''
+
+    Setup(**Parameters)
+    return RunBlock(Replication, FirstRep, LastRep, Spacing)
+
+def RunScenarios(Setup, Replication, Names, Scenarios, NumReps, Workers=1,
+    Spacing="Auto", BlockSize=None):
+    '''
+    Runs NumReps replications of every scenario, e.g. of a
+    ParameterGrid; with Workers > 1 the blocks of replications of
+    all scenarios share one pool of worker processes, which import
+    the model once and are then set up for each block
+
+    Setup(**Parameters) must set the parameters of the model for a
+        scenario (all others taking their default values), and
+        Replication is as in RunReplications; with Workers > 1 both
+        must be module-level functions (or functools.partial of
+        them), and with Workers = 1 the model is left set up for
+        the last scenario
+    Common random numbers: replication Rep of every scenario uses
+        the streams set by SimRNG.SeedReplication(Rep, Spacing), so
+        differences between scenarios are estimated from paired
+        replications (see PairedDifference); how much this reduces
+        their variance depends on how well the model keeps the
+        random numbers of one purpose on one stream
+
+    Input:
+        Setup: function
+        Replication: function
+        Names: list of strings, output names
+        Scenarios: list of dicts, parameter name -> value
+        NumReps: integer, positive, replications per scenario
+        Workers: integer, positive, number of processes
+        Spacing: integer, None or "Auto", see RunReplications
+        BlockSize: integer, positive, replications per task,
+            default NumReps / Workers rounded up
+
+    Output:
+        list of ReplicationResults objects, one per scenario
+    '''
+
+    Spacing = FitSpacing(Spacing, NumReps)
+    if BlockSize is None:
+        BlockSize = -(-NumReps // Workers)
+    Tasks = [(k, first, min(first + BlockSize, NumReps))
+        for k in range(len(Scenarios)) for first in range(0, NumReps, BlockSize)]
+    if Workers > 1:
+        with concurrent.futures.ProcessPoolExecutor(Workers) as Pool:
+            futures = [Pool.submit(ScenarioBlock, Setup, Replication, Scenarios[k], first, last, Spacing)
+                for k, first, last in Tasks]
+            blocks = [future.result() for future in futures]
+    else:
+        blocks = [ScenarioBlock(Setup, Replication, Scenarios[k], first, last, Spacing)
+            for k, first, last in Tasks]
+
+    Results = [ReplicationResults(NumReps, Names=Names) for Parameters in Scenarios]
+    for (k, first, last), rows in zip(Tasks, blocks):
+        for row in rows:
+            Results[k].Record(row)
+    return Results
+
+def PairedDifference(Results, Baseline):
+    '''
+    Returns the differences between the outputs of two scenarios
+    replication by replication; with common random numbers their
+    confidence intervals are usually narrower than those of the
+    difference of two independent means
+
+    Input:
+        Results: ReplicationResults object
+        Baseline: ReplicationResults object, same outputs and
+            number of replications
+
+    Output:
+        ReplicationResults object
+    '''
+
+    n = min(Results.N(), Baseline.N())
+    Difference = ReplicationResults(max(1, n), Names=Results.Names)
+    for row in Results.Data[:n] - Baseline.Data[:n]:
+        Difference.Record(row)
+    return Difference
+
+def ScenariosToCSV(FileName, Scenarios, Results):
+    '''
+    Writes the results of RunScenarios as one tidy table: one row
+    per scenario and replication, with the scenario number, the
+    parameters of the scenario, the replication number and the
+    outputs
+
+    Input:
+        FileName: string
+        Scenarios: list of dicts, parameter name -> value
+        Results: list of ReplicationResults objects, one per scenario
+    '''
+
+    Parameters = list(Scenarios[0]) if Scenarios else []
+    with open(FileName, "w") as f:
+        f.write(",".join(["Scenario"] + Parameters + ["Rep"] + Results[0].Names) + "\n")
+        for k in range(len(Scenarios)):
+            prefix = ["%d" % k] + [str(Scenarios[k][Name]) for Name in Parameters]
+            for Rep in range(Results[k].N()):
+                f.write(",".join(prefix + ["%d" % Rep]
+                    + ["%.17g" % Value for Value in Results[k].Data[Rep]]) + "\n")
+
+async def StreamReplications(Replication, NumReps, FirstRep=0, Workers=1,
+    Spacing="Auto", Pool=None, Ordered=True, InFlight=None):
+    '''
+    Asynchronous generator that runs replications FirstRep, ...,
+    FirstRep + NumReps - 1 in an executor and yields the outputs
+    of each one as it finishes, so the event loop (and anything
+    else running on it) stays responsive during the experiment
+
+    Replication and Spacing are as in RunReplications; "Auto" 
+        gives the Spacing that fits FirstRep + NumReps replications
+    Without Pool, replications run one at a time in a worker thread
+        if Workers is 1 (so Replication may use objects of the main
+        process, e.g. a SimRecords.RecordWriter), or in a pool of
+        Workers processes, shut down when the generator finishes
+    With Ordered True, outputs are yielded in replication order,
+        so a stopping rule sees the same sequence for any number of
+        workers; otherwise they are yielded in order of completion
+    At most InFlight replications are submitted at a time, by
+        default 2 * Workers in a ProcessPoolExecutor and otherwise
+        1, as well as if Spacing is None: replications in threads
+        share the model and the streams of SimRNG with the main
+        process, so none runs while the outputs of another are
+        yielded to the consumers; replications not yet started are
+        cancelled if the generator is closed early
+
+    Input:
+        Replication: function
+        NumReps: integer, positive
+        FirstRep: integer, nonnegative
+        Workers: integer, positive
+        Spacing: integer, None or "Auto"
+        Pool: concurrent.futures.Executor object, optional
+        Ordered: Boolean
+        InFlight: integer, positive, optional
+
+    Output:
+        yields (Rep, Values): tuple of integer and list of floats
+    '''
+
+    # NumReps is only an upper bound when the consumer stops early, so
+    #   an integer Spacing is checked replication by replication
+    if Spacing == "Auto":
+        Spacing = SimRNG.SpacingFor(FirstRep + NumReps)
+    loop = asyncio.get_running_loop()
+    Own = Pool is None
+    if Own:
+        if Workers > 1:
+            Pool = concurrent.futures.ProcessPoolExecutor(Workers)
+        else:
+            Pool = concurrent.futures.ThreadPoolExecutor(1)
+    if InFlight is None:
+        Separate = isinstance(Pool, concurrent.futures.ProcessPoolExecutor)
+        InFlight = 2 * Workers if Separate and Spacing is not None else 1
+    LastRep = FirstRep + NumReps
+    NextRep = FirstRep
+    NextOut = FirstRep
+    Pending = {}
+    Finished = {}
+    try:
+        while Pending or NextRep < LastRep:
+            while NextRep < LastRep and len(Pending) < InFlight:
+                future = loop.run_in_executor(Pool, RunBlock, Replication, NextRep, NextRep + 1, Spacing)
+                Pending[future] = NextRep
+                NextRep += 1
+            Done, NotDone = await asyncio.wait(Pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in Done:
+                Rep = Pending.pop(future)
+                if Ordered:
+                    Finished[Rep] = future.result()[0]
+                else:
+                    yield Rep, future.result()[0]
+            while NextOut in Finished:
+                yield NextOut, Finished.pop(NextOut)
+                NextOut += 1
+    finally:
+        for future in Pending:
+            future.cancel()
+        if Own:
+            Pool.shutdown(wait=True, cancel_futures=True)
+
+async def RunStreaming(Replication, Names, NumReps, Consumers=(), FirstRep=0, Workers=1,
+    Spacing="Auto", Pool=None, Ordered=True,
+    Checkpoint=None, CheckpointEvery=100, Resume=False):
+    '''
+    Runs up to NumReps replications through StreamReplications,
+    records each one in a ReplicationResults object as it
+    finishes and then calls every consumer with it; stops early
+    as soon as a consumer returns True
+    Run from synchronous code with asyncio.run(RunStreaming(...))
+
+    Consumers are called as Consumer(Results, Rep, Values) and
+        may be functions or coroutine functions (async def); the
+        ones returned by PrintProgress, StopWhenConverged and
+        AppendCSV cover live confidence intervals, sequential
+        stopping and incremental output
+
+    With Checkpoint, the results so far and the SimRNG streams are
+        saved to file Checkpoint (see SaveCheckpoint) after every
+        CheckpointEvery replications and when the run ends, after
+        the consumers have been called; with Resume, a run that was
+        interrupted continues from its last checkpoint (if the file
+        exists) and gives the same results, bit for bit, as a run
+        that was never interrupted, provided the model and its
+        parameters are unchanged; a run that had ended is not
+        continued. Checkpoints need Ordered replications
+
+    Input:
+        Replication: function, see RunReplications
+        Names: list of strings, output names
+        NumReps: integer, positive, largest number of replications
+        Consumers: list of functions or coroutine functions
+        FirstRep, Workers, Spacing, Pool, Ordered: see StreamReplications
+        Checkpoint: string, file name, optional
+        CheckpointEvery: integer, positive
+        Resume: Boolean
+
+    Output:
+        ReplicationResults object
+    '''
+
+    if Checkpoint is not None and not Ordered:
+        raise ValueError("checkpoints need Ordered replications")
+    Results = None
+    if Resume and Checkpoint is not None and os.path.exists(Checkpoint):
+        Results, NextRep, Ended = LoadCheckpoint(Checkpoint)
+        if Results.Names != list(Names) or NextRep != FirstRep + Results.N():
+            raise ValueError("checkpoint {} is from a different experiment".format(Checkpoint))
+        if Ended:
+            return Results
+    if Results is None:
+        Results = ReplicationResults(NumReps, Names=Names)
+    Done = Results.N()
+    Stream = StreamReplications(Replication, max(0, NumReps - Done), FirstRep + Done,
+        Workers, Spacing, Pool, Ordered)
+    Stop = False
+    async with contextlib.aclosing(Stream):
+        async for Rep, Values in Stream:
+            Results.Record(Values)
+            for Consumer in Consumers:
+                Outcome = Consumer(Results, Rep, Values)
+                if inspect.isawaitable(Outcome):
+                    Outcome = await Outcome
+                Stop = Stop or Outcome is True
+            if Stop:
+                break
+            if Checkpoint is not None and Results.N() % CheckpointEvery == 0:
+                SaveCheckpoint(Checkpoint, Results, Rep + 1)
+    if Checkpoint is not None:
+        SaveCheckpoint(Checkpoint, Results, FirstRep + Results.N(), Ended=True)
+    return Results
+
+def PrintProgress(Every=100, Alpha=0.05, File=None):
+    '''
+    Returns a consumer for RunStreaming that prints the number of
+    replications and the 1-Alpha confidence interval of every
+    output after every Every replications
+
+    Input:
+        Every: integer, positive
+        Alpha: float, between 0 and 1
+        File: file object, default sys.stdout
+
+    Output:
+        coroutine function
+    '''
+
+    async def Consumer(Results, Rep, Values):
+        if Results.N() % Every == 0:
+            mean = Results.Mean()
+            halfwidth = Results.HalfWidth(Alpha)
+            print("{:>8}  ".format(Results.N()) + "  ".join("{} {:.6g} pm {:.3g}".format(
+                Results.Names[k], mean[k], halfwidth[k]) for k in range(len(Results.Names))),
+                file=File, flush=True)
+    return Consumer
+
+def StopWhenConverged(RelativeError=None, HalfWidth=None, Alpha=0.05, Every=100, MinReps=None):
+    '''
+    Returns a consumer for RunStreaming that stops the experiment
+    when the targets of RunSequential are met, checked after every
+    Every replications once MinReps (default Every) have been run;
+    with Ordered replications and the same Every, the experiment
+    stops at the same replication as RunSequential with
+    BatchSize = Every
+
+    Input:
+        RelativeError: float or list, optional
+        HalfWidth: float or list, optional
+        Alpha: float, between 0 and 1
+        Every: integer, positive
+        MinReps: integer, optional
+
+    Output:
+        coroutine function
+    '''
+
+    if RelativeError is None and HalfWidth is None:
+        raise ValueError("no RelativeError or HalfWidth target")
+    if MinReps is None:
+        MinReps = Every
+    async def Consumer(Results, Rep, Values):
+        n = Results.N()
+        return (n >= MinReps and (n - MinReps) % Every == 0
+            and Converged(Results, RelativeError, HalfWidth, Alpha))
+    return Consumer
+
+def AppendCSV(FileName):
+    '''
+    Returns a consumer for RunStreaming that writes the header and
+    then one row per replication to FileName as the replications
+    finish, in the format of ReplicationResults.ToCSV; every row
+    is on disk when the consumer returns, so the file is complete
+    up to the last finished replication if the run is interrupted
+
+    Input:
+        FileName: string
+
+    Output:
+        coroutine function
+    '''
+
+    Started = []
+    async def Consumer(Results, Rep, Values):
+        with open(FileName, "a" if Started else "w") as f:
+            if not Started:
+                # a resumed run starts the file with the earlier replications
+                f.write(",".join([""] + Results.Names) + "\n")
+                n = Results.N()
+                for k in range(n - 1):
+                    f.write(",".join(["%d" % (Rep - n + 1 + k)]
+                        + ["%.17g" % Value for Value in Results.Data[k]]) + "\n")
+                Started.append(True)
+            f.write(",".join(["%d" % Rep] + ["%.17g" % Value for Value in Values]) + "\n")
+    return Consumer
+
+# Layout of the files written by SaveCheckpoint
+CHECKPOINT_VERSION = 1
+
+def SaveCheckpoint(FileName, Results, NextRep, Ended=False):
+    '''
+    Saves the recorded replications of Results, the number of the
+    next replication and the seeds of the SimRNG streams in the
+    binary (.npz) file FileName; the file is written under a
+    temporary name, flushed to disk and then renamed, so that an
+    interruption at any time leaves the previous checkpoint intact
+
+    Input:
+        FileName: string
+        Results: ReplicationResults object
+        NextRep: integer, nonnegative
+        Ended: Boolean, True if the run has ended
+    '''
+
+    Temp = "{}.{}.tmp".format(FileName, os.getpid())
+    with open(Temp, "wb") as f:
+        np.savez(f, version=CHECKPOINT_VERSION, names=np.array(Results.Names, dtype=str),
+            data=Results.Data[:Results.N()], nextrep=NextRep, ended=Ended,
+            zrng=np.array(SimRNG.ZRNG, dtype=np.int64))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(Temp, FileName)
+
+def LoadCheckpoint(FileName):
+    '''
+    Reads a file written by SaveCheckpoint and restores the seeds
+    of the SimRNG streams
+
+    Input:
+        FileName: string
+
+    Output:
+        (Results, NextRep, Ended): tuple of ReplicationResults
+            object, integer and Boolean
+    '''
+
+    with np.load(FileName) as Data:
+        if int(Data["version"]) != CHECKPOINT_VERSION:
+            raise ValueError("checkpoint {} has an unknown version".format(FileName))
+        Values = Data["data"]
+        Results = ReplicationResults(max(1, len(Values)), Names=[str(Name) for Name in Data["names"]])
+        Results.Data[:len(Values)] = Values
+        Results.NumberOfReplications = len(Values)
+        SimRNG.ZRNG[:] = [int(z) for z in Data["zrng"]]
+        return Results, int(Data["nextrep"]), bool(Data["ended"])
\ No newline at end of file
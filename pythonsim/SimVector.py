@@ -0,0 +1,301 @@
+###############################################################
+
+# Contains vectorized simulation engines that replace the event
+#   loop (EventCalendar, FIFOQueue, Resource) for special model
+#   structures, working on whole replications as numpy arrays,
+#   with one row per replication:
+#   Lindley and SingleServerFIFO for a single-server FIFO queue,
+#   KieferWolfowitz and MultiServerFIFO for a c-server FIFO queue,
+#   GenerateArrivals, OccupancyPath and InfiniteServer for
+#   infinite-server (M/G/infinity) models.
+
+# Input arrays come from the SimRNG Block generators, so a row
+#   uses the same random numbers as an event-driven replication
+#   that draws the same number of variates from the same streams.
+
+###############################################################
+
+import numpy as np
+
+def Lindley(Interarrival, Service):
+    '''
+    Returns the waiting times in queue of customers 0, ..., n-1 at a
+    single-server FIFO queue that starts empty, from the Lindley
+    recursion W[i] = max(0, W[i-1] + Service[i-1] - Interarrival[i])
+
+    With X[i] = Service[i-1] - Interarrival[i] and C its cumulative
+    sum (C[0] = 0), the recursion is W = C - running minimum of C,
+    so it is computed with two ufunc accumulations along the last axis
+
+    Input:
+        Interarrival: array, shape (..., n), Interarrival[..., i] is
+            the time between the arrivals of customers i-1 and i
+            (Interarrival[..., 0] is not used)
+        Service: array, shape (..., n), service times
+
+    Output:
+        numpy array, shape (..., n), waiting times in queue
+    '''
+
+    Interarrival = np.asarray(Interarrival, dtype=float)
+    Service = np.asarray(Service, dtype=float)
+    X = np.zeros(np.broadcast(Interarrival, Service).shape)
+    X[..., 1:] = Service[..., :-1] - Interarrival[..., 1:]
+    C = np.cumsum(X, axis=-1)
+    return C - np.minimum.accumulate(C, axis=-1)
+
+def DTStatColumns(Values):
+    '''
+    Returns what DTStat.Mean, StdDev, N, Max and Min would give
+    after recording Values[..., 0], Values[..., 1], ... , for every
+    row of Values at once
+
+    Input:
+        Values: array, shape (..., n)
+
+    Output:
+        dict of numpy arrays with keys "Mean", "StdDev", "N", "Max", "Min"
+    '''
+
+    Values = np.asarray(Values, dtype=float)
+    n = Values.shape[-1]
+    Sum = Values.sum(axis=-1)
+    SumOfSquares = np.einsum("...i,...i->...", Values, Values)
+    columns = {"N": np.full(Sum.shape, float(n))}
+    columns["Mean"] = Sum / n if n > 0 else np.zeros(Sum.shape)
+    if n > 1:
+        columns["StdDev"] = np.sqrt(np.maximum(SumOfSquares - Sum ** 2 / n, 0.0) / (n - 1))
+    else:
+        columns["StdDev"] = np.zeros(Sum.shape)
+    columns["Max"] = Values.max(axis=-1) if n > 0 else np.full(Sum.shape, -np.inf)
+    columns["Min"] = Values.min(axis=-1) if n > 0 else np.full(Sum.shape, np.inf)
+    return columns
+
+def FillDTStat(Stat, Values):
+    '''
+    Sets Stat as if every value of Values had been recorded after a
+    Clear, e.g. to compare a vectorized replication with an
+    event-driven one
+
+    Input:
+        Stat: SimClasses.DTStat object
+        Values: 1-D array of floats
+    '''
+
+    Values = np.asarray(Values, dtype=float)
+    Stat.Clear()
+    Stat.Sum = float(Values.sum())
+    Stat.SumOfSquares = float(np.dot(Values, Values))
+    Stat.NumberOfObservations = float(len(Values))
+    if len(Values) > 0:
+        Stat.Max = max(Stat.Max, float(Values.max()))
+        Stat.Min = min(Stat.Min, float(Values.min()))
+
+def SingleServerFIFO(NumReps, NumCustomers, Interarrival, Service, WarmUp=0, BlockReps=None):
+    '''
+    Simulates NumReps replications of a single-server FIFO queue that
+    starts empty, each with NumCustomers customers, and returns the
+    DTStat outputs of the waiting times in queue of customers
+    WarmUp, ..., NumCustomers-1 of every replication
+
+    Interarrival and Service are functions of an array shape that
+        return arrays of variates, e.g.
+        lambda Size: SimRNG.ExponBlock(1.0, 1, Size)
+    Replications are simulated BlockReps at a time to bound memory;
+        because rows are filled in order, the results do not depend
+        on BlockReps
+
+    Input:
+        NumReps: integer, positive
+        NumCustomers: integer, positive
+        Interarrival: function
+        Service: function
+        WarmUp: integer, nonnegative, customers deleted per replication
+        BlockReps: integer, positive, optional
+
+    Output:
+        dict of numpy arrays, one value per replication, with keys
+            "Mean", "StdDev", "N", "Max", "Min" (see DTStatColumns)
+    '''
+
+    if BlockReps is None:
+        BlockReps = max(1, 2 ** 22 // NumCustomers)
+    blocks = []
+    for first in range(0, NumReps, BlockReps):
+        rows = min(BlockReps, NumReps - first)
+        A = Interarrival((rows, NumCustomers))
+        S = Service((rows, NumCustomers))
+        blocks.append(DTStatColumns(Lindley(A, S)[:, WarmUp:]))
+    return {key: np.concatenate([block[key] for block in blocks]) for key in blocks[0]}
+
+def KieferWolfowitz(Interarrival, Service, NumServers):
+    '''
+    Returns the waiting times in queue of customers 0, ..., n-1 at a
+    FIFO queue with NumServers identical servers that starts empty,
+    from the Kiefer-Wolfowitz recursion on the sorted workload vector
+    V (the remaining work of each server at an arrival, ascending):
+        W[i] = V[0]
+        V = sort(V + Service[i] e_0)
+        V = max(V - Interarrival[i+1], 0)
+    All rows are advanced together, one customer at a time, so the
+    work per customer is a few array operations of shape (..., NumServers)
+    With NumServers = 1 this is the Lindley recursion
+
+    Input:
+        Interarrival: array, shape (..., n), Interarrival[..., i] is
+            the time between the arrivals of customers i-1 and i
+            (Interarrival[..., 0] is not used; inf means no arrival)
+        Service: array, shape (..., n), service times
+        NumServers: integer, positive
+
+    Output:
+        numpy array, shape (..., n), waiting times in queue
+    '''
+
+    Interarrival = np.asarray(Interarrival, dtype=float)
+    Service = np.asarray(Service, dtype=float)
+    shape = np.broadcast(Interarrival, Service).shape
+    Interarrival = np.broadcast_to(Interarrival, shape)
+    Service = np.broadcast_to(Service, shape)
+    n = shape[-1]
+    W = np.empty(shape)
+    V = np.zeros(shape[:-1] + (NumServers,))
+    for i in range(n):
+        W[..., i] = V[..., 0]
+        V[..., 0] += Service[..., i]
+        V.sort(axis=-1)
+        if i + 1 < n:
+            np.maximum(V - Interarrival[..., i + 1, None], 0.0, out=V)
+    return W
+
+def MultiServerFIFO(NumReps, NumCustomers, NumServers, Interarrival, Service, WarmUp=0, BlockReps=None):
+    '''
+    Simulates NumReps replications of a FIFO queue with NumServers
+    servers that starts empty, each with NumCustomers customers, and
+    returns the DTStat outputs of the waiting times in queue of
+    customers WarmUp, ..., NumCustomers-1 of every replication
+
+    Interarrival, Service and BlockReps are as in SingleServerFIFO
+
+    Input:
+        NumReps: integer, positive
+        NumCustomers: integer, positive
+        NumServers: integer, positive
+        Interarrival: function
+        Service: function
+        WarmUp: integer, nonnegative, customers deleted per replication
+        BlockReps: integer, positive, optional
+
+    Output:
+        dict of numpy arrays, one value per replication, with keys
+            "Mean", "StdDev", "N", "Max", "Min" (see DTStatColumns)
+    '''
+
+    if BlockReps is None:
+        BlockReps = max(1, 2 ** 22 // NumCustomers)
+    blocks = []
+    for first in range(0, NumReps, BlockReps):
+        rows = min(BlockReps, NumReps - first)
+        A = Interarrival((rows, NumCustomers))
+        S = Service((rows, NumCustomers))
+        blocks.append(DTStatColumns(KieferWolfowitz(A, S, NumServers)[:, WarmUp:]))
+    return {key: np.concatenate([block[key] for block in blocks]) for key in blocks[0]}
+
+def GenerateArrivals(NumReps, RunLength, Interarrival):
+    '''
+    Returns the arrival times before RunLength of NumReps replications,
+    generated for all replications at once, one arrival at a time
+
+    Interarrival is called as Interarrival(Now), where Now is the 
+        array of current arrival times (0.0 at the start), and must
+        return the array of times until the next arrival, e.g.
+        lambda Now: SimRNG.ExponBlock(1.0, Seeds, 1)[:, 0]
+        with Seeds from SimRNG.SeedBlock; the mean may depend on Now
+        for time-varying arrival rates
+
+    Input:
+        NumReps: integer, positive
+        RunLength: float, positive
+        Interarrival: function
+
+    Output:
+        numpy array, shape (NumReps, largest number of arrivals),
+            each row sorted, padded with inf after its last arrival
+    '''
+
+    Now = np.zeros(NumReps)
+    columns = []
+    while True:
+        Now = Now + Interarrival(Now)
+        if not np.any(Now < RunLength):
+            break
+        columns.append(np.where(Now < RunLength, Now, np.inf))
+    if len(columns) == 0:
+        return np.full((NumReps, 0), np.inf)
+    return np.column_stack(columns)
+
+def OccupancyPath(Arrivals, Sojourns):
+    '''
+    Returns the number in an infinite-server system over time: the
+    arrival and departure times of every row are merged and sorted,
+    and the occupancy after each of them is a cumulative sum of +1
+    (arrival) and -1 (departure)
+
+    Input:
+        Arrivals: array, shape (reps, n), arrival times (inf for none)
+        Sojourns: array, shape (reps, n), time in system of each arrival
+
+    Output:
+        (times, occupancy): numpy arrays, shape (reps, 2n), times of
+            the arrivals and departures in increasing order and the 
+            number in system right after each of them
+    '''
+
+    Arrivals = np.asarray(Arrivals, dtype=float)
+    times = np.concatenate((Arrivals, Arrivals + Sojourns), axis=-1)
+    changes = np.concatenate((np.ones(Arrivals.shape), -np.ones(Arrivals.shape)), axis=-1)
+    order = np.argsort(times, axis=-1, kind="stable")
+    times = np.take_along_axis(times, order, axis=-1)
+    occupancy = np.cumsum(np.take_along_axis(changes, order, axis=-1), axis=-1)
+    return times, occupancy
+
+def InfiniteServer(Arrivals, Sojourns, RunLength):
+    '''
+    Simulates replications of an infinite-server system that starts 
+    empty over [0, RunLength], from the arrival times and sojourn
+    times of every replication (one row each)
+
+    Input:
+        Arrivals: array, shape (reps, n), see GenerateArrivals
+        Sojourns: array, shape (reps, n)
+        RunLength: float, positive
+
+    Output:
+        dict of numpy arrays, one value per replication:
+            "MaxOccupancy": largest number in system
+            "TimeAverage": time-average number in system
+            "TimeSpent": mean sojourn of the departures before RunLength
+            "NumArrivals": number of arrivals
+            "NumInSystem": number in system at RunLength
+    '''
+
+    Arrivals = np.asarray(Arrivals, dtype=float)
+    Sojourns = np.asarray(Sojourns, dtype=float)
+    times, occupancy = OccupancyPath(Arrivals, Sojourns)
+
+    # Area under the occupancy path up to RunLength
+    clipped = np.minimum(times, RunLength)
+    durations = np.diff(clipped, axis=-1, append=RunLength)
+    inside = times < RunLength
+    area = np.sum(np.where(inside, occupancy * durations, 0.0), axis=-1)
+
+    departed = Arrivals + Sojourns < RunLength
+    numdeparted = departed.sum(axis=-1)
+    timespent = np.where(departed, Sojourns, 0.0).sum(axis=-1) / np.maximum(numdeparted, 1)
+
+    numarrivals = np.isfinite(Arrivals).sum(axis=-1)
+    return {"MaxOccupancy": np.max(np.where(inside, occupancy, 0.0), axis=-1, initial=0.0),
+        "TimeAverage": area / RunLength,
+        "TimeSpent": timespent,
+        "NumArrivals": numarrivals,
+        "NumInSystem": numarrivals - numdeparted}
\ No newline at end of file
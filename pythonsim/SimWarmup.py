@@ -0,0 +1,147 @@
+###############################################################
+
+# Contains functions for choosing the warm-up (truncation)
+#   period of a steady-state simulation from the batched
+#   trajectories recorded by SimClasses.Trajectory:
+#   MSER (the marginal standard error rule, MSER-5 with
+#   batches of 5), Welch's moving-average procedure, and
+#   Recommend, which applies both.
+
+# Typical use: run a few pilot replications without clearing
+#   statistics, then call Recommend on the Trajectory.
+
+###############################################################
+
+import numpy as np
+
+def Ensemble(TheTrajectory):
+    '''
+    Returns the trajectories of all replications as a 2-D array
+    Batches that were not reached (e.g. because the replication
+    ended first) are NaN; with NumBatches None (e.g. the Path of
+    CTStat.KeepTrajectory) there is one column per batch of the
+    longest replication
+
+    Input:
+        TheTrajectory: SimClasses.Trajectory object
+
+    Output:
+        numpy array, one row per replication, one column per batch
+    '''
+
+    NumBatches = TheTrajectory.NumBatches
+    if NumBatches is None:
+        NumBatches = max([len(row) for row in TheTrajectory.Data], default=0)
+    Data = np.full((len(TheTrajectory.Data), NumBatches), np.nan)
+    for i in range(len(TheTrajectory.Data)):
+        row = TheTrajectory.Data[i]
+        Data[i, :len(row)] = row
+    return Data
+
+def MSER(Series, BatchSize=5):
+    '''
+    Returns the truncation point, in number of values of Series,
+    that minimizes the marginal standard error statistic
+        MSER(d) = sum_{i>d} (Y_i - mean_d)^2 / (m - d)^2
+    of the means Y_1, ..., Y_m of batches of BatchSize values,
+    searched over the first half of the batches (MSER-5 for
+    BatchSize 5). NaN values are dropped.
+
+    Input:
+        Series: 1-D array of floats
+        BatchSize: integer, positive
+
+    Output:
+        integer, nonnegative
+    '''
+
+    Series = np.asarray(Series, dtype=float)
+    Series = Series[~np.isnan(Series)]
+    m = len(Series) // BatchSize
+    if m < 2:
+        return 0
+    Y = Series[:m * BatchSize].reshape(m, BatchSize).mean(axis=1)
+
+    # Sums over Y_{d+1}, ..., Y_m for every d at once
+    S1 = np.cumsum(Y[::-1])[::-1]
+    S2 = np.cumsum((Y * Y)[::-1])[::-1]
+    count = np.arange(m, 0, -1)
+    mser = (S2 - S1 * S1 / count) / (count * count)
+    d = int(np.argmin(mser[:m // 2 + 1]))
+    return d * BatchSize
+
+def MovingAverage(Series, Window):
+    '''
+    Returns Welch's moving average of Series with the given Window:
+    value i averages Series[i-w], ..., Series[i+w] with w = min(i, Window)
+
+    Input:
+        Series: 1-D array of floats
+        Window: integer, nonnegative
+
+    Output:
+        numpy array of length len(Series) - Window
+    '''
+
+    Series = np.asarray(Series, dtype=float)
+    n = len(Series) - Window
+    csum = np.concatenate(([0.0], np.cumsum(Series)))
+    i = np.arange(n)
+    w = np.minimum(i, Window)
+    return (csum[i + w + 1] - csum[i - w]) / (2 * w + 1)
+
+def Welch(Data, Window, Tolerance=0.05):
+    '''
+    Returns the truncation point, in number of batches, chosen by
+    Welch's procedure: the replications are averaged batch by
+    batch, smoothed by MovingAverage, and the truncation point is
+    the first batch after which the moving average stays within a
+    band around its mean over the second half of the run; the band
+    is the larger of Tolerance times the largest deviation from that
+    mean and three standard deviations of the second half, and the
+    search is limited to the first half of the run
+
+    Input:
+        Data: 2-D array, one row per replication (see Ensemble)
+        Window: integer, nonnegative
+        Tolerance: float, between 0 and 1
+
+    Output:
+        integer, nonnegative
+    '''
+
+    Data = np.atleast_2d(Data)
+    average = np.nanmean(Data[:, ~np.all(np.isnan(Data), axis=0)], axis=0)
+    smooth = MovingAverage(average, Window)
+    half = len(smooth) // 2
+    deviation = np.abs(smooth - smooth[half:].mean())
+    band = max(Tolerance * deviation.max(), 3.0 * smooth[half:].std())
+    outside = np.nonzero(deviation[:half] > band)[0]
+    if len(outside) == 0:
+        return 0
+    return int(outside[-1]) + 1
+
+def Recommend(TheTrajectory, Window=None, Tolerance=0.05, BatchSize=5):
+    '''
+    Applies MSER (to the across-replication average trajectory)
+    and Welch's procedure to TheTrajectory and returns both
+    truncation points in simulation time, together with their
+    maximum as the recommended warm-up period
+
+    Input:
+        TheTrajectory: SimClasses.Trajectory object
+        Window: integer, Welch window, default 1/20 of the batches
+        Tolerance: float, between 0 and 1, see Welch
+        BatchSize: integer, positive, see MSER
+
+    Output:
+        dict with keys "MSER", "Welch", "WarmUp", all floats
+    '''
+
+    Data = Ensemble(TheTrajectory)
+    Data = Data[:, ~np.all(np.isnan(Data), axis=0)]
+    if Window is None:
+        Window = max(1, Data.shape[1] // 20)
+    mser = MSER(np.nanmean(Data, axis=0), BatchSize) * TheTrajectory.BatchWidth
+    welch = Welch(Data, Window, Tolerance) * TheTrajectory.BatchWidth
+    return {"MSER": mser, "Welch": welch, "WarmUp": max(mser, welch)}
@@ -0,0 +1,42 @@
+###############################################################
+
+# PythonSim: discrete-event simulation library used by the
+#   models in Lab3, hw3 and Project1-3.
+
+#   SimClasses: Clock, statistics, entities, event calendar,
+#       queues and resources
+#   SimFunctions: replication set-up, scheduling and run loop
+#   SimProcess: process interaction, entities as generators
+#   SimRNG: random-number streams and variate generators
+#   SimResults: across-replication results and runners
+#   SimRecords: columnar binary storage of per-record outputs
+#   SimInput: cached input data, distribution fitting and NHPP rates
+#   SimWarmup: warm-up (truncation) analysis
+#   SimVector: vectorized engines for special model structures
+#   SimCompiled: array-based core that can be compiled with numba
+
+# SimClasses, SimFunctions, SimProcess and SimRNG need only the
+#   standard library and load in milliseconds; numpy is imported
+#   by the other modules, and by the Block generators of SimRNG
+#   when they are first called. Submodules are loaded on first use,
+#   so "import pythonsim" costs nothing, and e.g.
+#   pythonsim.SimRNG imports SimRNG the first time it is used.
+
+# Typical use in a model script:
+#   from pythonsim import SimClasses, SimFunctions, SimRNG
+
+###############################################################
+
+import importlib
+
+__all__ = ["SimClasses", "SimFunctions", "SimProcess", "SimRNG", "SimResults",
+    "SimRecords", "SimInput", "SimWarmup", "SimVector", "SimCompiled"]
+
+def __getattr__(name):
+    '''
+    Imports submodule name of __all__ on first access
+    '''
+
+    if name in __all__:
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
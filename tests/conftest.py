@@ -0,0 +1,26 @@
+# Tests of the pythonsim package and of the models built on it:
+#   python -m pytest -q (from the top of the repository)
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, ROOT)
+
+from pythonsim import SimClasses
+from pythonsim import SimFunctions
+
+@pytest.fixture
+def Calendar():
+    # a calendar with the clock at 0; model objects made by the test
+    #   are dropped from the InstanceLists afterwards
+    Lists = [Class.InstanceList for Class in (SimClasses.FIFOQueue, SimClasses.Resource,
+        SimClasses.EntityTable, SimClasses.DTStat, SimClasses.CTStat, SimClasses.Trajectory)]
+    Lengths = [len(List) for List in Lists]
+    calendar = SimClasses.EventCalendar()
+    SimFunctions.SimFunctionsInit(calendar)
+    yield calendar
+    for List, n in zip(Lists, Lengths):
+        del List[n:]
+    SimClasses.Clock = 0.0
@@ -0,0 +1,200 @@
+import pytest
+
+from pythonsim import SimClasses
+from pythonsim import SimFunctions
+
+def RunUntilEmpty(calendar, Handler):
+    # removes events in time order, calling Handler for every event
+    #   that is not an internal one
+    while calendar.N() > 0:
+        Event = calendar.Remove()
+        if Event is None:
+            break
+        SimClasses.Clock = Event.EventTime
+        Handler(Event)
+
+###############################################################
+
+# EventCalendar
+
+###############################################################
+
+def Notice(EventType, EventTime):
+    Event = SimClasses.EventNotice()
+    Event.EventType = EventType
+    Event.EventTime = EventTime
+    return Event
+
+def test_EventCalendar_breaks_ties_in_scheduling_order():
+    Calendar = SimClasses.EventCalendar()
+    for EventType, EventTime in [("a", 2.0), ("b", 1.0), ("c", 2.0), ("d", 1.0), ("e", 2.0)]:
+        Calendar.Schedule(Notice(EventType, EventTime))
+    Order = [Calendar.Remove().EventType for i in range(5)]
+    assert Order == ["b", "d", "a", "c", "e"]
+    assert Calendar.N() == 0 and Calendar.Remove() is None
+
+def test_EventCalendar_N_counts_cancelled_until_discarded():
+    Calendar = SimClasses.EventCalendar()
+    Events = [Notice(i, float(i)) for i in range(4)]
+    for Event in Events:
+        Calendar.Schedule(Event)
+    Calendar.Cancel(Events[0])
+    Calendar.Cancel(Events[2])
+    assert Calendar.N() == 4
+    # the first removal discards the cancelled notice ahead of it
+    assert Calendar.Remove() is Events[1]
+    assert Calendar.N() == 2
+    assert Calendar.Remove() is Events[3]
+    assert Calendar.N() == 0
+
+def test_EventCalendar_Remove_returns_None_when_only_cancelled_remain():
+    Calendar = SimClasses.EventCalendar()
+    Events = [Notice("Arrival", 1.0), Notice("Arrival", 1.0), Notice("End", 3.0)]
+    for Event in Events:
+        Calendar.Schedule(Event)
+        Calendar.Cancel(Event)
+    assert Calendar.N() == 3
+    assert Calendar.Remove() is None
+    assert Calendar.N() == 0
+
+def test_EventCalendar_runs_internal_events(Calendar):
+    Ran = []
+    Internal = Notice("Internal", 2.0)
+    Internal.Handler = lambda Event: Ran.append(SimClasses.Clock)
+    Calendar.Schedule(Internal)
+    Calendar.Schedule(Notice("Outside", 5.0))
+    assert Calendar.Remove().EventType == "Outside"
+    assert Ran == [2.0]
+
+###############################################################
+
+# EntityTable
+
+###############################################################
+
+def test_EntityTable_reuses_freed_ids(Calendar):
+    Table = SimClasses.EntityTable({"CreateTime": "d", "Type": "q"}, Capacity=2)
+    SimClasses.Clock = 3.5
+    a, b = Table.New(), Table.New()
+    assert (a, b) == (0, 1)
+    assert Table.CreateTime[a] == 3.5
+    c = Table.New()
+    assert c == 2 and Table.Capacity == 4
+    Table.Type[c] = 7
+    Table.Free(a)
+    assert Table.New() == a
+    assert Table.N() == 3
+    Table.Clear()
+    assert Table.N() == 0
+    assert sorted(Table.New() for i in range(4)) == [0, 1, 2, 3]
+
+###############################################################
+
+# Preemption, with Entity objects and EntityTable ids
+
+###############################################################
+
+def MakeEntity(Kind):
+    if Kind == "Entity":
+        return SimClasses.Entity()
+    return SimClasses.EntityTable.InstanceList[-1].New()
+
+@pytest.mark.parametrize("Kind", ["Entity", "EntityTable"])
+@pytest.mark.parametrize("Mode, LowFinish", [("Resume", 13.0), ("Repeat", 17.0)])
+def test_SeizeEntity_preempts_lower_priority(Calendar, Kind, Mode, LowFinish):
+    SimClasses.EntityTable()
+    Server = SimClasses.Resource()
+    Server.SetUnits(1)
+    Queue = SimClasses.FIFOQueue()
+    Server.SetPreemption(Mode, Queue)
+    Low, High = MakeEntity(Kind), MakeEntity(Kind)
+    assert Server.SeizeEntity(Calendar, Low, "EndOfService", 10.0, Priority=5)
+    SimClasses.Clock = 4.0
+    assert Server.SeizeEntity(Calendar, High, "EndOfService", 3.0, Priority=1)
+    assert Queue.ThisQueue == [Low]
+
+    Finished = {}
+    def EndOfService(Event):
+        Finished[Event.WhichObject is Low] = SimClasses.Clock
+        Server.FreeEntity(Event.WhichObject)
+        if Queue.NumQueue() > 0:
+            Server.SeizeEntity(Calendar, Queue.Remove(), "EndOfService", Priority=5)
+    RunUntilEmpty(Calendar, EndOfService)
+    assert Finished == {False: 7.0, True: LowFinish}
+    assert Server.CurrentNumBusy == 0 and Server.Serving == {} and Server.RemainingService == {}
+
+def test_SeizeEntity_does_not_preempt_equal_priority(Calendar):
+    Server = SimClasses.Resource()
+    Server.SetUnits(1)
+    Server.SetPreemption("Resume", SimClasses.FIFOQueue())
+    assert Server.SeizeEntity(Calendar, 0, "EndOfService", 1.0, Priority=2)
+    assert not Server.SeizeEntity(Calendar, 1, "EndOfService", 1.0, Priority=2)
+    assert Server.LowestPriority() == 0
+
+def test_schedule_preempts_lowest_priority_first(Calendar):
+    Queue = SimClasses.FIFOQueue()
+    Server = SimClasses.Resource()
+    Server.SetSchedule([(0.0, 3), (2.0, 1)], Policy="Preempt", Queue=Queue)
+    SimFunctions.SimFunctionsInit(Calendar)
+    for ID, Priority in [(0, 1), (1, 3), (2, 3)]:
+        assert Server.SeizeEntity(Calendar, ID, "EndOfService", 5.0, Priority=Priority)
+    Ended = []
+    RunUntilEmpty(Calendar, lambda Event: (Ended.append(Event.WhichObject), Server.FreeEntity(Event.WhichObject)))
+    # at time 2 the two priority-3 ids leave, the latest started first
+    #   (each rejoins the front of the queue)
+    assert Queue.ThisQueue == [1, 2]
+    assert Ended == [0]
+    assert Server.RemainingService == {1: (3.0, 5.0), 2: (3.0, 5.0)}
+
+def test_schedule_finish_keeps_jobs_and_does_not_preempt_in_vain(Calendar):
+    Queue = SimClasses.FIFOQueue()
+    Server = SimClasses.Resource()
+    Server.SetSchedule([(0.0, 3), (2.0, 1)], Policy="Finish")
+    Server.SetPreemption("Resume", Queue)
+    SimFunctions.SimFunctionsInit(Calendar)
+    for ID in range(3):
+        assert Server.SeizeEntity(Calendar, ID, "EndOfService", 5.0 + ID, Priority=3)
+
+    Ended = {}
+    Tried = []
+    def EndOfService(Event):
+        Ended[Event.WhichObject] = SimClasses.Clock
+        Server.FreeEntity(Event.WhichObject)
+    def Handler(Event):
+        if Event.EventType == "Urgent":
+            Tried.append((SimClasses.Clock, Server.SeizeEntity(Calendar, "Urgent", "EndOfService", 1.0, Priority=0)))
+        else:
+            EndOfService(Event)
+    for EventTime in (3.0, 6.5):
+        SimFunctions.Schedule(Calendar, "Urgent", EventTime - SimClasses.Clock)
+    RunUntilEmpty(Calendar, Handler)
+    # at time 3 three units are busy on a capacity of one, so
+    #   preempting one of them would not free a unit; at time 6.5
+    #   only id 2 is left and is preempted
+    assert Tried == [(3.0, False), (6.5, True)]
+    assert Ended[0] == 5.0 and Ended[1] == 6.0 and Ended["Urgent"] == 7.5
+    assert Queue.ThisQueue == [2]
+    assert Server.RemainingService == {2: (0.5, 7.0)}
+
+def test_Preempt_without_queue_raises(Calendar):
+    Server = SimClasses.Resource()
+    Server.SetUnits(1)
+    Server.SetPreemption("Resume")
+    assert Server.SeizeEntity(Calendar, 0, "EndOfService", 4.0, Priority=2)
+    with pytest.raises(ValueError):
+        Server.SeizeEntity(Calendar, 1, "EndOfService", 1.0, Priority=1)
+    # the entity in service is untouched
+    assert Server.CurrentNumBusy == 1 and list(Server.Serving) == [0]
+    assert Server.RemainingService == {}
+
+def test_preempted_Entity_rejoins_its_own_queue(Calendar):
+    Shared, Own = SimClasses.FIFOQueue(), SimClasses.FIFOQueue()
+    Server = SimClasses.Resource()
+    Server.SetUnits(1)
+    Server.SetPreemption("Repeat", Shared)
+    Low, High = SimClasses.Entity(), SimClasses.Entity()
+    Low.Queue = Own
+    assert Server.SeizeEntity(Calendar, Low, "EndOfService", 4.0, Priority=2)
+    assert Server.SeizeEntity(Calendar, High, "EndOfService", 1.0, Priority=1)
+    assert Own.ThisQueue == [Low] and Shared.ThisQueue == []
+    assert Server.RemainingService == {Low: (4.0, 4.0)}
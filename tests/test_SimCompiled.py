@@ -0,0 +1,122 @@
+import numpy as np
+import pytest
+
+from pythonsim import SimClasses
+from pythonsim import SimCompiled
+from pythonsim import SimRNG
+
+@pytest.fixture(autouse=True)
+def DefaultSeeds():
+    SimRNG.ZRNG[:] = SimRNG.InitializeRNSeed()
+    yield
+    SimRNG.ZRNG[:] = SimRNG.InitializeRNSeed()
+
+###############################################################
+
+# Random numbers, against SimRNG
+
+###############################################################
+
+def test_variates_equal_SimRNG():
+    SimRNG.SeedReplication(3)
+    TheSeeds = SimCompiled.Seeds()
+    Compiled = [(SimCompiled.lcgrand(TheSeeds, 1), SimCompiled.Expon(2.0, TheSeeds, 2),
+        SimCompiled.Uniform(-1.0, 3.0, TheSeeds, 5), SimCompiled.Erlang(3, 6.0, TheSeeds, 100))
+        for i in range(200)]
+    SimRNG.SeedReplication(3)
+    Scalar = [(SimRNG.lcgrand(1), SimRNG.Expon(2.0, 2), SimRNG.Uniform(-1.0, 3.0, 5),
+        SimRNG.Erlang(3, 6.0, 100)) for i in range(200)]
+    assert Compiled == Scalar
+    assert TheSeeds.tolist() == list(SimRNG.ZRNG)
+
+def test_SaveSeeds_continues_the_streams():
+    TheSeeds = SimCompiled.Seeds()
+    for i in range(10):
+        SimCompiled.lcgrand(TheSeeds, 4)
+    SimCompiled.SaveSeeds(TheSeeds)
+    Next = SimRNG.lcgrand(4)
+    SimRNG.ZRNG[:] = SimRNG.InitializeRNSeed()
+    assert [SimRNG.lcgrand(4) for i in range(11)][-1] == Next
+
+###############################################################
+
+# Event calendar and queues
+
+###############################################################
+
+def test_calendar_order_equals_EventCalendar():
+    # times with many ties, removed in time order and FIFO on ties
+    Times = np.floor(SimRNG.UniformBlock(0.0, 20.0, 1, 300))
+    Calendar = SimCompiled.EventCalendar(300)
+    Reference = SimClasses.EventCalendar()
+    for k in range(300):
+        SimCompiled.CalendarSchedule(Calendar, Times[k], k % 7, k)
+        Event = SimClasses.EventNotice()
+        Event.EventTime, Event.EventType, Event.WhichObject = Times[k], k % 7, k
+        Reference.Schedule(Event)
+    Removed = []
+    while SimCompiled.CalendarN(Calendar) > 0:
+        Event = Reference.Remove()
+        Removed.append(SimCompiled.CalendarRemove(Calendar))
+        assert Removed[-1] == (Event.EventTime, Event.EventType, Event.WhichObject)
+    assert Reference.N() == 0 and len(Removed) == 300
+
+def test_calendar_capacity_and_clear():
+    Calendar = SimCompiled.EventCalendar(2)
+    with pytest.raises(IndexError):
+        SimCompiled.CalendarRemove(Calendar)
+    SimCompiled.CalendarSchedule(Calendar, 1.0, 0, 0)
+    SimCompiled.CalendarSchedule(Calendar, 1.0, 1, 1)
+    with pytest.raises(IndexError):
+        SimCompiled.CalendarSchedule(Calendar, 2.0, 2, 2)
+    SimCompiled.CalendarClear(Calendar)
+    assert SimCompiled.CalendarN(Calendar) == 0
+    SimCompiled.CalendarSchedule(Calendar, 5.0, 3, 3)
+    assert SimCompiled.CalendarRemove(Calendar) == (5.0, 3, 3)
+
+def test_queues_wrap_around():
+    Queues = SimCompiled.FIFOQueues(2, 3)
+    Removed = []
+    for X in range(10):
+        SimCompiled.QueueAdd(Queues, 1, X)
+        if SimCompiled.QueueN(Queues, 1) == 2:
+            Removed.append(SimCompiled.QueueRemove(Queues, 1))
+    assert Removed == list(range(9))
+    assert SimCompiled.QueueN(Queues, 0) == 0 and SimCompiled.QueueN(Queues, 1) == 1
+    SimCompiled.QueueAdd(Queues, 1, 10)
+    SimCompiled.QueueAdd(Queues, 1, 11)
+    with pytest.raises(IndexError):
+        SimCompiled.QueueAdd(Queues, 1, 12)
+    SimCompiled.QueueClear(Queues)
+    with pytest.raises(IndexError):
+        SimCompiled.QueueRemove(Queues, 1)
+
+###############################################################
+
+# Statistics, against SimClasses
+
+###############################################################
+
+def test_statistics_equal_SimClasses(Calendar):
+    Values = SimRNG.ExponBlock(1.0, 1, 100)
+    Times = np.cumsum(SimRNG.ExponBlock(0.5, 2, 100))
+    DT, CT = SimClasses.DTStat(), SimClasses.CTStat()
+    DTArray, CTArray = SimCompiled.DTStat(2), SimCompiled.CTStat(2)
+    for k in range(100):
+        if k == 50:
+            SimClasses.Clock = Times[k]
+            DT.Clear()
+            CT.Clear()
+            SimCompiled.DTClear(DTArray)
+            SimCompiled.CTClear(CTArray, Times[k])
+        SimClasses.Clock = Times[k]
+        DT.Record(Values[k])
+        CT.Record(Values[k])
+        SimCompiled.DTRecord(DTArray, 1, Values[k])
+        SimCompiled.CTRecord(CTArray, 1, Values[k], Times[k])
+    SimClasses.Clock = Times[-1] + 1.0
+    assert SimCompiled.DTMean(DTArray, 1) == DT.Mean()
+    assert SimCompiled.CTMean(CTArray, 1, SimClasses.Clock) == CT.Mean()
+    assert DTArray[1, SimCompiled.DT_MAX] == DT.Max and CTArray[1, SimCompiled.CT_MIN] == CT.Min
+    assert SimCompiled.DTMean(DTArray, 0) == 0.0
+    assert SimCompiled.CTMean(CTArray, 0, SimClasses.Clock) == 0.0
@@ -0,0 +1,157 @@
+import os
+import sys
+
+import pytest
+
+from conftest import ROOT
+from pythonsim import SimClasses
+from pythonsim import SimFunctions
+from pythonsim import SimRNG
+
+@pytest.fixture(autouse=True)
+def DefaultSeeds():
+    SimRNG.ZRNG[:] = SimRNG.InitializeRNSeed()
+    yield
+    SimRNG.ZRNG[:] = SimRNG.InitializeRNSeed()
+
+class Model:
+    # two servers and two priority classes with preemptive resume,
+    #   so that a snapshot holds entities in service, preempted
+    #   entities and their remaining service times
+    def __init__(self, calendar, Profile=None):
+        self.Calendar = calendar
+        self.Queue = SimClasses.FIFOQueue()
+        self.Server = SimClasses.Resource()
+        self.Server.SetUnits(2)
+        self.Server.SetPreemption("Resume", self.Queue)
+        self.Wait = SimClasses.DTStat()
+        self.Loop = SimFunctions.RunLoop(calendar, {"Arrival": self.Arrival, "Departure": self.Departure},
+            Profile=Profile)
+
+    def Start(self):
+        SimFunctions.SimFunctionsInit(self.Calendar)
+        SimFunctions.Schedule(self.Calendar, "Arrival", SimRNG.Expon(1.0, 1))
+
+    def Serve(self, Customer):
+        ServiceTime = None if Customer in self.Server.RemainingService else SimRNG.Expon(1.7, 2)
+        return self.Server.SeizeEntity(self.Calendar, Customer, "Departure", ServiceTime, Customer.Priority)
+
+    def Arrival(self, Nothing):
+        SimFunctions.Schedule(self.Calendar, "Arrival", SimRNG.Expon(1.0, 1))
+        Customer = SimClasses.Entity()
+        Customer.Priority = 0 if SimRNG.Uniform(0.0, 1.0, 3) < 0.3 else 1
+        if not self.Serve(Customer):
+            self.Queue.Add(Customer)
+
+    def Departure(self, Customer):
+        self.Wait.Record(SimClasses.Clock - Customer.CreateTime)
+        self.Server.FreeEntity(Customer)
+        if self.Queue.NumQueue() > 0:
+            self.Serve(self.Queue.Remove())
+
+    def RunUntil(self, Time):
+        SimFunctions.Schedule(self.Calendar, "EndSimulation", Time - SimClasses.Clock)
+        self.Loop()
+        return [self.Wait.Mean(), self.Queue.Mean(), self.Server.Mean(), SimClasses.Clock]
+
+###############################################################
+
+# RunLoop with an EventProfile
+
+###############################################################
+
+def test_profiled_loop_gives_the_same_run(Calendar):
+    Plain = Model(Calendar)
+    Plain.Start()
+    Expected = Plain.RunUntil(500.0)
+    SimRNG.ZRNG[:] = SimRNG.InitializeRNSeed()
+    Profile = SimClasses.EventProfile()
+    Profiled = Model(Calendar, Profile)
+    Profiled.Start()
+    assert Profiled.RunUntil(500.0) == Expected
+
+    # every handled event is counted, the end event is not
+    Queue = SimClasses.FIFOQueue.InstanceList.index(Profiled.Queue)
+    assert set(Profile.Counts) == {"Arrival", "Departure"}
+    assert Profile.Counts["Departure"] == Profiled.Wait.N()
+    assert Profile.Counts["Arrival"] == Profiled.Wait.N() + Profiled.Queue.NumQueue() + Profiled.Server.CurrentNumBusy
+    assert Profile.PeakQueues[Queue] == Profiled.Queue.WIP.Max
+    assert Profile.PeakCalendar >= 2
+    for EventType in Profile.Counts:
+        assert 0 <= Profile.MaxNs[EventType] <= Profile.TotalNs[EventType]
+    assert Profile.RemoveNs > 0
+
+def test_EventProfile_accumulates_until_Clear(Calendar):
+    Profile = SimClasses.EventProfile()
+    model = Model(Calendar, Profile)
+    model.Start()
+    model.RunUntil(100.0)
+    First = dict(Profile.Counts)
+    model.Start()
+    model.RunUntil(100.0)
+    assert Profile.Counts["Arrival"] > First["Arrival"]
+    Table = Profile.Table().splitlines()
+    assert Table[0].split()[:2] == ["EventType", "Count"]
+    assert {line.split()[0] for line in Table[1:3]} == {"Arrival", "Departure"}
+    assert Table[3].startswith("(calendar Remove)")
+    Profile.Clear()
+    assert Profile.Counts == {} and Profile.RemoveNs == 0 and Profile.PeakQueues == []
+
+###############################################################
+
+# Restore(Snapshot()) reproduces the run
+
+###############################################################
+
+def test_Restore_reproduces_the_run(Calendar):
+    model = Model(Calendar)
+    model.Start()
+    # run to a time when a preempted customer is waiting
+    Time = 0.0
+    while not model.Server.RemainingService:
+        Time += 1.0
+        model.RunUntil(Time)
+    assert len(model.Server.Serving) == 2
+    State = SimFunctions.Snapshot(Calendar, [model])
+    Continued = model.RunUntil(1000.0)
+    Seeds = list(SimRNG.ZRNG)
+    for k in range(2):
+        SimFunctions.Restore(State, Calendar, [model])
+        assert model.RunUntil(1000.0) == Continued
+        assert SimRNG.ZRNG == Seeds
+
+def test_Restore_with_Rep_reseeds(Calendar):
+    model = Model(Calendar)
+    model.Start()
+    model.RunUntil(200.0)
+    State = SimFunctions.Snapshot(Calendar, [model])
+    Forks = []
+    for Rep in (5, 6, 5):
+        SimFunctions.Restore(State, Calendar, [model], Rep=Rep)
+        Forks.append(model.RunUntil(1000.0))
+    assert Forks[0] == Forks[2]
+    assert Forks[0] != Forks[1]
+
+def test_Restore_refuses_other_model(Calendar):
+    model = Model(Calendar)
+    State = SimFunctions.Snapshot(Calendar, [model])
+    with pytest.raises(ValueError):
+        SimFunctions.Restore(State, Calendar, [model, []])
+
+def test_sim3_fork_without_Rep_equals_replication():
+    # a warm-up snapshot restored with its own streams continues into
+    #   exactly the replication that was never interrupted
+    Folder = os.path.join(ROOT, "Project1-3")
+    sys.path.insert(0, Folder)
+    try:
+        import sim3
+    finally:
+        sys.path.remove(Folder)
+    SimRNG.SeedReplication(3, sim3.Spacing)
+    Output = sim3.Replication(3)
+    SimRNG.SeedReplication(3, sim3.Spacing)
+    State = sim3.WarmUpState(3)
+    SimFunctions.Restore(State, sim3.Calendar, [sim3.TISRecords])
+    sim3.Loop()
+    assert [sim3.Wait.Mean(), sim3.ExcessProb.Mean()] == Output
+    assert sim3.Fork(State, 7) == sim3.Fork(State, 7)
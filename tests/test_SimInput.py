@@ -0,0 +1,213 @@
+import math
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from conftest import ROOT
+from pythonsim import SimInput
+from pythonsim import SimRNG
+
+@pytest.fixture
+def Counts(monkeypatch):
+    # counts the calls of ParseTable (pandas) and FileHash (SHA-256)
+    Calls = {"ParseTable": 0, "FileHash": 0}
+    for Name in Calls:
+        Function = getattr(SimInput, Name)
+        def Counted(*args, Name=Name, Function=Function):
+            Calls[Name] += 1
+            return Function(*args)
+        monkeypatch.setattr(SimInput, Name, Counted)
+    return Calls
+
+def Spreadsheet(tmp_path, Source="CarCounts.xls"):
+    FileName = str(tmp_path / "input.xls")
+    shutil.copyfile(os.path.join(ROOT, "hw3", Source), FileName)
+    return FileName
+
+def Equal(Table, Other):
+    return list(Table) == list(Other) and all(
+        np.array_equal(Table[Name], Other[Name], equal_nan=True) for Name in Table)
+
+###############################################################
+
+# Binary cache of LoadTable
+
+###############################################################
+
+def test_cache_is_used_while_the_file_is_unchanged(tmp_path, Counts):
+    FileName = Spreadsheet(tmp_path)
+    Parsed = SimInput.LoadTable(FileName)
+    assert os.path.exists(SimInput.CacheFile(FileName, True))
+    assert Counts["ParseTable"] == 1
+    Hashes = Counts["FileHash"]
+    Cached = SimInput.LoadTable(FileName)
+    assert Equal(Cached, Parsed)
+    # same size and modification time: no parsing and no hashing
+    assert Counts == {"ParseTable": 1, "FileHash": Hashes}
+    assert list(Parsed)[0] == "8AM-9AM" and len(Parsed["8AM-9AM"]) == 31
+
+def test_touched_file_falls_back_to_the_hash(tmp_path, Counts):
+    FileName = Spreadsheet(tmp_path)
+    Parsed = SimInput.LoadTable(FileName)
+    Stat = os.stat(FileName)
+    os.utime(FileName, ns=(Stat.st_atime_ns, Stat.st_mtime_ns + 10 ** 9))
+    Hashes = Counts["FileHash"]
+    assert Equal(SimInput.LoadTable(FileName), Parsed)
+    assert Counts["ParseTable"] == 1 and Counts["FileHash"] == Hashes + 1
+
+def test_changed_file_is_parsed_again(tmp_path, Counts):
+    FileName = Spreadsheet(tmp_path)
+    Old = SimInput.LoadTable(FileName)
+    # other contents under the same name, with the same mtime
+    Stat = os.stat(FileName)
+    shutil.copyfile(os.path.join(ROOT, "hw3", "ArrivalTimes.xls"), FileName)
+    os.utime(FileName, ns=(Stat.st_atime_ns, Stat.st_mtime_ns))
+    New = SimInput.LoadTable(FileName)
+    assert Counts["ParseTable"] == 2
+    assert not Equal(New, Old)
+    assert Equal(New, SimInput.LoadTable(os.path.join(ROOT, "hw3", "ArrivalTimes.xls"), Cache=False))
+    # and the rebuilt cache serves the new contents
+    assert Equal(SimInput.LoadTable(FileName), New) and Counts["ParseTable"] == 3
+
+def test_bad_or_old_cache_is_rebuilt(tmp_path, Counts, monkeypatch):
+    FileName = Spreadsheet(tmp_path)
+    Parsed = SimInput.LoadTable(FileName)
+    Cache = SimInput.CacheFile(FileName, True)
+    with open(Cache, "wb") as f:
+        f.write(b"not a cache")
+    assert Equal(SimInput.LoadTable(FileName), Parsed) and Counts["ParseTable"] == 2
+    monkeypatch.setattr(SimInput, "CACHE_VERSION", SimInput.CACHE_VERSION + 1)
+    assert Equal(SimInput.LoadTable(FileName), Parsed) and Counts["ParseTable"] == 3
+    assert Equal(SimInput.LoadTable(FileName), Parsed) and Counts["ParseTable"] == 3
+
+def test_header_and_no_cache(tmp_path, Counts):
+    # ArrivalTimes.xls has no header row
+    FileName = Spreadsheet(tmp_path, "ArrivalTimes.xls")
+    NoHeader = SimInput.LoadTable(FileName, Header=False, Cache=False)
+    assert list(NoHeader) == ["0", "1"] and len(NoHeader["0"]) == 44
+    assert not os.path.exists(os.path.join(str(tmp_path), SimInput.CACHE_DIRECTORY))
+    # with and without a header the sheet has separate caches
+    SimInput.LoadTable(FileName, Header=False)
+    Header = SimInput.LoadTable(FileName)
+    assert Counts["ParseTable"] == 3
+    assert np.array_equal(SimInput.LoadTable(FileName, Header=False)["0"][1:], Header["0"], equal_nan=True)
+    assert Counts["ParseTable"] == 3
+
+###############################################################
+
+# Maximum likelihood fits and goodness of fit
+
+###############################################################
+
+@pytest.fixture
+def Seeded():
+    SimRNG.SeedReplication(7)
+    yield
+    SimRNG.ZRNG[:] = SimRNG.InitializeRNSeed()
+
+def test_fits_solve_their_likelihood_equations(Seeded):
+    X = SimRNG.GammaBlock(2.5, 1.2, 1, 5000)
+    n, Mean, MeanLog = len(X), X.mean(), np.log(X).mean()
+    assert SimInput.FitExpon(X).Parameters == pytest.approx((Mean,))
+    # the Gamma shape solves log(Alpha) - Digamma(Alpha) = log(mean) - mean of logs
+    Alpha, Beta = SimInput.FitGamma(X).Parameters
+    assert math.log(Alpha) - SimInput.Digamma(Alpha) == pytest.approx(math.log(Mean) - MeanLog, rel=1e-10)
+    assert Alpha * Beta == pytest.approx(Mean)
+    assert Alpha == pytest.approx(2.5, rel=0.05) and Beta == pytest.approx(1.2, rel=0.05)
+    MeanPrime, VariancePrime = SimInput.FitLognormal(X).Parameters
+    assert SimInput.LognormalLog(MeanPrime, VariancePrime) == pytest.approx((MeanLog, np.log(X).std()))
+    m, ErlangMean = SimInput.FitErlang(X).Parameters
+    assert m in (2, 3) and ErlangMean == pytest.approx(Mean)
+
+def test_fits_maximize_the_likelihood(Seeded):
+    X = SimRNG.GammaBlock(1.7, 2.0, 2, 2000)
+    Sum, SumLog = float(X.sum()), float(np.log(X).sum())
+    Fit = SimInput.FitGamma(X)
+    Alpha, Beta = Fit.Parameters
+    assert Fit.LogLikelihood == pytest.approx(SimInput.GammaLogLikelihood(Alpha, Beta, len(X), Sum, SumLog))
+    for a, b in [(Alpha * 1.01, Beta), (Alpha * 0.99, Beta), (Alpha, Beta * 1.01), (Alpha, Beta * 0.99)]:
+        assert SimInput.GammaLogLikelihood(a, b, len(X), Sum, SumLog) < Fit.LogLikelihood
+    Expon = SimInput.FitExpon(X)
+    for Mean in (X.mean() * 1.01, X.mean() * 0.99):
+        assert SimInput.GammaLogLikelihood(1.0, Mean, len(X), Sum, SumLog) < Expon.LogLikelihood
+    assert Expon.AIC == pytest.approx(2 - 2 * Expon.LogLikelihood)
+
+def test_fits_reject_bad_data():
+    with pytest.raises(ValueError):
+        SimInput.FitExpon([np.nan])
+    with pytest.raises(ValueError):
+        SimInput.FitGamma([1.0, -2.0])
+    with pytest.raises(ValueError):
+        SimInput.FitLognormal([3.0, 3.0, np.nan])
+
+def test_KS_and_AD_statistics(Seeded):
+    X = np.sort(SimRNG.ExponBlock(2.0, 3, 200))
+    Fit = SimInput.FitExpon(X)
+    Fit.GoodnessOfFit(X)
+    F = [1 - math.exp(-x / Fit.Parameters[0]) for x in X]
+    n = len(X)
+    KS = max(max((i + 1) / n - F[i], F[i] - i / n) for i in range(n))
+    AD = -n - sum((2 * i + 1) * (math.log(F[i]) + math.log(1 - F[n - 1 - i])) for i in range(n)) / n
+    assert Fit.KS == pytest.approx(KS) and Fit.AD == pytest.approx(AD)
+    # far below the 5% critical values of fitted exponential data
+    assert Fit.KS < 0.1 and Fit.AD < 1.3
+
+@pytest.mark.parametrize("Name, Draw", [
+    ("Gamma", lambda n: SimRNG.GammaBlock(2.5, 1.0, 1, n)),
+    ("Lognormal", lambda n: np.array([SimRNG.Lognormal(2.0, 3.0, 1) for i in range(n)])),
+    ("Expon", lambda n: SimRNG.ExponBlock(3.0, 1, n)),
+])
+def test_FitAll_ranks_the_true_family_first(Seeded, Name, Draw):
+    X = Draw(3000)
+    Fits = SimInput.FitAll(X)
+    # Erlang(1) and Gamma(1) are exponential, and ties are possible
+    if Name == "Expon":
+        assert Fits[0].Name in ("Expon", "Erlang", "Gamma")
+        assert Fits[0].AD < 2.5
+    else:
+        assert Fits[0].Name == Name
+    assert [Fit.AD for Fit in Fits] == sorted(Fit.AD for Fit in Fits)
+    assert len(SimInput.FitTable(Fits).splitlines()) == len(Fits) + 1
+
+###############################################################
+
+# NHPP rates and arrivals
+
+###############################################################
+
+def test_ArrivalRates_counts_per_unit_time():
+    Times = [0.5, 1.5, 1.7, 3.9, np.nan, 0.2, 2.1]
+    Edges, Rates = SimInput.ArrivalRates(Times, 4.0, 1.0, NumObservations=2)
+    assert Edges.tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert Rates.tolist() == [1.0, 1.0, 0.5, 0.5]
+
+def test_NHPP_arrivals_follow_the_rates(Seeded):
+    Process = SimInput.NHPP([0.0, 2.0, 3.0, 6.0], [1.0, 0.0, 4.0])
+    Now = 0.0
+    Times = []
+    while Now < 2000 * 6.0:
+        Now = Process.Next(Now, 4)
+        Times.append(Now)
+    Times = np.array(Times[:-1])
+    Within = np.mod(Times, 6.0)
+    # no arrivals where the rate is 0, and Poisson counts elsewhere
+    assert not np.any((Within > 2.0) & (Within < 3.0))
+    for Lower, Upper, Rate in [(0.0, 2.0, 1.0), (3.0, 6.0, 4.0)]:
+        Expected = 2000 * Rate * (Upper - Lower)
+        Count = np.sum((Within >= Lower) & (Within < Upper))
+        assert abs(Count - Expected) < 4 * math.sqrt(Expected)
+    # arrivals within an interval are uniform: mean in the middle
+    assert np.mean(Within[Within >= 3.0]) == pytest.approx(4.5, abs=0.05)
+
+def test_NHPP_NextBlock_equals_Next(Seeded):
+    Process = SimInput.NHPP([0.0, 2.0, 3.0, 6.0], [1.0, 0.0, 4.0], Cyclic=False)
+    Now = SimRNG.UniformBlock(0.0, 7.0, 5, 200)
+    SimRNG.SeedReplication(8)
+    Block = Process.NextBlock(Now, 6)
+    SimRNG.SeedReplication(8)
+    Scalar = [Process.Next(t, 6) for t in Now]
+    assert np.allclose(Block, Scalar, rtol=1e-12) and np.array_equal(np.isinf(Block), np.isinf(Scalar))
+    # without cycles there are no arrivals after the period
+    assert np.all(np.isinf(Block[Now >= 6.0]))
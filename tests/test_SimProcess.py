@@ -0,0 +1,93 @@
+import pytest
+
+from pythonsim import SimClasses
+from pythonsim import SimFunctions
+from pythonsim import SimProcess
+
+def RunAll(calendar):
+    # runs processes and internal events until the calendar is empty
+    while calendar.N() > 0:
+        calendar.Remove()
+
+def Customer(Log, Name, Server, Service, Units=1):
+    yield SimProcess.Seize(Server, Units)
+    Log.append((Name, "start", SimClasses.Clock))
+    yield SimProcess.Timeout(Service)
+    yield SimProcess.Release(Server, Units)
+    Log.append((Name, "end", SimClasses.Clock))
+
+def test_single_server_FIFO(Calendar):
+    Server = SimClasses.Resource()
+    Server.SetProcessQueue()
+    Server.SetUnits(1)
+    Log = []
+    for k in range(3):
+        SimProcess.Start(Calendar, Customer(Log, k, Server, 2.0), Delay=0.5 * k)
+    RunAll(Calendar)
+    assert [Entry for Entry in Log if Entry[1] == "start"] == [(0, "start", 0.0), (1, "start", 2.0), (2, "start", 4.0)]
+    assert Log[-1] == (2, "end", 6.0)
+    assert Server.CurrentNumBusy == 0 and Server.ProcessQueue.NumQueue() == 0
+
+def test_waiting_processes_keep_FIFO_order(Calendar):
+    # a process that needs 2 units blocks the later ones, even when a
+    #   single unit is free
+    Server = SimClasses.Resource()
+    Server.SetProcessQueue()
+    Server.SetUnits(2)
+    Log = []
+    SimProcess.Start(Calendar, Customer(Log, "a", Server, 3.0))
+    SimProcess.Start(Calendar, Customer(Log, "b", Server, 1.0), Delay=0.1)
+    SimProcess.Start(Calendar, Customer(Log, "c", Server, 1.0, Units=2), Delay=0.2)
+    SimProcess.Start(Calendar, Customer(Log, "d", Server, 1.0), Delay=0.3)
+    RunAll(Calendar)
+    Starts = {Name: Time for Name, Kind, Time in Log if Kind == "start"}
+    assert Starts == {"a": 0.0, "b": 0.1, "c": 3.0, "d": 4.0}
+
+def test_schedule_increase_serves_waiting_processes(Calendar):
+    # no unit until time 5, then 2, then 1 from time 8
+    Server = SimClasses.Resource()
+    Server.SetProcessQueue()
+    Server.SetSchedule([(0.0, 0), (5.0, 2), (8.0, 1)])
+    SimFunctions.SimFunctionsInit(Calendar)
+    Log = []
+    for k in range(3):
+        SimProcess.Start(Calendar, Customer(Log, k, Server, 2.0), Delay=float(k))
+    RunAll(Calendar)
+    Starts = [(Name, Time) for Name, Kind, Time in Log if Kind == "start"]
+    assert Starts == [(0, 5.0), (1, 5.0), (2, 7.0)]
+
+def test_processes_mix_with_events(Calendar):
+    Ticks = []
+    def Clock():
+        while True:
+            yield SimProcess.Timeout(1.0)
+            Ticks.append(SimClasses.Clock)
+    SimProcess.Start(Calendar, Clock())
+    SimFunctions.Schedule(Calendar, "EndSimulation", 3.5)
+    SimFunctions.RunLoop(Calendar, {})()
+    assert Ticks == [1.0, 2.0, 3.0]
+
+def test_process_queue_set_up_with_the_model(Calendar):
+    # the queue of waiting processes is a model queue from the start:
+    #   its statistics cover the whole replication
+    Server = SimClasses.Resource()
+    Queue = Server.SetProcessQueue()
+    assert Server.ProcessQueue is Queue and Queue in SimClasses.FIFOQueue.InstanceList
+    Server.SetUnits(1)
+    SimFunctions.SimFunctionsInit(Calendar)
+    Log = []
+    for k in range(3):
+        SimProcess.Start(Calendar, Customer(Log, k, Server, 2.0))
+    RunAll(Calendar)
+    # 2 waiting over [0, 2), 1 over [2, 4), none over [4, 6)
+    assert Queue.Mean() == pytest.approx(1.0)
+    Own = SimClasses.FIFOQueue()
+    assert Server.SetProcessQueue(Own) is Own and Server.ProcessQueue is Own
+
+def test_seize_without_process_queue(Calendar):
+    Server = SimClasses.Resource()
+    Server.SetUnits(1)
+    SimProcess.Start(Calendar, Customer([], "a", Server, 1.0))
+    with pytest.raises(ValueError, match="set one with SetProcessQueue"):
+        RunAll(Calendar)
+    assert Server.CurrentNumBusy == 0
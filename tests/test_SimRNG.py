@@ -0,0 +1,349 @@
+import bisect
+import math
+
+import numpy as np
+import pytest
+
+from pythonsim import SimInput
+from pythonsim import SimRNG
+
+@pytest.fixture(autouse=True)
+def DefaultSeeds():
+    # every test starts, and leaves, the streams at their default seeds
+    SimRNG.ZRNG[:] = SimRNG.InitializeRNSeed()
+    yield
+    SimRNG.ZRNG[:] = SimRNG.InitializeRNSeed()
+
+###############################################################
+
+# Jump-ahead and replication seeds
+
+###############################################################
+
+def test_lcgrandjump_equals_draws():
+    for i in range(1234):
+        SimRNG.lcgrand(5)
+    seed = SimRNG.lcgrandgt(5)
+    SimRNG.ZRNG[:] = SimRNG.InitializeRNSeed()
+    SimRNG.lcgrandjump(5, 1234)
+    assert SimRNG.lcgrandgt(5) == seed
+
+def test_default_seeds_are_stream_spacing_apart():
+    Seeds = SimRNG.InitializeRNSeed()
+    for Stream in (1, 2, 50, 99):
+        SimRNG.lcgrandst(Seeds[Stream - 1], Stream)
+        SimRNG.lcgrandjump(Stream, SimRNG.STREAM_SPACING)
+        assert SimRNG.lcgrandgt(Stream) == Seeds[Stream]
+
+def test_SeedReplication_jumps_every_stream():
+    Spacing = SimRNG.ReplicationSpacing(3, 20000)
+    SimRNG.SeedReplication(7, Spacing)
+    Seeds = list(SimRNG.ZRNG)
+    SimRNG.ZRNG[:] = SimRNG.InitializeRNSeed()
+    for Stream in range(1, len(Seeds) + 1):
+        SimRNG.lcgrandjump(Stream, 7 * Spacing)
+    assert SimRNG.ZRNG == Seeds
+
+def test_CheckReplication_refuses_wrapped_seeds():
+    SimRNG.SeedReplication(213)
+    with pytest.raises(ValueError):
+        SimRNG.SeedReplication(214)
+    with pytest.raises(ValueError):
+        SimRNG.SeedBlock(1, 200, 20)
+    SimRNG.SeedReplication(35000, SimRNG.ReplicationSpacing(3, 20000))
+
+@pytest.mark.parametrize("NumStreams, Draws, expected", [
+    (1, 20000, 20000), (2, 10000, 40000), (3, 20000, 60000),
+    (100, 100000, SimRNG.REPLICATION_SPACING)])
+def test_ReplicationSpacing_values(NumStreams, Draws, expected):
+    assert SimRNG.ReplicationSpacing(NumStreams, Draws) == expected
+
+@pytest.mark.parametrize("NumStreams, Draws", [(2, 3000), (3, 20000), (4, 700), (10, 1)])
+def test_ReplicationSpacing_disjoint_blocks(NumStreams, Draws):
+    # blocks [start, start + Draws) of streams 1..NumStreams of the
+    #   first replications never overlap
+    Spacing = SimRNG.ReplicationSpacing(NumStreams, Draws)
+    Starts = sorted((k * SimRNG.STREAM_SPACING + Rep * Spacing)
+        for k in range(NumStreams) for Rep in range(3 * SimRNG.STREAM_SPACING // Spacing + 2))
+    assert all(b - a >= Draws for a, b in zip(Starts, Starts[1:]))
+
+def test_ReplicationSpacing_too_many_draws():
+    with pytest.raises(ValueError):
+        SimRNG.ReplicationSpacing(2, SimRNG.STREAM_SPACING + 1)
+
+###############################################################
+
+# Block generators draw the same random numbers as the scalar ones
+
+###############################################################
+
+def test_lcgrandblock_equals_lcgrand():
+    Block = SimRNG.lcgrandblock(3, (4, 250))
+    after = SimRNG.lcgrandgt(3)
+    SimRNG.ZRNG[:] = SimRNG.InitializeRNSeed()
+    Scalar = np.array([SimRNG.lcgrand(3) for i in range(1000)]).reshape(4, 250)
+    assert np.array_equal(Block, Scalar)
+    assert SimRNG.lcgrandgt(3) == after
+
+@pytest.mark.parametrize("Block, Scalar", [
+    (lambda Size: SimRNG.ExponBlock(2.5, 4, Size), lambda: SimRNG.Expon(2.5, 4)),
+    (lambda Size: SimRNG.UniformBlock(-1.0, 3.0, 4, Size), lambda: SimRNG.Uniform(-1.0, 3.0, 4)),
+    (lambda Size: SimRNG.ErlangBlock(3, 6.0, 4, Size), lambda: SimRNG.Erlang(3, 6.0, 4)),
+    (lambda Size: SimRNG.TriangularBlock(1.0, 2.0, 5.0, 4, Size), lambda: SimRNG.Triangular(1.0, 2.0, 5.0, 4))])
+def test_Block_equals_scalar(Block, Scalar):
+    X = Block(500)
+    after = list(SimRNG.ZRNG)
+    SimRNG.ZRNG[:] = SimRNG.InitializeRNSeed()
+    Y = np.array([Scalar() for i in range(500)])
+    assert np.allclose(X, Y, rtol=1e-12, atol=0.0)
+    assert SimRNG.ZRNG == after
+
+def test_SeedBlock_equals_SeedReplication():
+    Spacing = SimRNG.ReplicationSpacing(2, 10000)
+    Seeds = SimRNG.SeedBlock(2, 5, 30, Spacing)
+    for r in range(30):
+        SimRNG.SeedReplication(5 + r, Spacing)
+        assert Seeds[r] == SimRNG.lcgrandgt(2)
+
+def test_lcgrandblock_rows_follow_replications():
+    Seeds = SimRNG.SeedBlock(1, 0, 6)
+    Block = SimRNG.ExponBlock(1.5, Seeds, (10, 3))
+    assert Block.shape == (6, 10, 3)
+    for r in range(6):
+        SimRNG.SeedReplication(r)
+        Scalar = [SimRNG.Expon(1.5, 1) for i in range(30)]
+        assert np.allclose(Block[r].ravel(), Scalar, rtol=1e-12, atol=0.0)
+        assert Seeds[r] == SimRNG.lcgrandgt(1)
+
+###############################################################
+
+# Poisson (PTRS) and binomial (BTRS) generators
+
+###############################################################
+
+def ChiSquarePValue(Sample, PMF):
+    # chi-square goodness-of-fit p-value of an integer Sample against
+    #   the probabilities PMF(k), pooling the tails until every cell
+    #   expects at least 5 observations
+    Sample = np.asarray(Sample)
+    n = len(Sample)
+    Values = np.arange(Sample.min(), Sample.max() + 1)
+    Expected = n * np.array([PMF(k) for k in Values])
+    Observed = np.array([np.count_nonzero(Sample == k) for k in Values], dtype=float)
+    Expected[0] += n * sum(PMF(k) for k in range(0, int(Values[0])))
+    Expected[-1] = n - Expected[:-1].sum()
+    while Expected[0] < 5:
+        Expected[1] += Expected[0]; Observed[1] += Observed[0]
+        Expected, Observed = Expected[1:], Observed[1:]
+    while Expected[-1] < 5:
+        Expected[-2] += Expected[-1]; Observed[-2] += Observed[-1]
+        Expected, Observed = Expected[:-1], Observed[:-1]
+    Statistic = np.sum((Observed - Expected) ** 2 / Expected)
+    return 1.0 - float(SimInput.GammaP((len(Expected) - 1) / 2.0, np.array([Statistic / 2.0]))[0])
+
+def PoissonPMF(Mean):
+    return lambda k: math.exp(-Mean + k * math.log(Mean) - math.lgamma(k + 1))
+
+def BinomialPMF(n, p):
+    return lambda k: math.exp(math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1)
+        + k * math.log(p) + (n - k) * math.log(1 - p)) if 0 <= k <= n else 0.0
+
+@pytest.mark.parametrize("Mean", [10.0, 37.5, 400.0])
+def test_Poisson_PTRS_distribution(Mean):
+    Scalar = [SimRNG.Poisson(Mean, 6) for i in range(20000)]
+    Block = SimRNG.PoissonBlock(Mean, 7, 20000)
+    Rows = SimRNG.PoissonBlock(Mean, SimRNG.SeedBlock(8, 0, 4), 5000).ravel()
+    for Sample in (Scalar, Block, Rows):
+        assert ChiSquarePValue(Sample, PoissonPMF(Mean)) > 0.001
+        assert np.mean(Sample) == pytest.approx(Mean, rel=0.02)
+
+@pytest.mark.parametrize("n, p", [(200, 0.3), (1000, 0.02), (60, 0.85)])
+def test_Binomial_BTRS_distribution(n, p):
+    Scalar = [SimRNG.Binomial(n, p, 6) for i in range(20000)]
+    Block = SimRNG.BinomialBlock(n, p, 7, 20000)
+    Rows = SimRNG.BinomialBlock(n, p, SimRNG.SeedBlock(8, 0, 4), 5000).ravel()
+    for Sample in (Scalar, Block, Rows):
+        assert min(Sample) >= 0 and max(Sample) <= n
+        assert ChiSquarePValue(Sample, BinomialPMF(n, p)) > 0.001
+        assert np.mean(Sample) == pytest.approx(n * p, rel=0.02)
+
+@pytest.mark.parametrize("Block, Scalar", [
+    (lambda Size: SimRNG.PoissonBlock(3.2, 4, Size), lambda: SimRNG.Poisson(3.2, 4)),
+    (lambda Size: SimRNG.BinomialBlock(20, 0.3, 4, Size), lambda: SimRNG.Binomial(20, 0.3, 4)),
+    (lambda Size: SimRNG.BinomialBlock(20, 0.9, 4, Size), lambda: SimRNG.Binomial(20, 0.9, 4)),
+    (lambda Size: SimRNG.WeibullBlock(1.5, 2.0, 4, Size), lambda: SimRNG.Weibull(1.5, 2.0, 4))])
+def test_inversion_Block_equals_scalar(Block, Scalar):
+    X = Block(2000)
+    SimRNG.ZRNG[:] = SimRNG.InitializeRNSeed()
+    assert np.allclose(X, [Scalar() for i in range(2000)], rtol=1e-12, atol=0.0)
+
+def test_RejectionBlock_rows_use_own_seeds():
+    # a replication's variates do not depend on the other rows
+    All = SimRNG.PoissonBlock(50.0, SimRNG.SeedBlock(1, 0, 5), 100)
+    One = SimRNG.PoissonBlock(50.0, SimRNG.SeedBlock(1, 3, 1), 100)
+    assert np.array_equal(All[3], One[0])
+
+###############################################################
+
+# Guide-table empirical and piecewise-linear samplers
+
+###############################################################
+
+def FirstAbove(Cumulative, U):
+    # reference lookup: the first i with Cumulative[i] > U
+    return bisect.bisect_right(Cumulative, U)
+
+def UniformGrid(Table):
+    # Uniforms at 0, at every k/n and every cumulative probability
+    #   (where the lookup changes), just around them, and at the
+    #   largest value lcgrand returns
+    n = len(Table.Cumulative)
+    Edges = [k / n for k in range(n)] + Table.Cumulative[:-1]
+    U = [0.0, SimRNG.LCGRAND_MAX] + list(np.linspace(0.0, SimRNG.LCGRAND_MAX, 1001))
+    for e in Edges:
+        U += [e, math.nextafter(e, 0.0), math.nextafter(e, 1.0)]
+    return np.array([u for u in U if 0.0 <= u < 1.0])
+
+def Patched(monkeypatch, U):
+    # makes lcgrand and lcgrandblock return the Uniforms U in turn
+    Draws = iter(U)
+    monkeypatch.setattr(SimRNG, "lcgrand", lambda Stream: next(Draws))
+    monkeypatch.setattr(SimRNG, "lcgrandblock", lambda Stream, Size: np.array(U).reshape(Size))
+
+EMPIRICAL_TABLES = [
+    ([3.0, 1.0, 2.0], None),
+    ([5.0, 1.0, 4.0, 2.0, 3.0], [0.1, 0.4, 0.05, 0.25, 0.2]),
+    ([0.0, 1.0, 2.0, 3.0], [0.0, 2.0, 0.0, 1.0]),
+    (list(range(50)), [(i % 7) ** 2 for i in range(50)])]
+
+@pytest.mark.parametrize("Values, Probabilities", EMPIRICAL_TABLES)
+def test_EmpiricalTable_guide(Values, Probabilities):
+    Table = SimRNG.EmpiricalTable(Values, Probabilities)
+    n = len(Table.Cumulative)
+    assert Table.Values == sorted(float(x) for x in Values)
+    assert Table.Cumulative[-1] == 1.0
+    assert Table.Lower == [0.0] + Table.Cumulative[:-1]
+    assert Table.Guide == [FirstAbove(Table.Cumulative, k / n) for k in range(n)]
+
+@pytest.mark.parametrize("Values, Probabilities", EMPIRICAL_TABLES)
+def test_Empirical_lookup_matches_cdf(monkeypatch, Values, Probabilities):
+    Table = SimRNG.EmpiricalTable(Values, Probabilities)
+    U = UniformGrid(Table)
+    Expected = [Table.Values[FirstAbove(Table.Cumulative, u)] for u in U]
+    assert list(Table.LookupBlock(U)) == [FirstAbove(Table.Cumulative, u) for u in U]
+    Patched(monkeypatch, U)
+    assert list(SimRNG.EmpiricalBlock(Table, 1, len(U))) == Expected
+    assert [SimRNG.Empirical(Table, 1) for u in U] == Expected
+
+def test_Empirical_endpoints():
+    # u -> 0 gives the smallest value with positive probability,
+    #   u -> 1 the largest
+    Table = SimRNG.EmpiricalTable([0.0, 1.0, 2.0, 3.0, 4.0], [0.0, 2.0, 1.0, 1.0, 0.0])
+    U = np.array([0.0, SimRNG.LCGRAND_MAX])
+    assert list(Table.Values[i] for i in Table.LookupBlock(U)) == [1.0, 3.0]
+
+@pytest.mark.parametrize("Values, Probabilities", [
+    ([0.0, 1.0, 3.0, 6.0], None),
+    ([2.0, 0.5, 10.0, 4.0, 1.0], [0.1, 0.3, 0.4, 0.2]),
+    ([0.0, 1.0, 2.0, 3.0], [0.5, 0.0, 0.5])])
+def test_PiecewiseLinear_inverts_cdf(monkeypatch, Values, Probabilities):
+    Table = SimRNG.EmpiricalTable(Values, Probabilities, Continuous=True)
+    U = UniformGrid(Table)
+    Patched(monkeypatch, U)
+    Block = SimRNG.PiecewiseLinearBlock(Table, 1, len(U))
+    Scalar = np.array([SimRNG.PiecewiseLinear(Table, 1) for u in U])
+    assert np.allclose(Block, Scalar, rtol=1e-12, atol=0.0)
+    # the piecewise-linear cdf of the variates gives back U
+    assert np.allclose(np.interp(Block, Table.Values, Table.Lower + [1.0]), U, rtol=0.0, atol=1e-12)
+    assert np.all(np.diff(Block[np.argsort(U)]) >= 0.0)
+    assert Block[U == 0.0].min() == Table.Values[0]
+    assert Block.max() == pytest.approx(Table.Values[-1], abs=1e-5)
+
+def test_Empirical_frequencies():
+    Probabilities = [0.1, 0.4, 0.05, 0.25, 0.2]
+    Table = SimRNG.EmpiricalTable([1.0, 2.0, 3.0, 4.0, 5.0], Probabilities)
+    Sample = SimRNG.EmpiricalBlock(Table, 3, 40000)
+    for x, p in zip(Table.Values, Probabilities):
+        se = math.sqrt(p * (1 - p) / len(Sample))
+        assert abs(np.mean(Sample == x) - p) < 4 * se
+
+def test_EmpiricalTable_probability_count():
+    with pytest.raises(ValueError, match="need 3 probabilities for 3 values"):
+        SimRNG.EmpiricalTable([1.0, 2.0, 3.0], [0.5, 0.5])
+    with pytest.raises(ValueError, match="need 2 probabilities for 3 values"):
+        SimRNG.EmpiricalTable([1.0, 2.0, 3.0], [0.2, 0.3, 0.5], Continuous=True)
+
+@pytest.mark.parametrize("Probabilities", [
+    [1.0, 1.0, 1.0],
+    [0.0, 0.3, 0.0, 0.5, 0.2, 0.0],
+    [1 / m for m in [5.12, 11.68, 4.27, 6.88, 5.15, 5.07, 3.81]]])
+def test_Choice_lookup_matches_cdf(monkeypatch, Probabilities):
+    Table = SimRNG.ChoiceTable(Probabilities)
+    assert SimRNG.ChoiceTable(list(Probabilities)) is Table
+    U = UniformGrid(Table)
+    Expected = [FirstAbove(Table.Cumulative, u) for u in U]
+    Patched(monkeypatch, U)
+    assert list(SimRNG.ChoiceBlock(Table, 1, len(U))) == Expected
+    assert [SimRNG.Choice(Table, 1) for u in U] == Expected
+    # never a choice of probability 0; u -> 0 and u -> 1 give the
+    #   first and last choices of positive probability
+    Positive = [i for i, p in enumerate(Probabilities) if p > 0]
+    assert set(Expected) == set(Positive)
+    assert Expected[0] == Positive[0] and Expected[1] == Positive[-1]
+
+def test_Choice_frequencies():
+    Probabilities = [0.0, 0.3, 0.0, 0.5, 0.2]
+    Table = SimRNG.ChoiceTable(Probabilities)
+    Scalar = np.array([SimRNG.Choice(Table, 2) for i in range(20000)])
+    Block = SimRNG.ChoiceBlock(Table, 2, 20000)
+    SimRNG.ZRNG[:] = SimRNG.InitializeRNSeed()
+    assert np.array_equal(SimRNG.ChoiceBlock(Table, 2, 20000), Scalar)
+    for i, p in enumerate(Probabilities):
+        se = math.sqrt(p * (1 - p) / len(Block))
+        assert abs(np.mean(Block == i) - p) <= 4 * se
+
+###############################################################
+
+# Moments of the Block generators
+
+###############################################################
+
+def WeibullMoments(Alpha, Beta):
+    m1 = math.gamma(1 + 1 / Alpha)
+    return Beta * m1, Beta ** 2 * (math.gamma(1 + 2 / Alpha) - m1 ** 2)
+
+def BetaMoments(a, b):
+    return a / (a + b), a * b / ((a + b) ** 2 * (a + b + 1))
+
+def MomentsAgree(Sample, Mean, Variance, z=5.0):
+    # sample mean and variance within z standard errors of Mean and
+    #   Variance; the variance's standard error uses the sample's
+    #   fourth central moment
+    Sample = np.asarray(Sample, dtype=float).ravel()
+    n = len(Sample)
+    Deviations = Sample - Sample.mean()
+    s2 = np.mean(Deviations ** 2) * n / (n - 1)
+    m4 = np.mean(Deviations ** 4)
+    return (abs(Sample.mean() - Mean) < z * math.sqrt(Variance / n)
+        and abs(s2 - Variance) < z * math.sqrt((m4 - s2 ** 2) / n))
+
+@pytest.mark.parametrize("Block, Mean, Variance", [
+    (lambda S, n: SimRNG.GammaBlock(0.5, 2.0, S, n), 1.0, 2.0),
+    (lambda S, n: SimRNG.GammaBlock(1.0, 1.0, S, n), 1.0, 1.0),
+    (lambda S, n: SimRNG.GammaBlock(2.5, 3.0, S, n), 7.5, 22.5),
+    (lambda S, n: SimRNG.GammaBlock(9.0, 0.5, S, n), 4.5, 2.25),
+    (lambda S, n: SimRNG.WeibullBlock(0.7, 2.0, S, n), *WeibullMoments(0.7, 2.0)),
+    (lambda S, n: SimRNG.WeibullBlock(3.0, 1.0, S, n), *WeibullMoments(3.0, 1.0)),
+    (lambda S, n: SimRNG.BetaBlock(0.5, 0.5, S, n), *BetaMoments(0.5, 0.5)),
+    (lambda S, n: SimRNG.BetaBlock(2.0, 5.0, S, n), *BetaMoments(2.0, 5.0)),
+    (lambda S, n: SimRNG.BetaBlock(3.0, 1.5, S, n), *BetaMoments(3.0, 1.5)),
+    (lambda S, n: SimRNG.PoissonBlock(0.8, S, n), 0.8, 0.8),
+    (lambda S, n: SimRNG.PoissonBlock(25.0, S, n), 25.0, 25.0),
+    (lambda S, n: SimRNG.PoissonBlock(400.0, S, n), 400.0, 400.0),
+    (lambda S, n: SimRNG.BinomialBlock(10, 0.95, S, n), 9.5, 0.475),
+    (lambda S, n: SimRNG.BinomialBlock(200, 0.3, S, n), 60.0, 42.0),
+    (lambda S, n: SimRNG.BinomialBlock(1000, 0.02, S, n), 20.0, 19.6)])
+def test_Block_moments(Block, Mean, Variance):
+    # from one stream and from the rows of a seed array
+    assert MomentsAgree(Block(5, 40000), Mean, Variance)
+    assert MomentsAgree(Block(SimRNG.SeedBlock(9, 0, 8), 5000), Mean, Variance)
@@ -0,0 +1,81 @@
+import csv
+import math
+
+import numpy as np
+import pytest
+
+from pythonsim import SimRecords
+
+def Records(NumReps, Empty):
+    # records of replications 0, ..., NumReps - 1, with 3 Rep + 1
+    #   records each except for replication Empty, which has none
+    rng = np.random.default_rng(5)
+    return {Rep: (rng.exponential(1.0, 0 if Rep == Empty else 3 * Rep + 1),
+        rng.integers(0, 3, 0 if Rep == Empty else 3 * Rep + 1)) for Rep in range(NumReps)}
+
+###############################################################
+
+# RecordWriter, ReadRecords and ByReplication
+
+###############################################################
+
+@pytest.mark.parametrize("Background", [True, False])
+def test_round_trip_over_several_chunks(tmp_path, Background):
+    Data = Records(8, Empty=3)
+    Directory = str(tmp_path / "records")
+    with SimRecords.RecordWriter(Directory, {"TIS": "f8", "Station": "i2"}, ChunkSize=7,
+            Background=Background) as Writer:
+        for Rep in Data:
+            Writer.Write(Rep, *Data[Rep])
+    Read = SimRecords.ReadRecords(Directory)
+    assert sorted(Read) == ["Rep", "Station", "TIS"]
+    assert Read["Rep"].tolist() == [Rep for Rep in Data for i in range(len(Data[Rep][0]))]
+    assert np.array_equal(Read["TIS"], np.concatenate([Data[Rep][0] for Rep in Data]))
+    assert np.array_equal(Read["Station"], np.concatenate([Data[Rep][1] for Rep in Data]))
+    assert Read["Station"].dtype == np.int16
+
+    Table = SimRecords.ByReplication(Read["Rep"], Read["TIS"], Reps=range(8))
+    assert Table.shape == (8, 22)
+    for Rep in Data:
+        n = len(Data[Rep][0])
+        assert np.array_equal(Table[Rep, :n], Data[Rep][0])
+        assert np.isnan(Table[Rep, n:]).all()
+    # without Reps the empty replication has no row
+    assert SimRecords.ByReplication(Read["Rep"], Read["TIS"]).shape == (7, 22)
+    with pytest.raises(ValueError):
+        SimRecords.ByReplication(Read["Rep"], Read["TIS"], Reps=range(4))
+
+def test_reader_while_the_writer_runs(tmp_path):
+    # whatever a reader sees is a prefix of every column
+    Data = Records(30, Empty=10)
+    Directory = str(tmp_path / "records")
+    Writer = SimRecords.RecordWriter(Directory, {"TIS": "f8"}, ChunkSize=16)
+    Expected = np.concatenate([Data[Rep][0] for Rep in Data])
+    Seen = []
+    for Rep in Data:
+        Writer.Write(Rep, Data[Rep][0])
+        Read = SimRecords.ReadRecords(Directory)
+        n = len(Read["TIS"])
+        assert np.array_equal(Read["TIS"], Expected[:n])
+        assert np.all(np.diff(Read["Rep"]) >= 0)
+        Seen.append(n)
+    Writer.Close()
+    assert Seen == sorted(Seen)
+    assert np.array_equal(SimRecords.ReadRecords(Directory)["TIS"], Expected)
+
+def test_ToCSV_writes_one_row_per_replication(tmp_path):
+    Data = Records(5, Empty=1)
+    Directory = str(tmp_path / "records")
+    with SimRecords.RecordWriter(Directory, {"TIS": "f8"}, ChunkSize=4) as Writer:
+        for Rep in Data:
+            Writer.Write(Rep, Data[Rep][0])
+    FileName = str(tmp_path / "TISdata.csv")
+    SimRecords.ToCSV(Directory, FileName, "TIS", Reps=range(5))
+    with open(FileName, newline="") as f:
+        Rows = list(csv.reader(f))
+    assert len(Rows) == 5 and Rows[1] == []
+    for Rep in Data:
+        assert [float(x) for x in Rows[Rep]] == Data[Rep][0].tolist()
+    SimRecords.ToCSV(Directory, FileName, "TIS")
+    with open(FileName, newline="") as f:
+        assert len(list(csv.reader(f))) == 4
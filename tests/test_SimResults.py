@@ -0,0 +1,276 @@
+import asyncio
+import math
+import time
+
+import numpy as np
+import pytest
+
+from pythonsim import SimClasses
+from pythonsim import SimResults
+from pythonsim import SimRNG
+
+###############################################################
+
+# Student t quantiles from a printed table (e.g. Law, Simulation
+#   Modeling and Analysis, Table T.1), to the digits given there
+
+###############################################################
+
+@pytest.mark.parametrize("p, df, expected", [
+    (0.95, 1, 6.314), (0.975, 1, 12.706), (0.995, 1, 63.657),
+    (0.975, 2, 4.303), (0.95, 5, 2.015), (0.975, 5, 2.571),
+    (0.9, 10, 1.372), (0.975, 10, 2.228), (0.995, 20, 2.845),
+    (0.975, 30, 2.042), (0.95, 60, 1.671), (0.975, 120, 1.980)])
+def test_TQuantile_table(p, df, expected):
+    assert SimResults.TQuantile(p, df) == pytest.approx(expected, abs=5e-4)
+
+def test_TQuantile_symmetry_and_normal_limit():
+    assert SimResults.TQuantile(0.025, 7) == -SimResults.TQuantile(0.975, 7)
+    assert SimResults.TQuantile(0.5, 3) == pytest.approx(0.0, abs=1e-12)
+    assert SimResults.TQuantile(0.975, 1e6) == pytest.approx(SimResults.NormalQuantile(0.975), abs=1e-5)
+    assert SimResults.NormalQuantile(0.975) == pytest.approx(1.959964, abs=1e-6)
+
+def test_TQuantile_inverts_TCDF():
+    for df in (1, 2.5, 9, 44):
+        for p in (0.6, 0.9, 0.99):
+            assert SimResults.TCDF(SimResults.TQuantile(p, df), df) == pytest.approx(p, abs=1e-12)
+
+def test_ReplicationResults_halfwidth():
+    Results = SimResults.ReplicationResults(4, Names=["X", "Y"])
+    Data = [[1.0, 10.0], [2.0, 12.0], [4.0, 11.0], [5.0, 15.0], [3.0, 13.0]]
+    for row in Data:
+        Results.Record(row)
+    Data = np.array(Data)
+    assert Results.N() == 5
+    assert np.allclose(Results.Mean(), Data.mean(axis=0))
+    expected = 2.776 * Data.std(axis=0, ddof=1) / math.sqrt(5)
+    assert np.allclose(Results.HalfWidth(), expected, rtol=2e-4)
+
+###############################################################
+
+# Batch means: nonoverlapping (Fixed) and overlapping (OBM)
+
+###############################################################
+
+def AR1(n, phi, seed):
+    # stationary AR(1) series with unit-variance noise; its variance
+    #   parameter (n times the variance of the mean) is 1 / (1 - phi)**2
+    rng = np.random.default_rng(seed)
+    e = rng.standard_normal(n)
+    x = np.empty(n)
+    x[0] = e[0] / math.sqrt(1.0 - phi * phi)
+    for i in range(1, n):
+        x[i] = phi * x[i-1] + e[i]
+    return x
+
+def test_BatchMeansCI_fixed_formula():
+    x = AR1(1000, 0.3, 1)
+    mean, halfwidth, b = SimResults.BatchMeansCI(x, NumBatches=20)
+    Y = x.reshape(20, 50).mean(axis=1)
+    assert b == 50
+    assert mean == pytest.approx(x.mean())
+    assert halfwidth == pytest.approx(SimResults.TQuantile(0.975, 19) * Y.std(ddof=1) / math.sqrt(20))
+
+def test_BatchMeansCI_overlapping_formula():
+    # OBM variance estimator written out batch by batch
+    x = AR1(600, 0.3, 2)
+    n, b = len(x), 30
+    mean, halfwidth, BatchSize = SimResults.BatchMeansCI(x, NumBatches=n // b, Method="Overlapping")
+    Y = np.array([x[j:j+b].mean() for j in range(n - b + 1)])
+    variance = n * b / ((n - b + 1) * (n - b)) * np.sum((Y - x.mean()) ** 2)
+    df = 1.5 * (n / b - 1)
+    assert BatchSize == b
+    assert mean == pytest.approx(x.mean())
+    assert halfwidth == pytest.approx(SimResults.TQuantile(0.975, df) * math.sqrt(variance / n))
+
+def test_BatchMeansCI_overlapping_batch_of_one():
+    # with b = 1 the OBM estimator is the sample variance
+    x = AR1(200, 0.0, 3)
+    mean, halfwidth, b = SimResults.BatchMeansCI(x, NumBatches=200, Method="Overlapping")
+    expected = SimResults.TQuantile(0.975, 1.5 * 199) * x.std(ddof=1) / math.sqrt(200)
+    assert b == 1
+    assert halfwidth == pytest.approx(expected)
+
+def test_BatchMeansCI_overlapping_variance_parameter():
+    # averaged over series, the OBM estimate of n * Var(mean) is close
+    #   to the variance parameter of the AR(1) series
+    phi, n, b = 0.5, 20000, 400
+    estimates = []
+    for seed in range(10):
+        x = AR1(n, phi, 10 + seed)
+        mean, halfwidth, BatchSize = SimResults.BatchMeansCI(x, NumBatches=n // b, Method="Overlapping")
+        t = SimResults.TQuantile(0.975, 1.5 * (n / b - 1))
+        estimates.append(n * (halfwidth / t) ** 2)
+    assert np.mean(estimates) == pytest.approx(1.0 / (1.0 - phi) ** 2, rel=0.1)
+
+def test_SelectBatchSize_grows_with_correlation():
+    assert SimResults.SelectBatchSize(AR1(4000, 0.0, 4)) <= 2
+    assert SimResults.SelectBatchSize(AR1(4000, 0.9, 5)) >= 8
+
+def test_DTStat_BatchMeansCI_uses_observations():
+    Stat = SimClasses.DTStat()
+    Stat.KeepObservations()
+    x = AR1(500, 0.4, 6)
+    for value in x:
+        Stat.Record(value)
+    for Method in ("Fixed", "Overlapping"):
+        assert Stat.BatchMeansCI(NumBatches=10, Method=Method) == SimResults.BatchMeansCI(x, NumBatches=10, Method=Method)
+    SimClasses.DTStat.InstanceList.remove(Stat)
+
+###############################################################
+
+# Streaming replications
+
+###############################################################
+
+def ToyReplication(Rep):
+    # a replication whose outputs depend only on its streams
+    X = [SimRNG.Expon(1.0, 1) for i in range(50)]
+    return [float(np.mean(X)), SimRNG.Uniform(0.0, 1.0, 2)]
+
+Names = ["Mean", "U"]
+
+def test_RunStreaming_equals_RunReplications():
+    Streamed = asyncio.run(SimResults.RunStreaming(ToyReplication, Names, 30))
+    Batch = SimResults.RunReplications(ToyReplication, Names, 30)
+    assert Streamed.N() == 30
+    assert np.array_equal(Streamed.Data[:30], Batch.Data[:30])
+
+def test_StopWhenConverged_matches_RunSequential():
+    Spacing = SimRNG.ReplicationSpacing(2, 50)
+    Consumers = [SimResults.StopWhenConverged(RelativeError=0.05, Every=20)]
+    Streamed = asyncio.run(SimResults.RunStreaming(ToyReplication, Names, 10000, Consumers, Spacing=Spacing))
+    Sequential = SimResults.RunSequential(ToyReplication, Names, RelativeError=0.05, BatchSize=20, Spacing=Spacing)
+    assert Streamed.N() == Sequential.N() < 10000
+    assert Streamed.N() % 20 == 0
+    assert np.array_equal(Streamed.Data[:Streamed.N()], Sequential.Data[:Sequential.N()])
+
+def test_thread_replications_wait_for_the_consumers():
+    # with Workers 1 the replications run in a thread of this process,
+    #   so none may change the model while a consumer runs
+    Running = []
+    def Replication(Rep):
+        Running.append(Rep)
+        try:
+            time.sleep(0.01)
+            return ToyReplication(Rep)
+        finally:
+            Running.remove(Rep)
+    async def Consumer(Results, Rep, Values):
+        await asyncio.sleep(0.01)
+        assert Running == []
+    Streamed = asyncio.run(SimResults.RunStreaming(Replication, Names, 8, [Consumer]))
+    Batch = SimResults.RunReplications(ToyReplication, Names, 8)
+    assert np.array_equal(Streamed.Data[:8], Batch.Data[:8])
+
+def test_AppendCSV_writes_ToCSV_rows(tmp_path):
+    Streamed = asyncio.run(SimResults.RunStreaming(ToyReplication, Names, 12,
+        [SimResults.AppendCSV(str(tmp_path / "streamed.csv"))]))
+    Streamed.ToCSV(str(tmp_path / "results.csv"))
+    assert (tmp_path / "streamed.csv").read_text() == (tmp_path / "results.csv").read_text()
+
+###############################################################
+
+# Replication spacing and stopping targets
+
+###############################################################
+
+def test_runners_go_past_214_replications():
+    # the default Spacing shrinks so that all replications fit
+    NumReps = 300
+    Spacing = SimRNG.SpacingFor(NumReps)
+    assert Spacing < SimRNG.REPLICATION_SPACING
+    Batch = SimResults.RunReplications(ToyReplication, Names, NumReps)
+    assert Batch.N() == NumReps
+    for Rep in (0, 214, 299):
+        SimRNG.SeedReplication(Rep, Spacing)
+        assert Batch.Data[Rep].tolist() == ToyReplication(Rep)
+    Streamed = asyncio.run(SimResults.RunStreaming(ToyReplication, Names, NumReps))
+    Sequential = SimResults.RunSequential(ToyReplication, Names, HalfWidth=1e-9, MaxReps=NumReps)
+    for Results in (Streamed, Sequential):
+        assert np.array_equal(Results.Data[:NumReps], Batch.Data[:NumReps])
+
+def test_too_large_Spacing_raises_before_running():
+    Calls = []
+    def Replication(Rep):
+        Calls.append(Rep)
+        return ToyReplication(Rep)
+    with pytest.raises(ValueError):
+        SimResults.RunReplications(Replication, Names, 300, Spacing=SimRNG.REPLICATION_SPACING)
+    with pytest.raises(ValueError):
+        SimResults.RunScenarios(lambda: None, Replication, Names, [{}], 300, Spacing=SimRNG.REPLICATION_SPACING)
+    assert Calls == []
+
+def test_no_precision_target_raises():
+    with pytest.raises(ValueError):
+        SimResults.RunSequential(ToyReplication, Names, MaxReps=200)
+    with pytest.raises(ValueError):
+        SimResults.StopWhenConverged()
+    Results = SimResults.RunReplications(ToyReplication, Names, 10)
+    with pytest.raises(ValueError):
+        SimResults.Converged(Results, [None, None], None, 0.05)
+    # outputs without a target are ignored
+    assert SimResults.Converged(Results, [None, 10.0], None, 0.05)
+
+###############################################################
+
+# Checkpoints
+
+###############################################################
+
+def test_checkpoint_round_trip(tmp_path):
+    FileName = str(tmp_path / "checkpoint.npz")
+    Results = SimResults.RunReplications(ToyReplication, Names, 7)
+    Seeds = list(SimRNG.ZRNG)
+    SimResults.SaveCheckpoint(FileName, Results, 7)
+    SimRNG.SeedReplication(100)
+    Loaded, NextRep, Ended = SimResults.LoadCheckpoint(FileName)
+    assert Loaded.Names == Names and (NextRep, Ended) == (7, False)
+    assert np.array_equal(Loaded.Data[:Loaded.N()], Results.Data[:7])
+    assert SimRNG.ZRNG == Seeds
+
+def test_checkpoint_unknown_version(tmp_path):
+    FileName = str(tmp_path / "checkpoint.npz")
+    np.savez(FileName, version=SimResults.CHECKPOINT_VERSION + 1)
+    with pytest.raises(ValueError):
+        SimResults.LoadCheckpoint(FileName)
+
+class Interrupted(Exception):
+    pass
+
+def InterruptAt(n):
+    def Consumer(Results, Rep, Values):
+        if Results.N() == n:
+            raise Interrupted()
+    return Consumer
+
+@pytest.mark.parametrize("Spacing", [SimRNG.REPLICATION_SPACING, None])
+def test_resume_equals_uninterrupted_run(tmp_path, Spacing):
+    # with Spacing None the streams run on from one replication to the
+    #   next, so resuming needs the seeds saved in the checkpoint
+    FileName = str(tmp_path / "checkpoint.npz")
+    SimRNG.ZRNG[:] = SimRNG.InitializeRNSeed()
+    Full = asyncio.run(SimResults.RunStreaming(ToyReplication, Names, 40, Spacing=Spacing))
+    SimRNG.ZRNG[:] = SimRNG.InitializeRNSeed()
+    with pytest.raises(Interrupted):
+        asyncio.run(SimResults.RunStreaming(ToyReplication, Names, 40, [InterruptAt(25)],
+            Spacing=Spacing, Checkpoint=FileName, CheckpointEvery=10))
+    SimRNG.SeedReplication(100)
+    CSV = str(tmp_path / "resumed.csv")
+    Resumed = asyncio.run(SimResults.RunStreaming(ToyReplication, Names, 40, [SimResults.AppendCSV(CSV)],
+        Spacing=Spacing, Checkpoint=FileName, CheckpointEvery=10, Resume=True))
+    assert Resumed.N() == 40
+    assert np.array_equal(Resumed.Data[:40], Full.Data[:40])
+    Full.ToCSV(str(tmp_path / "full.csv"))
+    # AppendCSV starts the file of a resumed run with the earlier rows
+    assert (tmp_path / "resumed.csv").read_text() == (tmp_path / "full.csv").read_text()
+    # an ended run is not continued
+    Again = asyncio.run(SimResults.RunStreaming(ToyReplication, Names, 60,
+        Spacing=Spacing, Checkpoint=FileName, Resume=True))
+    assert Again.N() == 40
+
+def test_resume_from_other_experiment(tmp_path):
+    FileName = str(tmp_path / "checkpoint.npz")
+    SimResults.SaveCheckpoint(FileName, SimResults.RunReplications(ToyReplication, Names, 3), 3)
+    with pytest.raises(ValueError):
+        asyncio.run(SimResults.RunStreaming(ToyReplication, ["A", "B"], 10, Checkpoint=FileName, Resume=True))
@@ -0,0 +1,186 @@
+import numpy as np
+import pytest
+
+from pythonsim import SimClasses
+from pythonsim import SimFunctions
+from pythonsim import SimRNG
+from pythonsim import SimVector
+
+@pytest.fixture(autouse=True)
+def DefaultSeeds():
+    SimRNG.ZRNG[:] = SimRNG.InitializeRNSeed()
+    yield
+    SimRNG.ZRNG[:] = SimRNG.InitializeRNSeed()
+
+def EventFIFO(NumCustomers, NumServers, MeanTBA, MeanST):
+    # event-driven FIFO queue with NumServers servers that draws
+    #   interarrival times from stream 1 and service times from stream
+    #   2, one per customer in arrival order as the Block generators
+    #   do; returns the waiting time in queue of every customer
+    Calendar = SimClasses.EventCalendar()
+    Queue = SimClasses.FIFOQueue()
+    Server = SimClasses.Resource()
+    Server.SetUnits(NumServers)
+    SimFunctions.SimFunctionsInit(Calendar)
+    Waits = np.empty(NumCustomers)
+    Arrived = [0]
+
+    def StartService(Customer):
+        Waits[Customer.ID] = SimClasses.Clock - Customer.CreateTime
+        SimFunctions.SchedulePlus(Calendar, "EndOfService", Customer.Service, Customer)
+
+    SimFunctions.Schedule(Calendar, "Arrival", SimRNG.Expon(MeanTBA, 1))
+    while Calendar.N() > 0:
+        Event = Calendar.Remove()
+        SimClasses.Clock = Event.EventTime
+        if Event.EventType == "Arrival":
+            Customer = SimClasses.Entity()
+            Customer.ID = Arrived[0]
+            Customer.Service = SimRNG.Expon(MeanST, 2)
+            Arrived[0] += 1
+            if Arrived[0] < NumCustomers:
+                SimFunctions.Schedule(Calendar, "Arrival", SimRNG.Expon(MeanTBA, 1))
+            if Server.Seize(1):
+                StartService(Customer)
+            else:
+                Queue.Add(Customer)
+        elif Queue.NumQueue() > 0:
+            StartService(Queue.Remove())
+        else:
+            Server.Free(1)
+    for Instances in (SimClasses.FIFOQueue, SimClasses.Resource):
+        Instances.InstanceList.pop()
+    return Waits
+
+###############################################################
+
+# Lindley recursion against the event loop
+
+###############################################################
+
+def test_Lindley_equals_recursion():
+    A = SimRNG.ExponBlock(1.0, 1, (3, 400))
+    S = SimRNG.ExponBlock(0.9, 2, (3, 400))
+    W = SimVector.Lindley(A, S)
+    for r in range(3):
+        w = 0.0
+        for i in range(1, 400):
+            w = max(0.0, w + S[r, i-1] - A[r, i])
+            assert W[r, i] == pytest.approx(w, abs=1e-9)
+    assert np.all(W[:, 0] == 0.0)
+
+def test_Lindley_equals_event_loop():
+    A = SimRNG.ExponBlock(1.0, 1, 2000)
+    S = SimRNG.ExponBlock(0.9, 2, 2000)
+    SimRNG.ZRNG[:] = SimRNG.InitializeRNSeed()
+    assert np.allclose(SimVector.Lindley(A, S), EventFIFO(2000, 1, 1.0, 0.9), atol=1e-9)
+
+def test_SingleServerFIFO_statistics():
+    Outputs = SimVector.SingleServerFIFO(4, 300, lambda Size: SimRNG.ExponBlock(1.0, 1, Size),
+        lambda Size: SimRNG.ExponBlock(0.8, 2, Size), WarmUp=50, BlockReps=3)
+    SimRNG.ZRNG[:] = SimRNG.InitializeRNSeed()
+    W = SimVector.Lindley(SimRNG.ExponBlock(1.0, 1, (4, 300)), SimRNG.ExponBlock(0.8, 2, (4, 300)))[:, 50:]
+    assert np.allclose(Outputs["Mean"], W.mean(axis=1))
+    assert np.allclose(Outputs["StdDev"], W.std(axis=1, ddof=1))
+    assert np.all(Outputs["N"] == 250)
+
+###############################################################
+
+# Kiefer-Wolfowitz recursion against the event loop
+
+###############################################################
+
+def test_KieferWolfowitz_one_server_is_Lindley():
+    A = SimRNG.ExponBlock(1.0, 1, (2, 500))
+    S = SimRNG.ExponBlock(0.95, 2, (2, 500))
+    assert np.allclose(SimVector.KieferWolfowitz(A, S, 1), SimVector.Lindley(A, S), atol=1e-9)
+
+@pytest.mark.parametrize("NumServers", [2, 3, 5])
+def test_KieferWolfowitz_equals_event_loop(NumServers):
+    MeanST = 0.9 * NumServers
+    A = SimRNG.ExponBlock(1.0, 1, 2000)
+    S = SimRNG.ExponBlock(MeanST, 2, 2000)
+    SimRNG.ZRNG[:] = SimRNG.InitializeRNSeed()
+    Waits = EventFIFO(2000, NumServers, 1.0, MeanST)
+    assert np.allclose(SimVector.KieferWolfowitz(A, S, NumServers), Waits, atol=1e-9)
+    assert np.count_nonzero(Waits) > 1000
+
+###############################################################
+
+# Vector engines against the event loop, in distribution
+
+###############################################################
+
+def SameDistribution(X, Y):
+    # two independent samples of a replication output: the difference
+    #   of the means within 4 standard errors, and the two-sample
+    #   Kolmogorov-Smirnov statistic below its 0.001 critical value
+    X = np.sort(np.asarray(X, dtype=float))
+    Y = np.sort(np.asarray(Y, dtype=float))
+    n, m = len(X), len(Y)
+    Mean = abs(X.mean() - Y.mean()) < 4 * np.sqrt(X.var(ddof=1) / n + Y.var(ddof=1) / m)
+    Points = np.concatenate((X, Y))
+    D = np.max(np.abs(np.searchsorted(X, Points, side="right") / n - np.searchsorted(Y, Points, side="right") / m))
+    return Mean and D < 1.95 * np.sqrt((n + m) / (n * m))
+
+def EventInfiniteServer(RunLength, MeanTBA, MeanST):
+    # event-driven infinite-server system with interarrival times from
+    #   stream 1 and sojourn times from stream 2; returns the outputs of
+    #   SimVector.InfiniteServer for one replication
+    Calendar = SimClasses.EventCalendar()
+    Number = SimClasses.CTStat()
+    TimeSpent = SimClasses.DTStat()
+    SimFunctions.SimFunctionsInit(Calendar)
+    InSystem = NumArrivals = MaxOccupancy = 0
+    SimFunctions.Schedule(Calendar, "Arrival", SimRNG.Expon(MeanTBA, 1))
+    SimFunctions.Schedule(Calendar, "EndSimulation", RunLength)
+    while Calendar.N() > 0:
+        Event = Calendar.Remove()
+        SimClasses.Clock = Event.EventTime
+        if Event.EventType == "EndSimulation":
+            break
+        if Event.EventType == "Arrival":
+            InSystem += 1
+            NumArrivals += 1
+            MaxOccupancy = max(MaxOccupancy, InSystem)
+            SimFunctions.SchedulePlus(Calendar, "Departure", SimRNG.Expon(MeanST, 2), SimClasses.Clock)
+            SimFunctions.Schedule(Calendar, "Arrival", SimRNG.Expon(MeanTBA, 1))
+        else:
+            InSystem -= 1
+            TimeSpent.Record(SimClasses.Clock - Event.WhichObject)
+        Number.Record(InSystem)
+    Outputs = {"MaxOccupancy": MaxOccupancy, "TimeAverage": Number.Mean(), "TimeSpent": TimeSpent.Mean(),
+        "NumArrivals": NumArrivals, "NumInSystem": InSystem}
+    for Instances in (SimClasses.CTStat, SimClasses.DTStat):
+        Instances.InstanceList.pop()
+    return Outputs
+
+def test_InfiniteServer_distribution_equals_event_loop():
+    NumReps, RunLength, MeanST = 400, 30.0, 4.0
+    Spacing = SimRNG.SpacingFor(NumReps)
+    Seeds = SimRNG.SeedBlock(3, 0, NumReps, Spacing)
+    Arrivals = SimVector.GenerateArrivals(NumReps, RunLength, lambda Now: SimRNG.ExponBlock(1.0, Seeds, 1)[:, 0])
+    Vector = SimVector.InfiniteServer(Arrivals, SimRNG.ExponBlock(MeanST, 4, Arrivals.shape), RunLength)
+    Event = []
+    for Rep in range(NumReps):
+        SimRNG.SeedReplication(Rep, Spacing)
+        Event.append(EventInfiniteServer(RunLength, 1.0, MeanST))
+    for Name in Vector:
+        assert SameDistribution(Vector[Name], [Outputs[Name] for Outputs in Event]), Name
+    # M/M/infinity from empty: mean number in system 4 (1 - exp(-t/4)) at time t
+    Expected = MeanST * (1 - MeanST / RunLength * (1 - np.exp(-RunLength / MeanST)))
+    assert Vector["TimeAverage"].mean() == pytest.approx(Expected, rel=0.05)
+
+@pytest.mark.parametrize("NumServers", [2, 4])
+def test_MultiServerFIFO_distribution_equals_event_loop(NumServers):
+    NumReps, NumCustomers, WarmUp, MeanST = 200, 300, 50, 0.8 * NumServers
+    Spacing = SimRNG.SpacingFor(NumReps)
+    Vector = SimVector.MultiServerFIFO(NumReps, NumCustomers, NumServers,
+        lambda Size: SimRNG.ExponBlock(1.0, 3, Size), lambda Size: SimRNG.ExponBlock(MeanST, 4, Size), WarmUp)
+    Event = []
+    for Rep in range(NumReps):
+        SimRNG.SeedReplication(Rep, Spacing)
+        Waits = EventFIFO(NumCustomers, NumServers, 1.0, MeanST)[WarmUp:]
+        Event.append([Waits.mean(), Waits.std(ddof=1), Waits.max()])
+    for Name, Column in zip(["Mean", "StdDev", "Max"], np.transpose(Event)):
+        assert SameDistribution(Vector[Name], Column), Name
@@ -0,0 +1,86 @@
+import math
+
+import numpy as np
+import pytest
+
+from pythonsim import SimClasses
+from pythonsim import SimFunctions
+from pythonsim import SimWarmup
+
+def Transient(t, Noise):
+    # mean 10 exp(-t/10) above a steady state of 0, i.e. within
+    #   0.1 of steady state after about 46 time units
+    return 10.0 * math.exp(-t / 10.0) + Noise
+
+def RunPilot(calendar, Stat, Seed, RunLength, Step=0.25):
+    # one pilot replication: Stat records Transient every Step time
+    #   units, and statistics are never cleared
+    rng = np.random.default_rng(Seed)
+    SimFunctions.SimFunctionsInit(calendar)
+    SimFunctions.Schedule(calendar, "End", RunLength)
+    SimFunctions.Schedule(calendar, "Change", 0.0)
+    while True:
+        Event = calendar.Remove()
+        SimClasses.Clock = Event.EventTime
+        if Event.EventType == "End":
+            break
+        Stat.Record(Transient(SimClasses.Clock, rng.normal(0.0, 1.0)))
+        SimFunctions.Schedule(calendar, "Change", Step)
+
+###############################################################
+
+# Warm-up from CTStat.KeepTrajectory
+
+###############################################################
+
+def test_Ensemble_of_KeepTrajectory_path(Calendar):
+    Stat = SimClasses.CTStat()
+    Stat.KeepTrajectory(1.0)
+    for Seed, RunLength in [(1, 300.5), (2, 250.5), (3, 300.5)]:
+        RunPilot(Calendar, Stat, Seed, RunLength)
+    Data = SimWarmup.Ensemble(Stat.Path)
+    # one column per batch of the longest replication, NaN where a
+    #   replication ended first
+    assert Data.shape == (3, 300)
+    assert np.isnan(Data[1, 250:]).all() and not np.isnan(Data[1, :250]).any()
+    assert not np.isnan(Data[[0, 2]]).any()
+
+def test_Recommend_on_KeepTrajectory_path(Calendar):
+    Stat = SimClasses.CTStat()
+    Stat.KeepTrajectory(1.0)
+    for Seed in range(5):
+        RunPilot(Calendar, Stat, Seed, 400.0)
+    Recommended = SimWarmup.Recommend(Stat.Path)
+    assert 15.0 <= Recommended["MSER"] <= 100.0
+    assert 15.0 <= Recommended["Welch"] <= 100.0
+    assert Recommended["WarmUp"] == max(Recommended["MSER"], Recommended["Welch"])
+
+###############################################################
+
+# Warm-up from a DTStat Trajectory
+
+###############################################################
+
+def test_Recommend_on_DTStat_trajectory(Calendar):
+    Stat = SimClasses.DTStat()
+    Path = SimClasses.Trajectory(Stat, 2.0, 200)
+    for Seed in range(5):
+        RunPilot(Calendar, Stat, Seed, 450.0)
+    Data = SimWarmup.Ensemble(Path)
+    assert Data.shape == (5, 200) and not np.isnan(Data).any()
+    Recommended = SimWarmup.Recommend(Path)
+    assert 15.0 <= Recommended["MSER"] <= 100.0
+    assert 15.0 <= Recommended["Welch"] <= 100.0
+
+def test_MSER_and_Welch_without_transient():
+    rng = np.random.default_rng(7)
+    Data = rng.normal(0.0, 1.0, (5, 400))
+    assert SimWarmup.MSER(Data.mean(axis=0)) <= 40
+    assert SimWarmup.Welch(Data, 20) <= 40
+
+def test_MSER_finds_a_step():
+    # a step of 5 over the first 100 values, then noise
+    rng = np.random.default_rng(3)
+    Series = rng.normal(0.0, 0.5, 1000)
+    Series[:100] += 5.0
+    assert SimWarmup.MSER(Series) == 100
@@ -0,0 +1,75 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT
+import bench
+from pythonsim import SimClasses
+
+def Result(Rate):
+    return {"ops": 100, "seconds": 100 / Rate, "rate": Rate}
+
+###############################################################
+
+# Results and regressions
+
+###############################################################
+
+def test_Compare_flags_drops_beyond_threshold():
+    Baseline = {"a": Result(100.0), "b": Result(100.0), "c": Result(100.0), "gone": Result(1.0),
+        "broken": Result(1.0)}
+    Results = {"a": Result(85.0), "b": Result(75.0), "c": Result(300.0), "new": Result(1.0),
+        "broken": {"error": "ImportError"}}
+    Table, Regressions = bench.Compare(Results, Baseline, 0.20)
+    assert Regressions == ["b"]
+    Rows = {line.split()[0]: line for line in Table.splitlines()[1:]}
+    assert set(Rows) == {"a", "b", "c"}
+    assert Rows["b"].endswith("REGRESSION") and "-25.0%" in Rows["b"]
+    assert Rows["c"].endswith("200.0%")
+
+def test_Table_reports_failed_models():
+    Lines = bench.Table({"rng.Expon": Result(1000.0), "model.sim3": {"error": "ValueError: x"}}).splitlines()
+    assert Lines[1].split()[:2] == ["rng.Expon", "100"]
+    assert Lines[2].split()[1:] == ["failed:", "ValueError:", "x"]
+
+###############################################################
+
+# Benchmarks
+
+###############################################################
+
+def test_RunPrimitives_leaves_no_model_objects():
+    Lengths = [len(Class.InstanceList) for Class in (SimClasses.FIFOQueue, SimClasses.CTStat, SimClasses.DTStat)]
+    Results = bench.RunPrimitives(0.001, 1)
+    assert "calendar.hold[1000]" in Results and "rng.PiecewiseLinearBlock" in Results
+    assert all(Value["rate"] > 0 and Value["ops"] >= 100 for Value in Results.values())
+    assert [len(Class.InstanceList) for Class in (SimClasses.FIFOQueue, SimClasses.CTStat,
+        SimClasses.DTStat)] == Lengths
+
+@pytest.mark.parametrize("Name", list(bench.MODELS))
+def test_every_model_runs(Name):
+    process = subprocess.run([sys.executable, os.path.join(ROOT, "bench.py"), "--model", Name,
+        "--model-reps", "1"], capture_output=True, text=True, cwd=ROOT)
+    assert process.returncode == 0, process.stderr
+    Result = json.loads(process.stdout.strip().splitlines()[-1])
+    assert Result["reps"] == 1 and Result["ops"] > 0 and Result["rate"] > 0
+
+def test_compare_exits_with_status_1_on_regression(tmp_path):
+    # a baseline far faster than any machine, and one far slower
+    Command = [sys.executable, os.path.join(ROOT, "bench.py"), "--only", "primitives",
+        "--scale", "0.001", "--repeat", "1", "--output", str(tmp_path / "current.json")]
+    assert subprocess.run(Command, capture_output=True, cwd=ROOT).returncode == 0
+    with open(tmp_path / "current.json") as f:
+        Saved = json.load(f)
+    assert set(Saved) == {"meta", "results"} and "python" in Saved["meta"]
+    for Factor, Status in [(1e6, 1), (1e-6, 0)]:
+        Baseline = {"results": {name: Result(Value["rate"] * Factor) for name, Value in Saved["results"].items()}}
+        with open(tmp_path / "baseline.json", "w") as f:
+            json.dump(Baseline, f)
+        process = subprocess.run(Command[:-2] + ["--compare", str(tmp_path / "baseline.json")],
+            capture_output=True, text=True, cwd=ROOT)
+        assert process.returncode == Status
+        assert ("regression(s) beyond 20%" in process.stdout) == (Status == 1)
@@ -0,0 +1,146 @@
+# The example models: vectorized and event-driven engines that share
+#   random numbers give the same replications
+import argparse
+import importlib.util
+import os
+import sys
+
+import numpy as np
+import pytest
+
+from conftest import ROOT
+from pythonsim import SimCompiled
+from pythonsim import SimRecords
+from pythonsim import SimResults
+from pythonsim import SimRNG
+
+@pytest.fixture(autouse=True)
+def DefaultSeeds():
+    SimRNG.ZRNG[:] = SimRNG.InitializeRNSeed()
+    yield
+    SimRNG.ZRNG[:] = SimRNG.InitializeRNSeed()
+
+def LoadModel(Folder, File):
+    # imports a model script under a name of its own, from its folder
+    #   (the scripts read their inputs from relative paths)
+    Path = os.path.join(ROOT, Folder, File)
+    spec = importlib.util.spec_from_file_location("{}_{}".format(Folder, File[:-3]), Path)
+    model = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(model)
+    return model
+
+###############################################################
+
+# hw3: parking garage (M/G/infinity)
+
+###############################################################
+
+@pytest.mark.parametrize("stationary", [True, False])
+def test_hw3_vector_equals_seeded_event(monkeypatch, stationary):
+    monkeypatch.chdir(os.path.join(ROOT, "hw3"))
+    model = LoadModel("hw3", "sim.py")
+    args = argparse.Namespace(stationary=stationary, runlength=24, numreps=20, engine="event")
+    Event = model.Simulation(args)
+    Event.run_event(Event.Spacing)
+    Vector = model.Simulation(args)
+    Vector.run_vector()
+    # the number of cars over time is the same; TimeSpent is not, as
+    #   run_event takes every departing car from the front of ParkingLot
+    assert np.array_equal(Event.MaxCarsAvg, Vector.MaxCarsAvg)
+    assert np.allclose(Event.NumCarsAvg, Vector.NumCarsAvg, rtol=1e-9)
+
+###############################################################
+
+# Lab3: two multi-server stations (Kiefer-Wolfowitz)
+
+###############################################################
+
+def test_Lab3_vector_agrees_with_event_in_distribution(monkeypatch, tmp_path):
+    # RunVector reads the type stream in another order than the event
+    #   loop, so the engines agree in distribution only: the means of
+    #   their replication averages differ by less than three standard
+    #   errors of the difference
+    monkeypatch.chdir(os.path.join(ROOT, "Lab3"))
+    model = LoadModel("Lab3", "lab3.py")
+    model.Writer = SimRecords.RecordWriter(str(tmp_path / "TISdata"), {"TIS": "f8"})
+    model.RunEvent(SimRNG.REPLICATION_SPACING)
+    Event = np.array(model.WaitTimeAvg)
+    model.WaitTimeAvg.clear()
+    model.RunVector()
+    Vector = np.array(model.WaitTimeAvg)
+    model.Writer.Close()
+    assert len(Event) == len(Vector) == model.NumReps
+    Difference = Event - Vector
+    assert abs(Difference.mean()) < 3 * Difference.std(ddof=1) / np.sqrt(len(Difference))
+
+###############################################################
+
+# Project1-3: sim3 and its variants
+
+###############################################################
+
+@pytest.fixture(scope="module")
+def sim3():
+    Folder = os.path.join(ROOT, "Project1-3")
+    sys.path.insert(0, Folder)
+    import sim3
+    yield sim3
+    sys.path.remove(Folder)
+
+def test_sim3_Replication_writes_records(sim3, tmp_path):
+    SimRNG.SeedReplication(0, sim3.Spacing)
+    Output = sim3.Replication(0)
+    with SimRecords.RecordWriter(str(tmp_path / "TISdata"), {"TIS": "f8"}) as Writer:
+        SimRNG.SeedReplication(0, sim3.Spacing)
+        assert sim3.Replication(0, Writer=Writer) == Output
+    Records = SimRecords.ReadRecords(str(tmp_path / "TISdata"))
+    assert len(Records["TIS"]) > 0 and np.all(Records["Rep"] == 0)
+    assert np.all(Records["TIS"] > 0)
+
+def test_sim3_scenarios_use_common_random_numbers(sim3):
+    # every customer's times come from streams 1 to 3 in arrival order,
+    #   so scenarios with other staffing or service times draw exactly
+    #   the same random numbers
+    Seeds = []
+    try:
+        for Parameters in SimResults.ParameterGrid({"CallCenterUnits": [5, 7], "MeanOT": [1.2, 1.41]}):
+            sim3.Setup(**Parameters)
+            SimRNG.SeedReplication(2, sim3.Spacing)
+            sim3.Replication(2)
+            Seeds.append(SimRNG.ZRNG[:3])
+    finally:
+        sim3.Setup()
+    assert all(s == Seeds[0] for s in Seeds)
+
+def test_sim3_RunScenarios_pairs_replications(sim3, tmp_path):
+    Names = ["WaitTimeAvg", "SpendTimeMoreThanSeven"]
+    Scenarios = SimResults.ParameterGrid({"CallCenterUnits": [6, 7]})
+    try:
+        Results = SimResults.RunScenarios(sim3.Setup, sim3.Replication, Names, Scenarios, 4,
+            Spacing=sim3.Spacing, BlockSize=3)
+        sim3.Setup(CallCenterUnits=6)
+        Single = SimResults.RunReplications(sim3.Replication, Names, 4, Spacing=sim3.Spacing)
+    finally:
+        sim3.Setup()
+    assert np.array_equal(Results[0].Data[:4], Single.Data[:4])
+    Difference = SimResults.PairedDifference(Results[1], Results[0])
+    assert np.array_equal(Difference.Data[:4], Results[1].Data[:4] - Results[0].Data[:4])
+    SimResults.ScenariosToCSV(str(tmp_path / "sweep.csv"), Scenarios, Results)
+    Lines = (tmp_path / "sweep.csv").read_text().splitlines()
+    assert Lines[0] == "Scenario,CallCenterUnits,Rep,WaitTimeAvg,SpendTimeMoreThanSeven"
+    assert len(Lines) == 9 and Lines[5].startswith("1,7,0,")
+
+def test_sim3_variants_equal_sim3(sim3):
+    import sim3_compiled
+    import sim3_process
+    for Rep in range(3):
+        SimRNG.SeedReplication(Rep, sim3.Spacing)
+        Output = sim3.Replication(Rep)
+        SimRNG.SeedReplication(Rep, sim3.Spacing)
+        assert sim3_process.Replication(Rep) == Output
+        assert all(Window.ProcessQueue is None for Window in sim3.BranchWindows + [sim3.CallCenter])
+        SimRNG.SeedReplication(Rep, sim3.Spacing)
+        Compiled = sim3_compiled.RunReplication(SimCompiled.Seeds(), np.array(sim3.MeanTBA), sim3.MeanOT,
+            sim3.MeanMT, sim3.CallCenterUnits, float(sim3.RunLength), float(sim3.WarmUp),
+            sim3.ArrivalStream, sim3.OrderStream, sim3.MoveStream)
+        assert np.allclose(Compiled, Output, rtol=1e-9, atol=0.0)
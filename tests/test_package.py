@@ -0,0 +1,55 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT
+import pythonsim
+
+def Modules(Statement):
+    # runs Statement in a fresh interpreter and returns the modules
+    #   that it has imported
+    process = subprocess.run([sys.executable, "-c", Statement + "\nimport sys\nprint(' '.join(sys.modules))"],
+        capture_output=True, text=True, cwd=ROOT, check=True)
+    return set(process.stdout.split())
+
+###############################################################
+
+# Lazy imports
+
+###############################################################
+
+def test_import_pythonsim_loads_no_submodule():
+    Loaded = Modules("import pythonsim")
+    assert not any(Name.startswith("pythonsim.") for Name in Loaded)
+    assert "numpy" not in Loaded
+
+def test_event_modules_do_not_import_numpy():
+    Loaded = Modules("from pythonsim import SimClasses, SimFunctions, SimProcess, SimRNG\n"
+        "SimRNG.SeedReplication(3)\nSimRNG.Expon(1.0, 1)")
+    assert {"pythonsim.SimClasses", "pythonsim.SimFunctions", "pythonsim.SimProcess", "pythonsim.SimRNG"} <= Loaded
+    assert "numpy" not in Loaded and "pythonsim.SimResults" not in Loaded
+
+def test_Block_generators_import_numpy_when_called():
+    assert "numpy" in Modules("from pythonsim import SimRNG\nSimRNG.ExponBlock(1.0, 1, 10)")
+
+def test_submodules_load_on_first_access():
+    Loaded = Modules("import pythonsim\npythonsim.SimWarmup.MSER([1.0] * 20)")
+    assert "pythonsim.SimWarmup" in Loaded and "pythonsim.SimVector" not in Loaded
+    for Name in pythonsim.__all__:
+        assert getattr(pythonsim, Name).__name__ == "pythonsim." + Name
+    with pytest.raises(AttributeError):
+        pythonsim.SimNothing
+
+###############################################################
+
+# One copy of the library
+
+###############################################################
+
+def test_models_use_the_package():
+    for Folder in ("hw3", "Lab3", "Project1-3"):
+        Copies = [Name for Name in os.listdir(os.path.join(ROOT, Folder))
+            if Name.startswith("Sim") and Name.endswith(".py")]
+        assert Copies == [], Folder